@@ -0,0 +1,144 @@
+import os
+import pickle
+
+from manifest import hash_bytes
+
+# Bump whenever parsing or the node classes change, so that trees cached by an
+# older parser are never loaded.
+PARSER_VERSION = "4"
+
+# Default cap on the total size of cached trees.
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_SUFFIX = ".pickle"
+
+
+def document_key(markdown, variant=""):
+    """Return the cache key of a markdown source (str) for this parser.
+
+    `variant` distinguishes trees parsed differently from the same source,
+    such as trees of blocks pre-rendered for one base path.
+    """
+    return hash_bytes(f"{PARSER_VERSION}\0{variant}\0{markdown}".encode("utf-8"))
+
+
+class ASTCache:
+    """On-disk cache of parsed documents, keyed by source hash.
+
+    Each entry is a pickled `document.Document` stored as `<key>.pickle`
+    in `directory`, where the key is a hash of the markdown source and
+    `PARSER_VERSION` (see `document_key`). A hit refreshes the entry's mtime,
+    which orders entries for least-recently-used eviction by `gc`.
+
+    Entries are written to a temporary file and renamed into place, so worker
+    processes can share the directory. Entries that cannot be read are
+    treated as misses and removed.
+
+    Attributes:
+        directory: where entries are stored (created on first write).
+        max_bytes: size cap enforced by `gc`.
+        hits, misses: lookups served from / not found in this process.
+    """
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + _SUFFIX)
+
+    def get(self, key):
+        """Return the Document cached under `key`, or None."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                document = pickle.load(f)
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception:
+            # Truncated, corrupt or written by incompatible code
+            self._remove(path)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return document
+
+    def put(self, key, document):
+        """Store `document` under `key`."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump(document, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except BaseException:
+            self._remove(tmp_path)
+            raise
+
+    def get_or_parse(self, markdown, parse, variant=""):
+        """Return the cached Document for `markdown`, parsing it on a miss.
+
+        `parse` is called with the markdown and its result is cached under a
+        key for `markdown` and `variant` (see `document_key`).
+        """
+        key = document_key(markdown, variant)
+        document = self.get(key)
+        if document is None:
+            document = parse(markdown)
+            self.put(key, document)
+        return document
+
+    def entries(self):
+        """Return (mtime_ns, size, path) for every entry, oldest first."""
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return entries
+        for name in names:
+            if not name.endswith(_SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, path))
+        entries.sort()
+        return entries
+
+    def gc(self, max_bytes=None):
+        """Evict least recently used entries until the cache fits its cap.
+
+        Args:
+            max_bytes: cap to enforce instead of `self.max_bytes`.
+
+        Returns:
+            A tuple (removed, kept, kept_bytes).
+        """
+        if max_bytes is None:
+            max_bytes = self.max_bytes
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= max_bytes:
+                break
+            self._remove(path)
+            total -= size
+            removed += 1
+        return removed, len(entries) - removed, total
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def __repr__(self):
+        return f"ASTCache({self.directory!r}, max_bytes={self.max_bytes})"
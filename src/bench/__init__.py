@@ -0,0 +1,6 @@
+"""Benchmarks for the site generator.
+
+Run from the `src` directory: `python3 -m bench` times every pipeline stage
+on a synthetic corpus (see `bench.__main__` for the other commands), and
+single comparisons run as modules, e.g. `python3 -m bench.render`.
+"""
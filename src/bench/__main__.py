@@ -0,0 +1,55 @@
+"""Benchmark entry point: python3 -m bench <command> [options].
+
+Run from the `src` directory; `python3 -m bench <command> -h` lists a
+command's options.
+
+commands:
+  stages  time every pipeline stage on a synthetic corpus (the default)
+  scale   time full builds of synthetic sites of growing size
+  adversarial  time the parser on pathological inputs of growing size
+  compare save a baseline result or compare a new run against one
+  corpus  print or write the synthetic corpus
+  site    write a synthetic site to build
+  render  compare the iterative and recursive ParentNode renderers
+  memory  measure memory per node with and without __slots__
+  links   compare span-sliced and per-match link splitting
+  blocks  compare the fused block scanner with split-then-classify
+  reader  compare f.read() and mmap for large pages
+  inline  time one cold pass over a corpus with and without the inline memo
+"""
+import argparse
+import sys
+
+from bench import (adversarial, blocks, compare, corpus, inline, links, memory, reader,
+                   render, scale, site, stages)
+
+COMMANDS = {
+    "stages": stages,
+    "scale": scale,
+    "adversarial": adversarial,
+    "compare": compare,
+    "corpus": corpus,
+    "site": site,
+    "render": render,
+    "memory": memory,
+    "links": links,
+    "blocks": blocks,
+    "reader": reader,
+    "inline": inline,
+}
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    if not argv or argv[0].startswith("-") and argv[0] not in ("-h", "--help"):
+        argv = ["stages", *argv]
+    parser = argparse.ArgumentParser(prog="python3 -m bench", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=COMMANDS)
+    args = parser.parse_args(argv[:1])
+    return COMMANDS[args.command].main(argv[1:], prog=f"{parser.prog} {args.command}") or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+"""Time the parser on pathological inputs of growing size.
+
+Every input is built from a pattern repeated up to a given length: runs of
+"_", "**" or "`", thousands of unmatched "[" or "](", paragraphs of
+thousands of links, megabyte-long lines, unclosed code fences, code blocks
+with no blank lines between them. An entry point that scales linearly takes
+about the same time per character at every size; the "growth" column is how
+much slower per character the largest input is than the smallest (about 1
+for linear code; quadratic code grows with the size ratio).
+`test_adversarial.py` checks the same inputs.
+
+Usage (from `src`): python3 -m bench adversarial [--sizes N ...] [--json]
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+
+from blockscanner import markdown_to_typed_blocks
+from markdowntohtml import markdown_to_html_node
+from textnode import TextNode, TextType
+from utilityfunctions import (extract_markdown_links, markdown_to_blocks,
+                              split_nodes_image, split_nodes_link, text_to_textnode)
+
+
+def _repeat(unit):
+    def make(size):
+        return unit * (size // len(unit) + 1)
+    return make
+
+
+# Pathological inputs: name -> function returning an input of about `size`
+# characters (possibly longer by less than one repetition).
+INPUTS = {
+    "underscores": _repeat("_"),
+    "asterisks": _repeat("*"),
+    "backticks": _repeat("`"),
+    "open_brackets": _repeat("["),
+    "open_images": _repeat("!["),
+    "unclosed_urls": _repeat("[a]("),
+    "bracket_no_paren": _repeat("[a]"),
+    "url_no_close": _repeat("[a](b"),
+    "bangs": _repeat("!"),
+    "mixed_openers": _repeat("_*`[!(]"),
+    "unclosed_spans": _repeat("a _b **c `d "),
+    "links": _repeat("[link](/a) "),
+    "images": _repeat("![img](/a.png) "),
+    "long_line": _repeat("word "),
+    "short_lines": _repeat("word\n"),
+    "unclosed_fences": _repeat("```\n\n"),
+    "fence_per_block": _repeat("```x\n\ny\n\n"),
+    "consecutive_fences": _repeat("```\na\n```\n"),
+    "blank_lines": _repeat("\n"),
+    "whitespace_lines": _repeat(" \n"),
+    "headings": _repeat("#"),
+    "quotes": _repeat("> a\n"),
+    "list_items": _repeat("- a\n"),
+    "ordered_items": _repeat("1. a\n"),
+}
+
+
+def _plain(function):
+    def run(text):
+        return function([TextNode(text, TextType.PLAIN)])
+    run.__name__ = function.__name__
+    return run
+
+
+# Entry points measured: name -> function taking the input string. Inputs
+# with no blocks are skipped for markdown_to_html_node (an empty document
+# cannot be rendered).
+ENTRY_POINTS = {
+    "markdown_to_blocks": markdown_to_blocks,
+    "markdown_to_typed_blocks": markdown_to_typed_blocks,
+    "text_to_textnode": text_to_textnode,
+    "markdown_to_html_node": markdown_to_html_node,
+    "split_nodes_link": _plain(split_nodes_link),
+    "split_nodes_image": _plain(split_nodes_image),
+    "extract_markdown_links": extract_markdown_links,
+}
+
+
+def best_time(function, argument, repeat=3):
+    """Return the fastest of `repeat` calls of `function(argument)`, in s."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(argument)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def median_time(function, argument, repeat=5, min_time=0.02):
+    """Return the median of `repeat` measurements of `function(argument)`, in s.
+
+    Each measurement calls the function until at least `min_time` seconds
+    have passed and divides by the number of calls, so short calls are not
+    dominated by timer resolution or a single preemption.
+    """
+    measurements = []
+    for _ in range(repeat):
+        calls = 0
+        start = time.perf_counter()
+        while True:
+            function(argument)
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        measurements.append(elapsed / calls)
+    return statistics.median(measurements)
+
+
+def growth(function, make_input, small, factor=16, repeat=5, min_time=0.02):
+    """Measure how `function`'s time per character grows with input size.
+
+    Times inputs of `small` and `small * factor` characters (see
+    `median_time`). Returns (small_seconds, large_seconds, growth) where
+    growth is the ratio of the time per character of the large input to
+    that of the small one: about 1 when the function is linear, about
+    `factor` when it is quadratic.
+    """
+    small_input = make_input(small)
+    large_input = make_input(small * factor)
+    small_seconds = median_time(function, small_input, repeat, min_time)
+    large_seconds = median_time(function, large_input, repeat, min_time)
+    per_char_small = small_seconds / len(small_input)
+    per_char_large = large_seconds / len(large_input)
+    return small_seconds, large_seconds, per_char_large / per_char_small
+
+
+def applicable(entry_point, text):
+    """Whether `entry_point` accepts `text`; see ENTRY_POINTS."""
+    return entry_point != "markdown_to_html_node" or bool(markdown_to_blocks(text))
+
+
+def run_adversarial(sizes, inputs=None, entry_points=None, repeat=3):
+    """Time every entry point on every input at each size.
+
+    Returns a JSON-serializable dict with, per entry point and input, the
+    nanoseconds per character at each size and the growth between the
+    smallest and largest size.
+    """
+    results = {}
+    for entry_name, function in ENTRY_POINTS.items():
+        if entry_points and entry_name not in entry_points:
+            continue
+        results[entry_name] = {}
+        for input_name, make_input in INPUTS.items():
+            if inputs and input_name not in inputs:
+                continue
+            if not applicable(entry_name, make_input(max(sizes))):
+                continue
+            ns_per_char = []
+            for size in sizes:
+                text = make_input(size)
+                ns_per_char.append(best_time(function, text, repeat) * 1e9 / len(text))
+            results[entry_name][input_name] = {
+                "ns_per_char": ns_per_char,
+                "growth": ns_per_char[-1] / ns_per_char[0],
+            }
+    return {"benchmark": "adversarial", "sizes": list(sizes), "results": results}
+
+
+def format_table(result):
+    """Return `run_adversarial` results as a human-readable table."""
+    sizes = result["sizes"]
+    header = f"{'entry point':<24} {'input':<18}" + "".join(
+        f" {f'ns/ch @{size}':>14}" for size in sizes) + f" {'growth':>7}"
+    lines = [header]
+    for entry_name, by_input in result["results"].items():
+        for input_name, r in by_input.items():
+            lines.append(f"{entry_name:<24} {input_name:<18}" + "".join(
+                f" {ns:>14.1f}" for ns in r["ns_per_char"]) + f" {r['growth']:>7.2f}")
+    return "\n".join(lines)
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000],
+                        help="input sizes in characters (default: %(default)s)")
+    parser.add_argument("--input", action="append", dest="inputs", choices=INPUTS,
+                        help="only this input (repeatable)")
+    parser.add_argument("--entry-point", action="append", dest="entry_points",
+                        choices=ENTRY_POINTS, help="only this entry point (repeatable)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="calls per measurement; the fastest is kept "
+                             "(default: %(default)s)")
+    parser.add_argument("--json", action="store_true",
+                        help="print JSON instead of a table")
+    args = parser.parse_args(argv)
+
+    result = run_adversarial(sorted(args.sizes), args.inputs, args.entry_points,
+                             args.repeat)
+    if args.json:
+        json.dump(result, sys.stdout, indent=2)
+        print()
+    else:
+        print(format_table(result))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+"""Benchmark the fused block scanner against split-then-classify.
+
+The old path splits the document on "\\n\\n", strips and classifies each block
+with `block_to_block_type`, then splits every block into lines again; the
+scanner does all three in one pass over the lines.
+
+Usage (from `src`): python3 -m bench blocks [--repeat N]
+"""
+import argparse
+import sys
+import timeit
+
+from blockscanner import scan_blocks
+from blocktype import block_to_block_type
+from utilityfunctions import markdown_to_blocks
+
+
+def document(sections):
+    """A long page mixing every block type."""
+    blocks = []
+    for i in range(sections):
+        blocks.append(f"## Section {i}")
+        blocks.append(f"Paragraph {i} with some text\nwrapped over\nthree lines.")
+        blocks.append("\n".join(f"- item {j}" for j in range(5)))
+        blocks.append("\n".join(f"{j}. step {j}" for j in range(1, 6)))
+        blocks.append("> a quoted line\n> and another")
+        blocks.append("```\nprint('hello')\nprint('world')\n```")
+    return "\n\n".join(blocks)
+
+
+def three_stage(markdown):
+    return [(block_to_block_type(block), block.split("\n"))
+            for block in markdown_to_blocks(markdown)]
+
+
+def fused(markdown):
+    return [(block.type, block.lines) for block in scan_blocks(markdown)]
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    for sections in (10, 100, 1000, 5000):
+        markdown = document(sections)
+        assert three_stage(markdown) == fused(markdown)
+        old = min(timeit.repeat(lambda: three_stage(markdown), number=1, repeat=args.repeat))
+        new = min(timeit.repeat(lambda: fused(markdown), number=1, repeat=args.repeat))
+        print(f"{sections:>5} sections  three-stage {old * 1000:9.3f} ms   "
+              f"fused {new * 1000:9.3f} ms  x{old / new:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
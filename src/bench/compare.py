@@ -0,0 +1,280 @@
+"""Save benchmark baselines and compare new runs against them.
+
+A result holds, for every metric, the samples of several independent runs
+of the benchmarks and their median and interquartile range (IQR):
+
+    stages.<stage>.p50_us   median latency of generate_page,
+                            markdown_to_html_node and ParentNode.to_html
+                            (lower is better; see `bench.stages`)
+    memory.<class>.bytes    bytes per node instance (lower is better)
+    scale.<run>.pages_per_sec  full-build throughput, cold and warm
+                            (higher is better; see `bench.scale`)
+
+Comparing medians rather than single runs, and ignoring differences within
+the runs' IQR, keeps noise from being reported as a change. A metric
+regresses when its median is worse than the baseline's by more than
+`--threshold` percent and by more than the noise; the command then exits
+with status 1.
+
+Usage (from `src`):
+    python3 -m bench compare --save baseline.json
+    python3 -m bench compare --baseline baseline.json [--threshold 10]
+"""
+import argparse
+import json
+import sys
+import tempfile
+
+from bench.corpus import CorpusSpec
+from bench.memory import bytes_per_instance
+from bench.scale import run_scale
+from bench.site import SiteSpec
+from bench.stages import environment, run_stages
+from bench.stats import median_iqr
+from frozenleafnode import FrozenLeafNode
+from leafnode import LeafNode
+from parentnode import ParentNode
+from textnode import TextNode, TextType
+
+# Version of the result file format.
+RESULT_FORMAT = 1
+
+SUITES = ("stages", "memory", "scale")
+
+# Stages compared; "to_html" times ParentNode.to_html on parsed pages.
+STAGES = ("generate_page", "markdown_to_html_node", "to_html")
+
+# Environment fields that make timings incomparable when they differ.
+_ENVIRONMENT_KEYS = ("python", "implementation", "platform", "cpu_count")
+
+
+class Metric:
+    """One measurement taken on every run.
+
+    Attributes:
+        unit: unit of the values, for display.
+        higher_is_better: direction of an improvement.
+        samples: one value per run.
+    """
+    def __init__(self, unit, higher_is_better=False, samples=None):
+        self.unit = unit
+        self.higher_is_better = higher_is_better
+        self.samples = [] if samples is None else samples
+
+    def summary(self):
+        """Return (median, IQR) of the samples."""
+        return median_iqr(self.samples)
+
+    def to_dict(self):
+        median, iqr = self.summary()
+        return {"unit": self.unit, "higher_is_better": self.higher_is_better,
+                "samples": self.samples, "median": median, "iqr": iqr}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["unit"], data["higher_is_better"], list(data["samples"]))
+
+
+def measure_stages(spec, min_time):
+    """Return {metric name: (value, unit, higher_is_better)} for the stages."""
+    result = run_stages(spec, min_time, names=STAGES)
+    return {f"stages.{name}.p50_us": (summary["p50_us"], "us", False)
+            for name, summary in result["stages"].items()}
+
+
+def measure_memory(count):
+    """Return bytes per instance of every node class."""
+    text = "some inline text"
+    children = [LeafNode("b", "x")]
+    factories = {
+        "TextNode": lambda: TextNode(text, TextType.PLAIN),
+        "LeafNode": lambda: LeafNode("b", text),
+        "FrozenLeafNode": lambda: FrozenLeafNode("b", text),
+        "ParentNode": lambda: ParentNode("p", children),
+    }
+    return {f"memory.{name}.bytes": (bytes_per_instance(factory, count), "B", False)
+            for name, factory in factories.items()}
+
+
+def measure_scale(pages):
+    """Return cold and warm full-build throughput on a site of `pages` pages."""
+    with tempfile.TemporaryDirectory() as workdir:
+        result = run_scale([pages], workdir, SiteSpec(), warm_runs=1)
+    return {f"scale.{run['run']}.pages_per_sec": (run["pages_per_sec"], "pages/s", True)
+            for run in result["runs"]}
+
+
+def collect(runs, suites=SUITES, spec=None, min_time=0.1, memory_count=20_000,
+            scale_pages=100):
+    """Run the benchmarks of `suites` `runs` times and return a result dict."""
+    spec = spec or CorpusSpec(pages=10)
+    metrics = {}
+    for _ in range(runs):
+        measured = {}
+        if "stages" in suites:
+            measured.update(measure_stages(spec, min_time))
+        if "memory" in suites:
+            measured.update(measure_memory(memory_count))
+        if "scale" in suites:
+            measured.update(measure_scale(scale_pages))
+        for name, (value, unit, higher_is_better) in measured.items():
+            metrics.setdefault(name, Metric(unit, higher_is_better)).samples.append(value)
+    return {
+        "benchmark": "compare",
+        "format": RESULT_FORMAT,
+        "runs": runs,
+        "suites": list(suites),
+        "corpus": spec.to_dict(),
+        "environment": environment(),
+        "metrics": {name: metric.to_dict() for name, metric in metrics.items()},
+    }
+
+
+def load_result(path):
+    """Load a result saved by `save_result`; raises ValueError if invalid."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or data.get("format") != RESULT_FORMAT:
+        raise ValueError(f"{path} is not a benchmark result (format {RESULT_FORMAT})")
+    return data
+
+
+def save_result(result, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+        f.write("\n")
+
+
+class Comparison:
+    """How one metric changed between a baseline and a new result.
+
+    Attributes:
+        name: metric name.
+        unit: unit of the medians.
+        baseline, new: (median, IQR), or None when missing from that result.
+        change: relative change of the median (new / baseline - 1), or None.
+        status: "regression", "improvement", "unchanged", "noise" (changed
+                by more than the threshold but within the runs' IQR), "new"
+                or "missing".
+    """
+    def __init__(self, name, unit, baseline, new, change, status):
+        self.name = name
+        self.unit = unit
+        self.baseline = baseline
+        self.new = new
+        self.change = change
+        self.status = status
+
+
+def compare_results(baseline, new, threshold=10.0):
+    """Compare every metric of `new` with `baseline`.
+
+    Args:
+        baseline, new: result dicts from `collect`.
+        threshold: smallest change of the median, in percent, reported as a
+                   regression or improvement.
+
+    Returns:
+        A list of Comparison objects, in the order of the baseline metrics.
+    """
+    comparisons = []
+    base_metrics = baseline["metrics"]
+    new_metrics = new["metrics"]
+    for name in list(base_metrics) + [n for n in new_metrics if n not in base_metrics]:
+        base = base_metrics.get(name)
+        current = new_metrics.get(name)
+        if base is None or current is None:
+            metric = Metric.from_dict(base or current)
+            summary = metric.summary()
+            comparisons.append(Comparison(
+                name, metric.unit, summary if base else None,
+                summary if current else None, None, "missing" if base else "new"))
+            continue
+
+        base_median, base_iqr = median_iqr(base["samples"])
+        new_median, new_iqr = median_iqr(current["samples"])
+        difference = new_median - base_median
+        change = difference / base_median if base_median else 0.0
+        worse = difference < 0 if base["higher_is_better"] else difference > 0
+        if abs(change) * 100 <= threshold:
+            status = "unchanged"
+        elif abs(difference) <= (base_iqr + new_iqr) / 2:
+            status = "noise"
+        else:
+            status = "regression" if worse else "improvement"
+        comparisons.append(Comparison(name, base["unit"], (base_median, base_iqr),
+                                      (new_median, new_iqr), change, status))
+    return comparisons
+
+
+def format_comparisons(comparisons):
+    """Return comparisons as a table, one metric per line."""
+    def cell(summary, unit):
+        if summary is None:
+            return "-"
+        median, iqr = summary
+        return f"{median:.2f} ±{iqr:.2f} {unit}"
+
+    lines = [f"{'metric':<40} {'baseline (median ±IQR)':>26} "
+             f"{'new (median ±IQR)':>26} {'change':>8}  status"]
+    for c in comparisons:
+        change = "" if c.change is None else f"{c.change:+.1%}"
+        lines.append(f"{c.name:<40} {cell(c.baseline, c.unit):>26} "
+                     f"{cell(c.new, c.unit):>26} {change:>8}  {c.status}")
+    return "\n".join(lines)
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--baseline", default=None,
+                        help="result file to compare against")
+    parser.add_argument("--save", default=None,
+                        help="write the new result to this file (e.g. a new baseline)")
+    parser.add_argument("--result", default=None,
+                        help="compare this saved result instead of running the benchmarks")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="percent change of a median that counts as a "
+                             "regression or improvement (default: %(default)s)")
+    parser.add_argument("--runs", type=int, default=5,
+                        help="independent runs of the benchmarks (default: %(default)s)")
+    parser.add_argument("--suite", action="append", dest="suites", choices=SUITES,
+                        help="only run this suite (repeatable; default: all)")
+    parser.add_argument("--min-time", type=float, default=0.1,
+                        help="seconds to time each stage for per run (default: %(default)s)")
+    parser.add_argument("--scale-pages", type=int, default=100,
+                        help="pages of the site built by the scale suite (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    if args.baseline is None and args.save is None:
+        parser.error("give --baseline to compare against, --save to store a baseline, or both")
+
+    if args.result is not None:
+        new = load_result(args.result)
+    else:
+        new = collect(args.runs, args.suites or SUITES, min_time=args.min_time,
+                      scale_pages=args.scale_pages)
+    if args.save is not None:
+        save_result(new, args.save)
+        print(f"Saved {len(new['metrics'])} metrics from {new['runs']} runs to {args.save}")
+    if args.baseline is None:
+        return 0
+
+    baseline = load_result(args.baseline)
+    differences = [f"{key} {baseline['environment'].get(key)!r} -> {new['environment'].get(key)!r}"
+                   for key in _ENVIRONMENT_KEYS
+                   if baseline["environment"].get(key) != new["environment"].get(key)]
+    if differences:
+        print("note: measured in a different environment: " + "; ".join(differences))
+    comparisons = compare_results(baseline, new, args.threshold)
+    print(format_comparisons(comparisons))
+    regressions = [c.name for c in comparisons if c.status == "regression"]
+    if regressions:
+        print(f"{len(regressions)} regression(s) past {args.threshold}%: "
+              + ", ".join(regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""Synthetic markdown corpus for the benchmarks.
+
+Pages are generated from a seeded random generator, so the same parameters
+always give the same corpus. Each page has an H1 title followed by sections
+of headings, paragraphs, lists, quotes and code blocks.
+
+Usage (from `src`): python3 -m bench.corpus [--pages N] [--out DIR]
+"""
+import argparse
+import os
+import random
+
+WORDS = ("lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod "
+         "tempor incididunt ut labore et dolore magna aliqua enim ad minim veniam "
+         "quis nostrud exercitation ullamco laboris nisi aliquip ex ea commodo "
+         "consequat duis aute irure in reprehenderit voluptate velit esse cillum "
+         "fugiat nulla pariatur excepteur sint occaecat cupidatat non proident").split()
+
+
+class CorpusSpec:
+    """Parameters of a synthetic corpus.
+
+    Attributes:
+        pages: number of pages.
+        sections: sections (heading plus blocks) per page.
+        paragraph_words: words per paragraph.
+        link_density: fraction of words in a paragraph that are links; a
+                      tenth of those are images.
+        list_depth: nesting depth of lists (1 is a flat list).
+        list_items: items per list level.
+        code_lines: lines per code block; 0 leaves code blocks out.
+        seed: seed of the random generator.
+    """
+    FIELDS = ("pages", "sections", "paragraph_words", "link_density",
+              "list_depth", "list_items", "code_lines", "seed")
+
+    def __init__(self, pages=20, sections=10, paragraph_words=60, link_density=0.05,
+                 list_depth=2, list_items=4, code_lines=8, seed=0):
+        self.pages = pages
+        self.sections = sections
+        self.paragraph_words = paragraph_words
+        self.link_density = link_density
+        self.list_depth = list_depth
+        self.list_items = list_items
+        self.code_lines = code_lines
+        self.seed = seed
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    @classmethod
+    def add_arguments(cls, parser):
+        """Add one command-line option per field, defaulting to the defaults."""
+        defaults = cls()
+        for name in cls.FIELDS:
+            default = getattr(defaults, name)
+            parser.add_argument("--" + name.replace("_", "-"), type=type(default),
+                                default=default,
+                                help=f"corpus {name.replace('_', ' ')} "
+                                     "(default: %(default)s)")
+
+    @classmethod
+    def from_args(cls, args):
+        return cls(**{name: getattr(args, name) for name in cls.FIELDS})
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.FIELDS)
+        return f"CorpusSpec({fields})"
+
+
+def _inline_text(rng, words, link_density):
+    parts = []
+    for i in range(words):
+        word = rng.choice(WORDS)
+        roll = rng.random()
+        if roll < link_density:
+            if rng.random() < 0.1:
+                parts.append(f"![{word}](/images/{word}-{i}.png)")
+            else:
+                parts.append(f"[{word}](/{word}/{i})")
+        elif roll < link_density + 0.04:
+            parts.append(f"**{word}**")
+        elif roll < link_density + 0.07:
+            parts.append(f"_{word}_")
+        elif roll < link_density + 0.09:
+            parts.append(f"`{word}`")
+        else:
+            parts.append(word)
+    return " ".join(parts)
+
+
+def _list_lines(rng, spec, depth, ordered):
+    lines = []
+    indent = "  " * depth
+    for i in range(spec.list_items):
+        marker = f"{i + 1}. " if ordered else "- "
+        lines.append(indent + marker + _inline_text(rng, 6, spec.link_density))
+        if depth + 1 < spec.list_depth and i == 0:
+            lines.extend(_list_lines(rng, spec, depth + 1, ordered))
+    return lines
+
+
+def _code_block(rng, lines):
+    body = [f"value_{i} = compute({rng.choice(WORDS)!r}, {i})" for i in range(lines)]
+    return "```\n" + "\n".join(body) + "\n```"
+
+
+def generate_page(rng, spec, index=0):
+    """Return the markdown of one page of the corpus."""
+    blocks = [f"# Page {index}: {rng.choice(WORDS)} {rng.choice(WORDS)}"]
+    for section in range(spec.sections):
+        blocks.append(f"## Section {section} {rng.choice(WORDS)}")
+        blocks.append(_inline_text(rng, spec.paragraph_words, spec.link_density))
+        blocks.append("\n".join(_list_lines(rng, spec, 0, ordered=section % 2 == 1)))
+        if section % 3 == 0:
+            blocks.append("> " + _inline_text(rng, 12, spec.link_density))
+        if spec.code_lines and section % 2 == 0:
+            blocks.append(_code_block(rng, spec.code_lines))
+    return "\n\n".join(blocks) + "\n"
+
+
+def generate_corpus(spec):
+    """Return the markdown of every page of `spec` as a list of strings."""
+    rng = random.Random(spec.seed)
+    return [generate_page(rng, spec, i) for i in range(spec.pages)]
+
+
+def write_corpus(spec, directory):
+    """Write the corpus as `<directory>/page-N/index.md`; return the paths."""
+    return write_pages(generate_corpus(spec), directory)
+
+
+def write_pages(pages, directory):
+    """Write markdown `pages` as `<directory>/page-N/index.md`; return the paths."""
+    paths = []
+    for i, markdown in enumerate(pages):
+        page_dir = os.path.join(directory, f"page-{i}")
+        os.makedirs(page_dir, exist_ok=True)
+        path = os.path.join(page_dir, "index.md")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(markdown)
+        paths.append(path)
+    return paths
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description=__doc__.splitlines()[0])
+    CorpusSpec.add_arguments(parser)
+    parser.add_argument("--out", default=None,
+                        help="directory to write pages to (default: print the first page)")
+    args = parser.parse_args(argv)
+
+    spec = CorpusSpec.from_args(args)
+    if args.out is None:
+        print(generate_corpus(spec)[0], end="")
+    else:
+        paths = write_corpus(spec, args.out)
+        print(f"Wrote {len(paths)} pages to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
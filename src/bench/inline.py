@@ -0,0 +1,82 @@
+"""Benchmark the inline parsing memo on a single cold pass over a corpus.
+
+Each pass parses and renders every page once (`markdown_to_html_node`
+followed by `to_html`), with the memo off and with a freshly emptied memo,
+as a build does. Repeated passes over a warm memo would mostly measure
+lookups of strings it has already parsed, which no build sees.
+
+Usage (from `src`): python3 -m bench inline [--pages N] [--content DIR]
+"""
+import argparse
+import os
+import sys
+import time
+
+from bench.corpus import CorpusSpec, generate_corpus
+from inlinecache import DEFAULT_MAXSIZE, INLINE_CACHE
+from markdowntohtml import markdown_to_html_node
+
+
+def read_content(directory):
+    """Return the text of every markdown file under `directory`."""
+    pages = []
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            if name.endswith(".md"):
+                with open(os.path.join(root, name), encoding="utf-8") as f:
+                    pages.append(f.read())
+    return pages
+
+
+def cold_pass(pages, maxsize):
+    """Render every page once starting from an empty memo of `maxsize`.
+
+    Returns (seconds, html, hits, misses).
+    """
+    INLINE_CACHE.configure(maxsize)
+    start = time.perf_counter()
+    html = [markdown_to_html_node(markdown).to_html() for markdown in pages]
+    seconds = time.perf_counter() - start
+    return seconds, html, INLINE_CACHE.hits, INLINE_CACHE.misses
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description=__doc__.splitlines()[0])
+    CorpusSpec.add_arguments(parser)
+    parser.add_argument("--content", default=None, metavar="DIR",
+                        help="use the markdown files under DIR instead of a "
+                             "synthetic corpus")
+    parser.add_argument("--maxsize", type=int, default=DEFAULT_MAXSIZE,
+                        help="strings kept by the memo (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="passes of each; the fastest is kept (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    if args.content is not None:
+        pages = read_content(args.content)
+    else:
+        pages = generate_corpus(CorpusSpec.from_args(args))
+    saved_size = INLINE_CACHE.maxsize
+    try:
+        off = on = None
+        for _ in range(args.repeat):
+            # Interleaved, so both see the same machine load
+            off_pass = cold_pass(pages, 0)
+            on_pass = cold_pass(pages, args.maxsize)
+            assert off_pass[1] == on_pass[1]
+            off = min(off, off_pass[0]) if off is not None else off_pass[0]
+            on = min(on, on_pass[0]) if on is not None else on_pass[0]
+    finally:
+        INLINE_CACHE.configure(saved_size)
+    hits, misses = on_pass[2], on_pass[3]
+    lookups = hits + misses
+    rate = 100 * hits / lookups if lookups else 0.0
+    print(f"{len(pages)} pages  memo off {off * 1000:9.1f} ms   "
+          f"memo on {on * 1000:9.1f} ms  x{off / on:.2f}  "
+          f"({hits} hits, {misses} misses, {rate:.1f}% hit rate)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
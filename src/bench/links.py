@@ -0,0 +1,76 @@
+"""Benchmark image/link splitting on link-dense paragraphs.
+
+Compares the span-slicing `split_nodes_link`/`split_nodes_image` against the
+previous approach, which rebuilt each snippet and split the remaining text
+once per match.
+
+Usage (from `src`): python3 -m bench links [--repeat N]
+"""
+import argparse
+import sys
+import timeit
+
+from textnode import TextNode, TextType
+from utilityfunctions import (extract_markdown_images, extract_markdown_links,
+                              split_nodes_image, split_nodes_link)
+
+
+def link_directory(links):
+    """One paragraph of `links` links with an image every tenth entry."""
+    parts = []
+    for i in range(links):
+        parts.append(f"[Page {i}](/directory/page-{i}.html)")
+        if i % 10 == 0:
+            parts.append(f"![icon {i}](/images/icon-{i}.png)")
+    return " | ".join(parts)
+
+
+def split_by_text(old_nodes, extract, fmt, text_type):
+    """The pre-span implementation: str.split on the rebuilt markdown."""
+    new_nodes = []
+    for node in old_nodes:
+        if node.text_type != TextType.PLAIN:
+            new_nodes.append(node)
+            continue
+        matches = extract(node.text)
+        if not matches:
+            new_nodes.append(node)
+            continue
+        current_text = node.text
+        for text, url in matches:
+            before, current_text = current_text.split(fmt.format(text, url), 1)
+            if before:
+                new_nodes.append(TextNode(before, TextType.PLAIN))
+            new_nodes.append(TextNode(text, text_type, url))
+        if current_text:
+            new_nodes.append(TextNode(current_text, TextType.PLAIN))
+    return new_nodes
+
+
+def split_old(text):
+    nodes = [TextNode(text, TextType.PLAIN)]
+    nodes = split_by_text(nodes, extract_markdown_images, "![{}]({})", TextType.IMAGE)
+    return split_by_text(nodes, extract_markdown_links, "[{}]({})", TextType.LINK)
+
+
+def split_new(text):
+    return split_nodes_link(split_nodes_image([TextNode(text, TextType.PLAIN)]))
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    for links in (100, 1000, 5000, 20000):
+        text = link_directory(links)
+        assert split_old(text) == split_new(text)
+        old = min(timeit.repeat(lambda: split_old(text), number=1, repeat=args.repeat))
+        new = min(timeit.repeat(lambda: split_new(text), number=1, repeat=args.repeat))
+        print(f"{links:>6} links  split {old * 1000:10.3f} ms   "
+              f"spans {new * 1000:10.3f} ms  x{old / new:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""Measure memory per node for the slotted node classes.
+
+Compares TextNode, LeafNode and ParentNode against equivalent classes that
+keep a per-instance __dict__ (the layout before the classes used __slots__),
+using tracemalloc to count the bytes allocated per instance.
+
+Usage (from `src`): python3 -m bench memory [--count N]
+"""
+import argparse
+import sys
+import tracemalloc
+
+from leafnode import LeafNode
+from parentnode import ParentNode
+from textnode import TextNode, TextType
+
+
+class DictTextNode:
+    def __init__(self, text, text_type, url=None):
+        self.text = text
+        self.text_type = text_type
+        self.url = url
+
+
+class DictHTMLNode:
+    def __init__(self, tag=None, value=None, children=None, props=None):
+        self.tag = tag
+        self.value = value
+        self.children = children
+        self.props = props
+
+
+class DictLeafNode(DictHTMLNode):
+    def __init__(self, tag, value, props=None):
+        super().__init__(tag=tag, value=value, children=None, props=props)
+
+
+class DictParentNode(DictHTMLNode):
+    def __init__(self, tag, children, props=None):
+        super().__init__(tag=tag, children=children, props=props)
+        self._error = None
+
+
+def bytes_per_instance(factory, count):
+    """Return the bytes allocated per object when `count` are kept alive."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = [factory() for _ in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    # Discount the list holding the objects
+    total -= objects.__sizeof__()
+    return total / count
+
+
+def measurements(count):
+    # Shared arguments are created outside the measured region
+    text = "some inline text"
+    children = [LeafNode("b", "x")]
+    dict_children = [DictLeafNode("b", "x")]
+    cases = [
+        ("TextNode", lambda: DictTextNode(text, TextType.PLAIN),
+         lambda: TextNode(text, TextType.PLAIN)),
+        ("LeafNode", lambda: DictLeafNode("b", text),
+         lambda: LeafNode("b", text)),
+        ("ParentNode", lambda: DictParentNode("p", dict_children),
+         lambda: ParentNode("p", children)),
+    ]
+    results = []
+    for name, before, after in cases:
+        results.append({
+            "class": name,
+            "dict_bytes": bytes_per_instance(before, count),
+            "slots_bytes": bytes_per_instance(after, count),
+        })
+    return results
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    print(f"{'class':<12}{'__dict__':>12}{'__slots__':>12}{'saved':>9}")
+    for row in measurements(args.count):
+        saved = 1 - row["slots_bytes"] / row["dict_bytes"]
+        print(f"{row['class']:<12}{row['dict_bytes']:>10.1f} B"
+              f"{row['slots_bytes']:>10.1f} B{saved:>9.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
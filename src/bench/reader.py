@@ -0,0 +1,88 @@
+"""Benchmark reading large markdown files: f.read() against mmap.
+
+Writes a synthetic page of roughly the requested size, then times finding
+and decoding every block with the whole-file reader (`f.read()` followed by
+`scan_blocks` on the string) and with the mmap reader (`scan_blocks` on the
+mapped bytes), and reports the peak traced Python memory of each.
+
+Usage (from `src`): python3 -m bench reader [--mb N] [--repeat N]
+"""
+import argparse
+import mmap
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from blockscanner import scan_blocks
+
+
+def write_corpus(path, size):
+    """Write about `size` bytes of changelog-style markdown to `path`."""
+    written = 0
+    i = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("# Changelog\n\n")
+        while written < size:
+            entry = (f"## Release {i}\n\n"
+                     f"Fixed **issue {i}** in the [parser](/issues/{i}) and "
+                     f"improved `render()` for long pages.\n\n"
+                     f"- change {i}.1\n- change {i}.2\n- change {i}.3\n\n"
+                     f"```\n$ upgrade --to {i}\n\nok\n```\n\n")
+            f.write(entry)
+            written += len(entry)
+            i += 1
+
+
+def read_blocks(path):
+    with open(path, "r", encoding="utf-8") as f:
+        markdown = f.read()
+    return sum(1 for _ in scan_blocks(markdown))
+
+
+def mmap_blocks(path):
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            return sum(1 for _ in scan_blocks(buffer))
+
+
+def measure(fn, path, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = fn(path)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    tracemalloc.start()
+    try:
+        fn(path)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return count, best, peak
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description=__doc__.splitlines()[0])
+    parser.add_argument("--mb", type=int, nargs="+", default=[10, 50],
+                        help="sizes of the synthetic files in MB")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as td:
+        for mb in args.mb:
+            path = os.path.join(td, f"page-{mb}.md")
+            write_corpus(path, mb * 1024 * 1024)
+            results = {}
+            for label, fn in (("f.read()", read_blocks), ("mmap", mmap_blocks)):
+                results[label] = measure(fn, path, args.repeat)
+            assert results["f.read()"][0] == results["mmap"][0]
+            for label, (count, seconds, peak) in results.items():
+                print(f"{mb:>5} MB  {label:<9} {count:>8} blocks  "
+                      f"{seconds * 1000:9.1f} ms  peak {peak / 2**20:8.1f} MiB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
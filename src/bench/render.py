@@ -0,0 +1,77 @@
+"""Benchmark the iterative ParentNode renderer against the recursive one.
+
+Usage (from `src`): python3 -m bench render [--repeat N]
+"""
+import argparse
+import sys
+import timeit
+
+from leafnode import LeafNode
+from markdowntohtml import markdown_to_html_node
+from parentnode import ParentNode
+
+
+def wide_document(sections=200):
+    """A realistic page: many shallow blocks with inline formatting."""
+    blocks = []
+    for i in range(sections):
+        blocks.append(f"## Section {i}")
+        blocks.append(f"Paragraph {i} with **bold**, _italic_, `code` and a [link](/page/{i}).")
+        blocks.append("\n".join(f"- item {j} with **bold**" for j in range(5)))
+        blocks.append("> a quoted line\n> and another")
+    return markdown_to_html_node("\n\n".join(blocks))
+
+
+def deep_tree(depth):
+    """Nested lists/quotes `depth` levels deep, each level with a leaf."""
+    node = LeafNode("b", "bottom")
+    for i in range(depth):
+        tag = "blockquote" if i % 2 else "li"
+        node = ParentNode(tag, [LeafNode(None, f"level {i} "), node])
+    return ParentNode("div", [node])
+
+
+def render_iterative(node):
+    return "".join(node.iter_html())
+
+
+def render_recursive(node):
+    return "".join(node.iter_html_recursive())
+
+
+def bench(name, node, repeat):
+    results = {}
+    for label, fn in (("recursive", render_recursive), ("iterative", render_iterative)):
+        try:
+            seconds = min(timeit.repeat(lambda: fn(node), number=1, repeat=repeat))
+        except RecursionError:
+            seconds = None
+        results[label] = seconds
+
+    def fmt(seconds):
+        return "RecursionError" if seconds is None else f"{seconds * 1000:10.3f} ms"
+
+    speedup = ""
+    if results["recursive"] and results["iterative"]:
+        speedup = f"  x{results['recursive'] / results['iterative']:.2f}"
+    print(f"{name:<22} recursive {fmt(results['recursive'])}   "
+          f"iterative {fmt(results['iterative'])}{speedup}")
+    return results
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    wide = wide_document()
+    assert render_iterative(wide) == render_recursive(wide)
+    bench("wide (200 sections)", wide, args.repeat)
+    for depth in (100, 500, sys.getrecursionlimit() * 2):
+        node = deep_tree(depth)
+        bench(f"deep (depth {depth})", node, args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
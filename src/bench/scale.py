@@ -0,0 +1,183 @@
+"""Benchmark full builds of synthetic sites of growing size.
+
+For every size a site is generated with `bench.site` and built by running
+`main.py` in it as a separate process: first cold (no output and no
+caches), then warm (again, with nothing changed). Each run records wall
+time, pages/sec, the peak RSS of the largest build process (the main
+process or a worker) and the bytes written to the output and to the cache
+directory, so scaling curves can be charted across releases from the JSON.
+
+Usage (from `src`): python3 -m bench scale [--sizes 10 100 1000] [-o FILE]
+"""
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from bench.site import SiteSpec, write_site
+from bench.stages import environment
+
+MAIN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+
+# Summary line printed by main.py after generating pages.
+_PAGES_PATTERN = re.compile(r"^Pages: (\d+) generated, (\d+) up to date$", re.MULTILINE)
+
+
+def _snapshot(directory):
+    """Return {path: (mtime_ns, size)} for every file under `directory`."""
+    files = {}
+    for root, _, names in os.walk(directory):
+        for name in names:
+            path = os.path.join(root, name)
+            st = os.stat(path)
+            files[path] = (st.st_mtime_ns, st.st_size)
+    return files
+
+
+def _bytes_written(before, after):
+    """Bytes of the files in `after` that are new or changed since `before`."""
+    return sum(size for path, (mtime, size) in after.items()
+               if before.get(path) != (mtime, size))
+
+
+def _max_rss_bytes(rusage):
+    # ru_maxrss is in bytes on macOS and in KiB elsewhere
+    if sys.platform == "darwin":
+        return rusage.ru_maxrss
+    return rusage.ru_maxrss * 1024
+
+
+def run_build(site_dir, build_args=()):
+    """Build the site in `site_dir` with `main.py` and measure the run.
+
+    Returns a dict of the measurements. Raises RuntimeError, with the
+    build's output, when the build fails.
+    """
+    output_dir = os.path.join(site_dir, "docs")
+    cache_dir = os.path.join(site_dir, ".ssg-cache")
+    output_before = _snapshot(output_dir)
+    cache_before = _snapshot(cache_dir)
+
+    with tempfile.TemporaryFile("w+", encoding="utf-8") as log:
+        start = time.perf_counter()
+        process = subprocess.Popen([sys.executable, MAIN, *build_args], cwd=site_dir,
+                                   stdout=log, stderr=subprocess.STDOUT)
+        # wait4 reaps the build with its resource usage, which covers the
+        # worker processes it waited for
+        _, status, rusage = os.wait4(process.pid, 0)
+        wall = time.perf_counter() - start
+        process.returncode = os.waitstatus_to_exitcode(status)
+        log.seek(0)
+        text = log.read()
+    if process.returncode != 0:
+        raise RuntimeError(f"build in {site_dir} failed with exit code "
+                           f"{process.returncode}:\n{text}")
+
+    match = _PAGES_PATTERN.search(text)
+    generated, up_to_date = (int(match[1]), int(match[2])) if match else (None, None)
+    pages = (generated or 0) + (up_to_date or 0)
+    return {
+        "wall_s": wall,
+        "pages_per_sec": pages / wall if wall else 0.0,
+        "generated": generated,
+        "up_to_date": up_to_date,
+        "peak_rss_bytes": _max_rss_bytes(rusage),
+        "bytes_written": _bytes_written(output_before, _snapshot(output_dir)),
+        "cache_bytes_written": _bytes_written(cache_before, _snapshot(cache_dir)),
+    }
+
+
+def run_scale(sizes, workdir, spec=None, warm_runs=1, build_args=()):
+    """Generate and build a site of each size in `sizes` under `workdir`.
+
+    Args:
+        sizes: page counts to benchmark.
+        workdir: directory the sites are generated in (as `site-<pages>`).
+        spec: SiteSpec with the parameters other than the page count.
+        warm_runs: number of warm builds after the cold one.
+        build_args: extra command-line arguments for `main.py`.
+
+    Returns:
+        A JSON-serializable dict with one entry per build in "runs".
+    """
+    spec = spec or SiteSpec()
+    runs = []
+    for pages in sizes:
+        site_spec = SiteSpec(**dict(spec.to_dict(), pages=pages))
+        site_dir = os.path.join(workdir, f"site-{pages}")
+        shutil.rmtree(site_dir, ignore_errors=True)
+        markdown_bytes = write_site(site_spec, site_dir)
+        for i in range(1 + warm_runs):
+            result = run_build(site_dir, build_args)
+            runs.append(dict(pages=pages, markdown_bytes=markdown_bytes,
+                             run="cold" if i == 0 else "warm", **result))
+    return {
+        "benchmark": "scale",
+        "site": dict(spec.to_dict(), pages=list(sizes)),
+        "build_args": list(build_args),
+        "environment": environment(),
+        "runs": runs,
+    }
+
+
+def format_table(result):
+    """Return `run_scale` results as a human-readable table."""
+    lines = [f"{'pages':>7} {'run':<5} {'wall s':>9} {'pages/s':>10} "
+             f"{'peak RSS MiB':>13} {'written MiB':>12} {'cache MiB':>10}"]
+    for r in result["runs"]:
+        lines.append(f"{r['pages']:>7} {r['run']:<5} {r['wall_s']:>9.3f} "
+                     f"{r['pages_per_sec']:>10.1f} {r['peak_rss_bytes'] / 2**20:>13.1f} "
+                     f"{r['bytes_written'] / 2**20:>12.2f} "
+                     f"{r['cache_bytes_written'] / 2**20:>10.2f}")
+    return "\n".join(lines)
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000],
+                        help="page counts to build (default: %(default)s)")
+    SiteSpec.add_arguments(parser, exclude=("pages",))
+    parser.add_argument("--warm-runs", type=int, default=1,
+                        help="warm builds after each cold one (default: %(default)s)")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="worker processes per build (default: main.py's)")
+    parser.add_argument("--build-arg", action="append", default=[], dest="build_args",
+                        help="extra argument for main.py, e.g. --build-arg=--pipeline "
+                             "(repeatable)")
+    parser.add_argument("--workdir", default=None,
+                        help="keep the generated sites in this directory "
+                             "(default: a temporary directory)")
+    parser.add_argument("--json", action="store_true",
+                        help="print JSON instead of a table")
+    parser.add_argument("-o", "--output", default=None,
+                        help="also write the JSON result to this file")
+    args = parser.parse_args(argv)
+
+    build_args = list(args.build_args)
+    if args.jobs is not None:
+        build_args += ["--jobs", str(args.jobs)]
+    spec = SiteSpec.from_args(args, pages=None)
+    if args.workdir is None:
+        with tempfile.TemporaryDirectory() as workdir:
+            result = run_scale(args.sizes, workdir, spec, args.warm_runs, build_args)
+    else:
+        result = run_scale(args.sizes, args.workdir, spec, args.warm_runs, build_args)
+
+    if args.json:
+        json.dump(result, sys.stdout, indent=2)
+        print()
+    else:
+        print(format_table(result))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
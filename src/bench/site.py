@@ -0,0 +1,153 @@
+"""Generate a synthetic site: a content tree, static images and a template.
+
+The site has the layout `main.py` builds from: `content/` with nested
+sections (`content/blog/<year>/<post>/index.md`, `content/docs/<section>/`
+and top-level pages), `static/` with a stylesheet and images the pages
+embed, and `template.html`. Page sizes follow a log-normal distribution, so
+most pages are short and a few are long, as on real sites.
+
+Usage (from `src`): python3 -m bench site DIR [--pages N]
+"""
+import argparse
+import os
+import random
+
+from bench.corpus import CorpusSpec, generate_page
+
+TEMPLATE = """<!doctype html>
+<html>
+  <head>
+    <meta charset="utf-8" />
+    <title>{{ Title }}</title>
+    <link href="/index.css" rel="stylesheet" />
+  </head>
+  <body>
+    <article>{{ Content }}</article>
+  </body>
+</html>
+"""
+
+STYLESHEET = "body { font-family: sans-serif; max-width: 60em; margin: auto; }\n"
+
+
+class SiteSpec:
+    """Parameters of a synthetic site.
+
+    Attributes:
+        pages: number of markdown pages.
+        images: number of images under `static/images`.
+        median_sections: median sections per page (see `bench.corpus`).
+        size_sigma: sigma of the log-normal distribution of page sizes.
+        posts_per_year: pages per year of blog posts; about 80% of them end up
+                        in each `content/blog/<year>` directory.
+        seed: seed of the random generator.
+    """
+    FIELDS = ("pages", "images", "median_sections", "size_sigma",
+              "posts_per_year", "seed")
+
+    def __init__(self, pages=100, images=20, median_sections=4, size_sigma=0.8,
+                 posts_per_year=50, seed=0):
+        self.pages = pages
+        self.images = images
+        self.median_sections = median_sections
+        self.size_sigma = size_sigma
+        self.posts_per_year = posts_per_year
+        self.seed = seed
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    @classmethod
+    def add_arguments(cls, parser, exclude=()):
+        """Add one command-line option per field (except those in `exclude`),
+        defaulting to the defaults."""
+        defaults = cls()
+        for name in cls.FIELDS:
+            if name in exclude:
+                continue
+            default = getattr(defaults, name)
+            parser.add_argument("--" + name.replace("_", "-"), type=type(default),
+                                default=default,
+                                help=f"site {name.replace('_', ' ')} "
+                                     "(default: %(default)s)")
+
+    @classmethod
+    def from_args(cls, args, **overrides):
+        fields = {name: getattr(args, name) for name in cls.FIELDS
+                  if name not in overrides}
+        fields.update(overrides)
+        return cls(**fields)
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.FIELDS)
+        return f"SiteSpec({fields})"
+
+
+def page_paths(pages, posts_per_year):
+    """Return content-relative markdown paths for `pages` pages.
+
+    About 80% are blog posts, 15% documentation pages and the rest
+    top-level pages; the first page is always `index.md`.
+    """
+    paths = ["index.md"]
+    for i in range(1, pages):
+        kind = i % 20
+        if kind < 16:
+            year = 2000 + i // posts_per_year
+            paths.append(f"blog/{year}/post-{i}/index.md")
+        elif kind < 19:
+            paths.append(f"docs/section-{i % 7}/page-{i}.md")
+        else:
+            paths.append(f"page-{i}.md")
+    return paths
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def write_site(spec, directory):
+    """Write the site of `spec` into `directory`.
+
+    Returns the number of bytes of markdown written.
+    """
+    rng = random.Random(spec.seed)
+    _write(os.path.join(directory, "template.html"), TEMPLATE)
+    _write(os.path.join(directory, "static", "index.css"), STYLESHEET)
+    for i in range(spec.images):
+        # Not a decodable image, just something of a realistic size to copy
+        size = rng.randint(2 * 1024, 64 * 1024)
+        _write(os.path.join(directory, "static", "images", f"image-{i}.png"),
+               rng.randbytes(size))
+
+    total = 0
+    for i, path in enumerate(page_paths(spec.pages, spec.posts_per_year)):
+        size = rng.lognormvariate(0, spec.size_sigma)
+        sections = max(1, round(size * spec.median_sections))
+        markdown = generate_page(rng, CorpusSpec(sections=sections), i)
+        if spec.images:
+            image = rng.randrange(spec.images)
+            markdown += f"\n![figure {image}](/images/image-{image}.png)\n"
+        _write(os.path.join(directory, "content", path), markdown)
+        total += len(markdown.encode("utf-8"))
+    return total
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description=__doc__.splitlines()[0])
+    parser.add_argument("directory", help="where to write the site")
+    SiteSpec.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    spec = SiteSpec.from_args(args)
+    markdown_bytes = write_site(spec, args.directory)
+    print(f"Wrote {spec.pages} pages ({markdown_bytes} bytes of markdown) and "
+          f"{spec.images} images to {args.directory}")
+
+
+if __name__ == "__main__":
+    main()
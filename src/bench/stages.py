@@ -0,0 +1,188 @@
+"""Time every stage of the markdown pipeline on a synthetic corpus.
+
+Each stage is called once per input (page, block or inline string) over and
+over for at least `--min-time` seconds, timing every call, and is reported
+as ops/sec with latency percentiles. The inline memo is off unless
+`--inline-cache` is given, so repeated passes measure parsing rather than
+cache lookups; with it, every pass after the first finds the memo warm,
+which no build does (`python3 -m bench inline` times a cold pass).
+
+Usage (from `src`): python3 -m bench stages [--json] [--output FILE]
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+from bench.corpus import CorpusSpec, generate_corpus, write_pages
+from bench.stats import summarize_latencies
+from blocktype import BlockType, block_to_block_type
+from blockscanner import scan_blocks
+from inlinecache import DEFAULT_MAXSIZE as INLINE_CACHE_SIZE, INLINE_CACHE
+from main import generate_page
+from manifest import GENERATOR_VERSION
+from markdowntohtml import markdown_to_html_node
+from template import Template
+from textnode import TextNode, TextType
+from utilityfunctions import (markdown_to_blocks, split_nodes_image,
+                              split_nodes_link, text_to_textnode)
+
+TEMPLATE = "<html><head><title>{{ Title }}</title></head><body>{{ Content }}</body></html>"
+
+
+def _inline_texts(pages):
+    """Every string the parser hands to inline parsing, in document order."""
+    texts = []
+    for markdown in pages:
+        for block in scan_blocks(markdown):
+            if block.type == BlockType.CODE:
+                continue
+            if block.type in (BlockType.UNORDERED_LIST, BlockType.ORDERED_LIST):
+                texts.extend(line.strip().split(" ", 1)[1] for line in block.lines)
+            else:
+                texts.append(" ".join(block.lines))
+    return texts
+
+
+def build_stages(pages, workdir):
+    """Return {name: (function, inputs)} for every stage of the pipeline."""
+    blocks = [block for markdown in pages for block in markdown_to_blocks(markdown)]
+    texts = _inline_texts(pages)
+    plain_nodes = [[TextNode(text, TextType.PLAIN)] for text in texts]
+    trees = [markdown_to_html_node(markdown) for markdown in pages]
+
+    template = Template(TEMPLATE)
+    page_jobs = [(path, os.path.join(workdir, f"page-{i}.html"))
+                 for i, path in enumerate(write_pages(pages, os.path.join(workdir, "content")))]
+
+    def render_page(job):
+        generate_page(job[0], None, job[1], "/", template=template)
+
+    return {
+        "markdown_to_blocks": (markdown_to_blocks, pages),
+        "block_to_block_type": (block_to_block_type, blocks),
+        "text_to_textnode": (text_to_textnode, texts),
+        "split_nodes_image": (split_nodes_image, plain_nodes),
+        "split_nodes_link": (split_nodes_link, plain_nodes),
+        "markdown_to_html_node": (markdown_to_html_node, pages),
+        "to_html": (lambda node: node.to_html(), trees),
+        "generate_page": (render_page, page_jobs),
+    }
+
+
+def time_calls(function, inputs, min_time):
+    """Call `function` on every input, in passes, for at least `min_time` s.
+
+    One untimed pass warms up first. Returns per-call latencies in ns.
+    """
+    for arg in inputs:
+        function(arg)
+    clock = time.perf_counter_ns
+    samples = []
+    deadline = clock() + int(min_time * 1e9)
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        while True:
+            for arg in inputs:
+                start = clock()
+                function(arg)
+                samples.append(clock() - start)
+            if clock() >= deadline:
+                break
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return samples
+
+
+def environment():
+    """Describe the interpreter and machine a result was measured on."""
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "generator_version": GENERATOR_VERSION,
+    }
+
+
+def run_stages(spec, min_time=0.2, names=None, inline_cache=False):
+    """Benchmark the stages in `names` (default: all) on the corpus of `spec`.
+
+    Returns a JSON-serializable dict with the corpus parameters, the
+    environment and one latency summary per stage.
+    """
+    pages = generate_corpus(spec)
+    saved_size = INLINE_CACHE.maxsize
+    INLINE_CACHE.configure(INLINE_CACHE_SIZE if inline_cache else 0)
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            stages = build_stages(pages, workdir)
+            results = {}
+            for name, (function, inputs) in stages.items():
+                if names and name not in names:
+                    continue
+                results[name] = summarize_latencies(time_calls(function, inputs, min_time))
+    finally:
+        INLINE_CACHE.configure(saved_size)
+    return {
+        "benchmark": "stages",
+        "corpus": spec.to_dict(),
+        "min_time": min_time,
+        "inline_cache": inline_cache,
+        "environment": environment(),
+        "stages": results,
+    }
+
+
+def format_table(result):
+    """Return `run_stages` results as a human-readable table."""
+    lines = [f"{'stage':<22} {'calls':>8} {'ops/sec':>12} {'p50 us':>10} "
+             f"{'p90 us':>10} {'p99 us':>10}"]
+    for name, s in result["stages"].items():
+        lines.append(f"{name:<22} {s['calls']:>8} {s['ops_per_sec']:>12.1f} "
+                     f"{s['p50_us']:>10.2f} {s['p90_us']:>10.2f} {s['p99_us']:>10.2f}")
+    return "\n".join(lines)
+
+
+def add_arguments(parser):
+    CorpusSpec.add_arguments(parser)
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="seconds to time each stage for (default: %(default)s)")
+    parser.add_argument("--stage", action="append", dest="stages", default=None,
+                        help="only run this stage (repeatable)")
+    parser.add_argument("--inline-cache", action="store_true",
+                        help="keep the inline parsing memo on while timing")
+    parser.add_argument("--json", action="store_true",
+                        help="print JSON instead of a table")
+    parser.add_argument("-o", "--output", default=None,
+                        help="also write the JSON result to this file")
+
+
+def run(args):
+    result = run_stages(CorpusSpec.from_args(args), args.min_time, args.stages,
+                        args.inline_cache)
+    if args.json:
+        json.dump(result, sys.stdout, indent=2)
+        print()
+    else:
+        print(format_table(result))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    return 0
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description=__doc__.splitlines()[0])
+    add_arguments(parser)
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+"""Summary statistics shared by the benchmarks."""
+
+
+def percentile(sorted_values, q):
+    """Return the `q`-th percentile (0-100) of an ascending, non-empty list.
+
+    Interpolates linearly between the two nearest ranks.
+    """
+    if not sorted_values:
+        raise ValueError("percentile of an empty list")
+    position = (len(sorted_values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    fraction = position - lower
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction
+
+
+def summarize_latencies(samples_ns):
+    """Summarize per-call latencies given in nanoseconds.
+
+    Returns a dict with the number of calls, ops/sec over the total time,
+    and the mean, min, max and p25/p50/p75/p90/p99 latencies in microseconds.
+    """
+    values = sorted(samples_ns)
+    total = sum(values)
+    summary = {
+        "calls": len(values),
+        "ops_per_sec": len(values) * 1e9 / total if total else 0.0,
+        "mean_us": total / len(values) / 1000,
+        "min_us": values[0] / 1000,
+        "max_us": values[-1] / 1000,
+    }
+    for q in (25, 50, 75, 90, 99):
+        summary[f"p{q}_us"] = percentile(values, q) / 1000
+    return summary
+
+
+def median_iqr(values):
+    """Return (median, interquartile range) of a non-empty list of numbers."""
+    values = sorted(values)
+    return percentile(values, 50), percentile(values, 75) - percentile(values, 25)
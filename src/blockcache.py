@@ -0,0 +1,174 @@
+import os
+import pickle
+from collections import OrderedDict
+
+from astcache import PARSER_VERSION
+from blocktype import BlockType
+from document import collect_refs
+from manifest import GENERATOR_VERSION
+from markdowntohtml import block_to_html_node
+from rawhtmlnode import RawHTMLNode
+
+# Default cap on the memory held by cached fragments.
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+# Rough per-entry overhead (key tuple, entry tuple, node) counted against the
+# cap on top of the strings themselves.
+_ENTRY_OVERHEAD = 200
+
+
+def _entry_size(key, entry):
+    node, links, images = entry
+    size = _ENTRY_OVERHEAD + len(key[1]) + len(node.value)
+    for text, url in links + images:
+        size += len(text) + len(url)
+    return size
+
+
+class BlockCache:
+    """LRU cache of rendered block HTML, shared by every page of a build.
+
+    Identical blocks (footers, disclaimers, repeated bios) are parsed and
+    rendered once; later occurrences get the cached fragment as a
+    `RawHTMLNode`, along with the block's link and image references so a
+    `Document` built from cached blocks is complete. Entries are keyed by
+    block type, block text and resolver base path, since rendering resolves
+    root-relative URLs.
+
+    The cache is bounded by an estimate of the memory its entries hold;
+    least recently used entries are evicted past `max_bytes`. It can be saved
+    to and loaded from disk to warm the next build.
+
+    A copy of the cache sent to a worker process records the entries it adds
+    (see `take_updates`) so the parent can `merge` them back.
+
+    Attributes:
+        max_bytes: memory cap in (estimated) bytes.
+        size: estimated bytes held by the current entries.
+        hits, misses: lookups served from / not found in the cache.
+    """
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        # Keys added since the last take_updates(), or None when not tracked
+        self._added = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def render(self, block, resolver=None):
+        """Return (node, links, images) for a `blockscanner.Block`.
+
+        `node` is a RawHTMLNode holding the block's HTML rendered with
+        `resolver`; `links` and `images` are tuples of (text, url) pairs.
+        """
+        base = "/" if resolver is None else resolver.base
+        key = (block.type, block.text, base)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        node = block_to_html_node(block.text, block.type, block.lines)
+        links = []
+        images = []
+        if block.type != BlockType.CODE:
+            collect_refs(node, links, images)
+        entry = (RawHTMLNode(node.to_html(resolver), base), tuple(links), tuple(images))
+        self._add(key, entry)
+        if self._added is not None:
+            self._added.append(key)
+        return entry
+
+    def _add(self, key, entry):
+        if key in self._entries:
+            return
+        self._entries[key] = entry
+        self.size += _entry_size(key, entry)
+        while self.size > self.max_bytes and self._entries:
+            old_key, old_entry = self._entries.popitem(last=False)
+            self.size -= _entry_size(old_key, old_entry)
+
+    def track_updates(self):
+        """Start recording added entries for `take_updates`."""
+        self._added = []
+
+    def take_updates(self):
+        """Return and reset what this copy learned since the last call.
+
+        Returns a tuple (entries, hits, misses) to pass to `merge`.
+        """
+        entries = [(key, self._entries[key]) for key in self._added
+                   if key in self._entries]
+        updates = (entries, self.hits, self.misses)
+        self._added = []
+        self.hits = 0
+        self.misses = 0
+        return updates
+
+    def merge(self, updates):
+        """Add entries and counters returned by another copy's `take_updates`."""
+        entries, hits, misses = updates
+        for key, entry in entries:
+            self._add(key, entry)
+        self.hits += hits
+        self.misses += misses
+
+    def stats(self):
+        """Return a one-line summary of hits, misses and size."""
+        lookups = self.hits + self.misses
+        rate = 100 * self.hits / lookups if lookups else 0.0
+        return (f"Block cache: {self.hits} hits, {self.misses} misses "
+                f"({rate:.1f}% hit rate), {len(self)} blocks ({self.size} bytes)")
+
+    @classmethod
+    def load(cls, path, max_bytes=DEFAULT_MAX_BYTES):
+        """Load a cache saved by `save`.
+
+        A missing, unreadable or outdated file yields an empty cache.
+        """
+        cache = cls(max_bytes)
+        try:
+            with open(path, "rb") as f:
+                data = pickle.load(f)
+        except Exception:
+            return cache
+        if not isinstance(data, dict) or data.get("version") != cls._version():
+            return cache
+        for key, entry in data.get("entries", ()):
+            cache._add(key, entry)
+        return cache
+
+    def save(self, path):
+        """Write the entries to `path`, least recently used first."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump({"version": self._version(),
+                         "entries": list(self._entries.items())},
+                        f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _version():
+        return f"{PARSER_VERSION}/{GENERATOR_VERSION}"
+
+    def __getstate__(self):
+        state = {name: getattr(self, name) for name in
+                 ("max_bytes", "size", "_entries")}
+        # A copy starts with fresh counters and no recorded updates
+        state.update(hits=0, misses=0, _added=None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+    def __repr__(self):
+        return f"BlockCache(blocks={len(self)}, size={self.size}, max_bytes={self.max_bytes})"
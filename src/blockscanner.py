@@ -0,0 +1,280 @@
+import mmap
+import re
+from itertools import repeat
+
+from blocktype import BlockType
+
+# Fence that opens and closes a code block.
+FENCE = "```"
+
+# A run of blank (empty or whitespace-only) lines: the boundary between blocks.
+# The group keeps the separator in re.split() output so fenced code spanning
+# blank lines can be stitched back together exactly.
+_BLANK_LINES_PATTERN = re.compile(r"(\n(?:[^\S\n]*\n)+)")
+
+# A whitespace-only line. Documents without one can be split on "\n\n".
+_WHITESPACE_LINE_PATTERN = re.compile(r"\n[^\S\n]+\n")
+
+# Bytes of a buffer decoded at a time by `scan_blocks`; each window is
+# extended to the next block boundary.
+BUFFER_WINDOW = 1024 * 1024
+
+# Ordered list item marker: any number followed by ". " ("1. ", "10. ", ...).
+_ORDERED_ITEM_PATTERN = re.compile(r"[0-9]+\. ")
+
+# First characters of every block type other than a paragraph.
+_MARKERS = frozenset("#`>-*0123456789")
+
+
+class Block:
+    """A typed markdown block produced by `scan_blocks`.
+
+    Attributes:
+        type: the block's `BlockType`.
+        lines: the block's lines, without newlines. The first line has its
+               leading and the last line its trailing whitespace removed.
+        text: the lines joined with "\\n" - the same string
+              `markdown_to_blocks` would return for this block.
+    """
+    __slots__ = ("type", "lines", "text")
+
+    def __init__(self, block_type, lines, text=None):
+        self.type = block_type
+        self.lines = lines
+        self.text = "\n".join(lines) if text is None else text
+
+    def __eq__(self, other):
+        if not isinstance(other, Block):
+            return NotImplemented
+        return self.type == other.type and self.lines == other.lines
+
+    def __repr__(self):
+        return f"Block({self.type}, {self.text!r})"
+
+
+def classify_block(lines):
+    """Return the BlockType of a block from its (edge-stripped) lines.
+
+    Follows the rules of `block_to_block_type`, except that ordered list items
+    may use any number ("10. item"), and that headings, quotes and lists
+    with no content (a lone "#" or ">", or "- " items with no text) are
+    paragraphs, which keep their markers as text instead of rendering an
+    element without children.
+    """
+    first = lines[0]
+    # Dispatch on the first character; most blocks are paragraphs, which
+    # then cost a single set lookup.
+    marker = first[0]
+    if marker not in _MARKERS:
+        return BlockType.PARAGRAPH
+    if marker == "#":
+        # The heading text starts one character after the last "#"
+        if len(lines) == 1 and not first[len(first) - len(first.lstrip("#")) + 1:].strip():
+            return BlockType.PARAGRAPH
+        return BlockType.HEADING
+    if marker == "`":
+        if first.startswith(FENCE) and lines[-1].endswith(FENCE):
+            return BlockType.CODE
+        return BlockType.PARAGRAPH
+    if marker == ">":
+        if len(lines) == 1 and not first[1:].strip():
+            return BlockType.PARAGRAPH
+        return BlockType.QUOTE
+    # Lists almost always start with an item that has text; only otherwise
+    # are the remaining lines searched for one
+    if marker == "-" or marker == "*":
+        if first.startswith(" ", 1) and (
+                first[2:].strip() or _has_item(lines, _is_unordered_item)):
+            return BlockType.UNORDERED_LIST
+        return BlockType.PARAGRAPH
+    if _ORDERED_ITEM_PATTERN.match(first) and (
+            ". " in first.rstrip() or _has_item(lines, _is_ordered_item)):
+        return BlockType.ORDERED_LIST
+    return BlockType.PARAGRAPH
+
+
+def _is_unordered_item(line):
+    return line.startswith("- ") or line.startswith("* ")
+
+
+def _is_ordered_item(line):
+    return ". " in line
+
+
+def _has_item(lines, is_item):
+    """Whether any line is a list item with text, as the list renderers see
+    it (stripped, so "- " alone is not an item)."""
+    return any(is_item(line.strip()) for line in lines)
+
+
+def _closing_fence(lines, start):
+    """Index of the first line at or after `start` ending in ```, or -1."""
+    for i in range(start, len(lines)):
+        if lines[i].rstrip().endswith(FENCE):
+            return i
+    return -1
+
+
+def _chunk_lines(text):
+    """Split chunk text into lines.
+
+    Every line `_scan` looks at is split here, so tests can count the
+    characters it splits to check that no text is split more than a
+    constant number of times.
+    """
+    return text.split("\n")
+
+
+def _split_text(markdown, tail=""):
+    """Return (chunk, separator) pairs for a markdown string.
+
+    `tail` is the separator after the last chunk, for text that continues.
+    """
+    if _WHITESPACE_LINE_PATTERN.search(markdown) is None:
+        # Only empty lines separate blocks: str.split is much faster, and
+        # extra newlines left on a chunk are removed by strip()
+        return zip(markdown.split("\n\n"), repeat("\n\n"))
+    pieces = _BLANK_LINES_PATTERN.split(markdown)
+    pieces.append(tail)
+    return zip(pieces[::2], pieces[1::2])
+
+
+def _split_lines(lines):
+    """Yield (chunk, separator) pairs for an iterable of lines.
+
+    A chunk is yielded when the next non-blank line (or the end of input) is
+    read, once its separator of blank lines is complete. Only the current
+    chunk is held in memory.
+    """
+    chunk = []
+    blank = []
+    for line in lines:
+        if line.endswith("\n"):
+            line = line[:-1]
+        if not line or line.isspace():
+            blank.append(line)
+            continue
+        if blank:
+            if chunk:
+                yield "\n".join(chunk), "\n" + "".join(b + "\n" for b in blank)
+                chunk = []
+            blank = []
+        chunk.append(line)
+    if chunk:
+        yield "\n".join(chunk), ""
+
+
+def _split_buffer(buffer, encoding):
+    """Yield (chunk, separator) pairs for encoded markdown in a buffer.
+
+    The buffer is decoded a window at a time: each window of about
+    `BUFFER_WINDOW` bytes is extended with `buffer.find(b"\\n\\n")` to the
+    next block boundary in the raw bytes, then decoded and split like a
+    string. Memory is bounded by the window and the largest block, however
+    large the buffer. Splitting bytes on newlines is safe for UTF-8 (and any
+    ASCII-compatible encoding), where the newline byte never occurs inside
+    another character.
+    """
+    find = buffer.find
+    size = len(buffer)
+    start = 0
+    while start < size:
+        end = start + BUFFER_WINDOW
+        if end < size:
+            end = find(b"\n\n", end)
+        if end == -1 or end >= size:
+            end = size
+        text = buffer[start:end].decode(encoding)
+        start = end + 2
+        yield from _split_text(text, tail="\n\n")
+
+
+def _scan(pairs, fences):
+    pairs = iter(pairs)
+    for chunk, sep in pairs:
+        text = chunk.strip()
+        if not text:
+            continue
+        lines = _chunk_lines(text)
+        # Index of the line the next block starts on. A chunk holds more than
+        # one block only when text follows a closing fence, and is then
+        # walked by index rather than joined and split again, which would
+        # copy the rest of the chunk once per fence.
+        start = 0
+        while True:
+            first = lines[start]
+            if start:
+                first = lines[start] = first.lstrip()
+            if not fences or not first.startswith(FENCE):
+                if start:
+                    lines = lines[start:]
+                    text = "\n".join(lines)
+                yield Block(classify_block(lines), lines, text)
+                break
+
+            # Fenced code block: it runs to the first line ending in ```,
+            # which may lie past blank lines in a later chunk.
+            if len(first) >= 2 * len(FENCE) and first.endswith(FENCE):
+                closer = start
+            else:
+                closer = _closing_fence(lines, start + 1)
+            if closer == -1:
+                chunk = "\n".join(lines[start:]) if start else chunk
+                consumed = [(chunk, sep)]
+                parts = [chunk]
+                for chunk, next_sep in pairs:
+                    consumed.append((chunk, next_sep))
+                    parts.append(sep)
+                    parts.append(chunk)
+                    sep = next_sep
+                    if _closing_fence(_chunk_lines(chunk), 0) != -1:
+                        break
+                else:
+                    # No closing fence anywhere after the opener, so no later
+                    # opener can be closed either: scan what was read as
+                    # text. Each chunk is rescanned at most once, so this
+                    # stays linear.
+                    yield from _scan(consumed, fences=False)
+                    return
+                lines = _chunk_lines("".join(parts).strip())
+                start = 0
+                closer = _closing_fence(lines, 1)
+
+            code_lines = lines[start:closer + 1]
+            code_lines[-1] = code_lines[-1].rstrip()
+            yield Block(BlockType.CODE, code_lines)
+            # Text after the closing fence starts the next block
+            start = closer + 1
+            if start == len(lines):
+                break
+
+
+def scan_blocks(markdown):
+    """Split markdown into typed blocks in a single pass.
+
+    Fuses `markdown_to_blocks` and `block_to_block_type`: block boundaries
+    (runs of blank or whitespace-only lines) are found in one pass, and each
+    block is split into lines once and classified from its first line. Unlike
+    splitting on "\\n\\n", a fenced code block runs from its opening ``` line
+    to the next line ending in ```, so blank lines inside the code stay in the
+    block. A fence that is never closed is treated as ordinary text.
+
+    Args:
+        markdown: a markdown string; UTF-8 encoded markdown in a bytes-like
+                  buffer such as an `mmap` (decoded one block at a time); or
+                  any iterable of lines such as an open file (a trailing
+                  "\\n" on each line is ignored).
+
+    Yields:
+        `Block` objects in document order.
+    """
+    if isinstance(markdown, str):
+        return _scan(_split_text(markdown), fences=True)
+    if isinstance(markdown, (bytes, bytearray, mmap.mmap)):
+        return _scan(_split_buffer(markdown, "utf-8"), fences=True)
+    return _scan(_split_lines(markdown), fences=True)
+
+
+def markdown_to_typed_blocks(markdown):
+    """Return the list of `Block`s for a markdown string."""
+    return list(scan_blocks(markdown))
@@ -0,0 +1,175 @@
+from blockscanner import scan_blocks
+from blocktype import BlockType
+from markdowntohtml import block_to_html_node
+from parentnode import ParentNode
+
+# Raised (as a plain Exception, like extract_title always has) for pages
+# without an H1 heading.
+NO_TITLE_MESSAGE = "No H1 header found in markdown"
+
+
+def heading_level(text):
+    """Return the number of leading "#" characters of a heading block."""
+    level = 0
+    for char in text:
+        if char != "#":
+            break
+        level += 1
+    return level
+
+
+def block_title(block):
+    """Return the page title a block provides, or None.
+
+    Only an H1 block ("# Title") provides a title; the text after "# " is
+    returned stripped, exactly as `extract_title` does.
+    """
+    if block.type == BlockType.HEADING and block.text.startswith("# "):
+        return block.text[2:].strip()
+    return None
+
+
+class Document:
+    """A parsed markdown page: its node tree plus what was learned parsing it.
+
+    Everything here is collected while the page is parsed once by
+    `parse_document`, so title extraction, listings or link checking never
+    need to parse the markdown again.
+
+    Attributes:
+        root: the ParentNode("div") holding one node per block, as returned
+              by `markdown_to_html_node`.
+        title: text of the first H1 heading, or None.
+        headings: list of (level, text) tuples in document order; text is
+                  the heading's markdown source.
+        links: list of (text, url) tuples for every link.
+        images: list of (alt_text, url) tuples for every image.
+    """
+    __slots__ = ("root", "title", "headings", "links", "images")
+
+    def __init__(self, root, title=None, headings=None, links=None, images=None):
+        self.root = root
+        self.title = title
+        self.headings = [] if headings is None else headings
+        self.links = [] if links is None else links
+        self.images = [] if images is None else images
+
+    def require_title(self):
+        """Return the title, raising Exception when the page has no H1."""
+        if self.title is None:
+            raise Exception(NO_TITLE_MESSAGE)
+        return self.title
+
+    def __repr__(self):
+        return (f"Document(title={self.title!r}, blocks={len(self.root.children)}, "
+                f"headings={len(self.headings)}, links={len(self.links)}, "
+                f"images={len(self.images)})")
+
+
+def collect_refs(node, links, images):
+    """Append the links and images found in a block's node tree."""
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if node.children:
+            # Reversed so refs are collected in document order
+            stack.extend(reversed(node.children))
+        elif node.tag == "a":
+            links.append((node.value, node.props["href"]))
+        elif node.tag == "img":
+            images.append((node.props["alt"], node.props["src"]))
+
+
+def _record_heading(document, block):
+    if block.type == BlockType.HEADING:
+        if document.title is None:
+            document.title = block_title(block)
+        level = heading_level(block.text)
+        document.headings.append((level, block.text[level + 1:].strip()))
+
+
+def _record_block(document, block, node):
+    """Add what `block` (rendered as `node`) contributes to `document`."""
+    _record_heading(document, block)
+    if block.type != BlockType.CODE:
+        collect_refs(node, document.links, document.images)
+
+
+def parse_document(markdown, block_cache=None, resolver=None):
+    """Parse a markdown document into a `Document` in a single pass.
+
+    Builds the same node tree as `markdown_to_html_node` and, block by block,
+    records the title, the heading outline and the link/image references.
+
+    With a `blockcache.BlockCache`, each block is instead rendered through
+    the cache (with `resolver`) and the root holds one RawHTMLNode per
+    block, so the document must be rendered with a resolver for the same
+    base path.
+
+    Args:
+        markdown: A markdown-formatted string representing a full document.
+        block_cache: Optional BlockCache of rendered blocks.
+        resolver: URLResolver the cached blocks are rendered with.
+
+    Returns:
+        A Document.
+    """
+    children = []
+    document = Document(None)
+    for block in scan_blocks(markdown):
+        if block_cache is None:
+            node = block_to_html_node(block.text, block.type, block.lines)
+            _record_block(document, block, node)
+        else:
+            node, links, images = block_cache.render(block, resolver)
+            _record_heading(document, block)
+            document.links.extend(links)
+            document.images.extend(images)
+        children.append(node)
+    document.root = ParentNode("div", children)
+    return document
+
+
+class DocumentStream(Document):
+    """A document rendered block by block straight from its source.
+
+    Stands in for a Document's root node: `iter_html` reads, parses and
+    renders one block at a time, so memory is bounded by the largest block
+    rather than by the size of the file. With `record` set, title, headings
+    and references are filled in as blocks are rendered and are complete once
+    `iter_html` has been exhausted; they grow with the document, so they are
+    not collected by default.
+
+    Attributes:
+        source: where blocks are read from - an iterable of markdown lines,
+                such as an open file (which can only be rendered once), or a
+                buffer such as an mmap; see `scan_blocks`.
+        record: whether to collect title, headings and references.
+    """
+    __slots__ = ("source", "record")
+
+    def __init__(self, source, record=False):
+        super().__init__(None)
+        self.source = source
+        self.record = record
+
+    def iter_html(self, resolver=None):
+        """Yield the same HTML as `parse_document(...).root.iter_html()`.
+
+        Raises ValueError, like an empty ParentNode, when there are no blocks.
+        """
+        blocks = scan_blocks(self.source)
+        block = next(blocks, None)
+        if block is None:
+            raise ValueError("ParentNode must have children to convert to HTML.")
+        yield "<div>"
+        while block is not None:
+            node = block_to_html_node(block.text, block.type, block.lines)
+            if self.record:
+                _record_block(self, block, node)
+            yield from node.iter_html(resolver)
+            block = next(blocks, None)
+        yield "</div>"
+
+    def __repr__(self):
+        return f"DocumentStream(title={self.title!r}, headings={len(self.headings)})"
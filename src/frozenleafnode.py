@@ -0,0 +1,42 @@
+from types import MappingProxyType
+
+from leafnode import LeafNode
+
+class FrozenLeafNode(LeafNode):
+    """Represents an immutable HTML leaf node.
+
+    Renders exactly like a LeafNode, but its attributes cannot be set or
+    deleted after construction and `props` is a read-only mapping. Used for
+    inline nodes that are memoized and shared between blocks and pages, so
+    that no holder of a shared node can change it for the others.
+    """
+    __slots__ = ()
+
+    def __init__(self, tag, value, props=None):
+        if props is not None:
+            props = MappingProxyType(dict(props))
+        set_slot = object.__setattr__
+        set_slot(self, "tag", tag)
+        set_slot(self, "value", value)
+        set_slot(self, "children", None)
+        set_slot(self, "props", props)
+
+    @classmethod
+    def freeze(cls, node):
+        """Return an immutable copy of the LeafNode `node`."""
+        return cls(node.tag, node.value, node.props)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"FrozenLeafNode is immutable; cannot set {name!r}")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"FrozenLeafNode is immutable; cannot delete {name!r}")
+
+    def __reduce__(self):
+        # The default slot-state pickling would restore attributes with
+        # setattr, and a mappingproxy cannot be pickled
+        props = None if self.props is None else dict(self.props)
+        return (type(self), (self.tag, self.value, props))
+
+    def __repr__(self):
+        return f"FrozenLeafNode(tag={self.tag}, value={self.value}, props={self.props})"
@@ -6,7 +6,12 @@ class HTMLNode:
         value: Optional[str] - inner text value for leaf nodes.
         children: Optional[list] - list of child HTMLNode objects.
         props: Optional[dict] - attributes for the tag.
+
+    Nodes use __slots__ instead of a per-instance __dict__, which keeps large
+    node trees compact; subclasses declare their own (possibly empty) slots.
     """
+    __slots__ = ("tag", "value", "children", "props")
+
     def __init__(self, tag=None, value=None, 
                  children=None, props=None):
         # A string representing the HTML tag
@@ -18,27 +23,46 @@ class HTMLNode:
         # Dictionary of key-value pairs for the HTML attributes
         self.props = props
 
-    def to_html(self):
+    def to_html(self, resolver=None):
         """Render this node (and its children) to an HTML string.
 
+        `resolver` is an optional `URLResolver` applied to URL attributes.
         This base implementation is intentionally not implemented. Subclasses
         such as `LeafNode` and `ParentNode` should implement rendering.
         """
         raise NotImplementedError("to_html method is not implemented yet.")
     
-    def props_to_html(self):
+    def iter_html(self, resolver=None):
+        """Yield this node's HTML as a sequence of string chunks.
+
+        Joining the chunks gives the same result as `to_html`. Nodes with
+        children override this to stream their children instead of building
+        one string per level of nesting; the default yields `to_html()`.
+        """
+        yield self.to_html(resolver)
+
+    def write_html(self, fp, resolver=None):
+        """Stream this node's HTML into the writable text file `fp`."""
+        fp.writelines(self.iter_html(resolver))
+
+    def props_to_html(self, resolver=None):
         """Convert the `props` dict into an HTML attributes string.
 
         Example: {'class': 'x', 'id': 'y'} -> ' class="x" id="y"'
-        Returns an empty string when there are no props.
+        Returns an empty string when there are no props. When a `URLResolver`
+        is given, root-relative `href`/`src` values get the site base path.
         """
         # if we have no props, return empty string
         if self.props is None or len(self.props) == 0:
             return ""
 
+        props = self.props
+        if resolver is not None:
+            props = resolver.resolve_props(props)
+
         # else, convert from props to return string
         props_html = ""
-        for key, value in self.props.items():
+        for key, value in props.items():
             props_html += f' {key}="{value}"'
         return props_html
     
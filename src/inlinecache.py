@@ -0,0 +1,100 @@
+from functools import lru_cache
+
+from frozenleafnode import FrozenLeafNode
+from utilityfunctions import text_to_textnode, text_node_to_html_node
+
+# Default number of inline strings whose parsed children are kept.
+DEFAULT_MAXSIZE = 4096
+
+# Longer strings (typically whole paragraphs) rarely repeat, so they are
+# parsed directly rather than filling the memo.
+MAX_TEXT_LENGTH = 256
+
+
+def parse_inline(text):
+    """Parse inline markdown into a tuple of FrozenLeafNode children."""
+    return tuple(FrozenLeafNode.freeze(text_node_to_html_node(text_node))
+                 for text_node in text_to_textnode(text))
+
+
+class InlineCache:
+    """Bounded LRU memo of inline markdown parsing.
+
+    Short strings that repeat across a site (nav lists, "Read more" links,
+    recurring headings) are parsed once. Cached children are tuples of
+    FrozenLeafNodes, so they can be shared by any number of blocks and pages
+    without one of them changing what the others render.
+
+    Each process has its own memo; worker processes report their counts with
+    `take_stats` and the parent adds them up with `merge_stats`.
+
+    Attributes:
+        maxsize: number of strings kept; 0 disables the memo.
+    """
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        self.configure(maxsize)
+
+    def configure(self, maxsize):
+        """Empty the memo, reset its counters and keep up to `maxsize` strings."""
+        self.maxsize = maxsize
+        self._memo = lru_cache(maxsize)(parse_inline) if maxsize > 0 else None
+        # Counts already returned by take_stats, and counts merged in
+        self._taken = (0, 0)
+        self._merged = (0, 0)
+
+    @property
+    def enabled(self):
+        return self._memo is not None
+
+    def lookup(self, text):
+        """Return the cached children of `text` as a tuple, or None.
+
+        None means the text is not memoized (the memo is disabled or the text
+        is too long) and should be parsed directly.
+        """
+        if self._memo is None or len(text) > MAX_TEXT_LENGTH:
+            return None
+        return self._memo(text)
+
+    def _counts(self):
+        if self._memo is None:
+            return 0, 0
+        info = self._memo.cache_info()
+        return info.hits, info.misses
+
+    @property
+    def hits(self):
+        return self._counts()[0] - self._taken[0] + self._merged[0]
+
+    @property
+    def misses(self):
+        return self._counts()[1] - self._taken[1] + self._merged[1]
+
+    def take_stats(self):
+        """Return (hits, misses) since the last call, for `merge_stats`."""
+        hits, misses = self._counts()
+        taken = (hits - self._taken[0], misses - self._taken[1])
+        self._taken = (hits, misses)
+        return taken
+
+    def merge_stats(self, stats):
+        """Add (hits, misses) counted by another process."""
+        self._merged = (self._merged[0] + stats[0], self._merged[1] + stats[1])
+
+    def stats(self):
+        """Return a one-line summary of hits and misses."""
+        hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        rate = 100 * hits / lookups if lookups else 0.0
+        return f"Inline cache: {hits} hits, {misses} misses ({rate:.1f}% hit rate)"
+
+    def __repr__(self):
+        return f"InlineCache(maxsize={self.maxsize})"
+
+
+# The memo used by `markdowntohtml.text_to_children`. It starts disabled, so
+# callers of `markdown_to_html_node` get nodes of their own to modify. Site
+# builds turn it on with --inline-cache (see `main.build`): on a typical site
+# few strings repeat, and every miss costs more than parsing without the
+# memo, so it is only worth it where much of the text repeats.
+INLINE_CACHE = InlineCache(0)
@@ -6,15 +6,18 @@ class LeafNode(HTMLNode):
     Leaf nodes have a `tag` and `value` and may have `props`. They must not
     contain children.
     """
+    __slots__ = ()
+
     def __init__(self, tag, value, props=None):
         super().__init__(tag=tag, value=value, children=None, props=props)
 
-    def to_html(self):
+    def to_html(self, resolver=None):
         """Render the leaf node to HTML.
 
         Enforces that the node has no children and that it has a value.
         Supports a small set of tags (currently 'p' and 'a'). If `tag` is
-        None the method returns the raw `value` (plain text).
+        None the method returns the raw `value` (plain text). An optional
+        `URLResolver` is applied to the node's URL attributes.
         """
         # LeafNode must not have children (we only support leaf nodes here)
         if self.children:
@@ -26,7 +29,7 @@ class LeafNode(HTMLNode):
             return self.value
 
         tag_lower = self.tag.lower()
-        props_html = self.props_to_html()
+        props_html = self.props_to_html(resolver)
 
         # Support <img> as a self-closing tag; it does not use `value`.
         if tag_lower == "img":
@@ -1,16 +1,44 @@
 from textnode import TextNode
 from textnode import TextType
-from utilityfunctions import markdown_to_blocks
-from blocktype import block_to_block_type, BlockType
-from markdowntohtml import markdown_to_html_node
+from blockscanner import scan_blocks
+from document import parse_document, block_title, DocumentStream, NO_TITLE_MESSAGE
+from manifest import BuildManifest, hash_file
+from astcache import ASTCache, DEFAULT_MAX_BYTES
+from blockcache import BlockCache
+from inlinecache import INLINE_CACHE, DEFAULT_MAXSIZE as INLINE_CACHE_SIZE
+from pipeline import Pipeline
+from profiling import BuildProfiler, disable_inherited, profile_call
+from template import Template
+from tracing import TRACER
+from urlresolver import URLResolver
+from staticsync import sync_directory, prune_empty_dirs, COPY_STRATEGIES
+import mmap
+import os
 import sys
 
+# Directory holding build state that persists between runs (not published).
+CACHE_DIR = ".ssg-cache"
+MANIFEST_PATH = f"{CACHE_DIR}/build-manifest.json"
+AST_CACHE_DIR = f"{CACHE_DIR}/ast"
+BLOCK_CACHE_PATH = f"{CACHE_DIR}/blocks.pickle"
+
+# Buffer size for page output files; streamed pages are flushed in chunks of
+# this size rather than per rendered node.
+WRITE_BUFFER_SIZE = 64 * 1024
+
+# How generate_page reads markdown sources: "read" loads the whole file,
+# "stream" parses and renders it block by block as it is read, and "mmap"
+# maps it into memory and decodes one block at a time.
+READERS = ("read", "stream", "mmap")
+
 
 def extract_title(markdown):
     """Extract the H1 header from a markdown document.
 
     Searches through the markdown for an H1 header (line starting with "# ").
     Returns the header text stripped of whitespace and the leading "# ".
+    Scanning stops at the first H1; pages that are being rendered get their
+    title from `parse_document` instead.
 
     Args:
         markdown: A markdown-formatted string.
@@ -25,120 +53,493 @@ def extract_title(markdown):
         markdown = "# My Title\\n\\nContent here"
         title = extract_title(markdown)  # Returns "My Title"
     """
-    blocks = markdown_to_blocks(markdown)
-    
-    for block in blocks:
-        block_type = block_to_block_type(block)
-        if block_type == BlockType.HEADING:
-            # Check if it's an H1 (starts with "# ")
-            stripped = block.strip()
-            if stripped.startswith("# "):
-                # Extract text after "# " and strip whitespace
-                return stripped[2:].strip()
+    for block in scan_blocks(markdown):
+        title = block_title(block)
+        if title is not None:
+            return title
     
     # No H1 header found
-    raise Exception("No H1 header found in markdown")
-
-
-def main():
+    raise Exception(NO_TITLE_MESSAGE)
+
+
+def parse_args(argv):
+    """Parse command-line arguments for a site build."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the static site.")
+    parser.add_argument("base_path", nargs="?", default="/",
+                        help="site root prefixed to absolute links (default: /)")
+    parser.add_argument("--hash-static", action="store_true",
+                        help="compare static files by content hash when "
+                             "their size matches but mtime differs")
+    parser.add_argument("--copy-strategy", default="auto",
+                        choices=("auto",) + COPY_STRATEGIES,
+                        help="how static files are copied; unsupported "
+                             "strategies fall back to the next one (default: auto)")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="number of worker processes for page generation "
+                             "(default: CPU count)")
+    parser.add_argument("--reader", default="read", choices=READERS,
+                        help="how markdown sources are read: whole files, or "
+                             "streamed block by block for very large pages "
+                             "(default: read)")
+    parser.add_argument("--ast-cache", action="store_true",
+                        help=f"load parsed pages from {AST_CACHE_DIR} instead of "
+                             "parsing sources that did not change, as when "
+                             "rebuilding after a template change; every page "
+                             "parsed is written there, which slows builds of "
+                             "new or edited pages")
+    parser.add_argument("--ast-cache-mb", type=int, default=DEFAULT_MAX_BYTES // 2**20,
+                        help="size cap of the parsed-page cache in MiB; least "
+                             "recently used pages are evicted after each build "
+                             "(default: %(default)s)")
+    parser.add_argument("--block-cache", default="off",
+                        choices=("off", "memory", "disk"),
+                        help="reuse rendered HTML of blocks repeated across "
+                             "pages; \"disk\" also keeps it between builds in "
+                             f"{BLOCK_CACHE_PATH}. Parsed pages then hold "
+                             "rendered HTML instead of block trees (default: off)")
+    parser.add_argument("--block-cache-mb", type=int, default=16,
+                        help="memory cap of the block cache in MiB (default: 16)")
+    parser.add_argument("--inline-cache", action="store_true",
+                        help="memoize parsing of short inline strings repeated "
+                             "across pages; only faster for sites with much "
+                             "repeated text (see `python3 -m bench inline`)")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="generate pages with the asyncio read/render/write "
+                             "pipeline instead of worker processes")
+    parser.add_argument("--read-queue", type=int, default=8,
+                        help="pipeline: pages read ahead of rendering (default: 8)")
+    parser.add_argument("--write-queue", type=int, default=8,
+                        help="pipeline: rendered pages waiting to be written (default: 8)")
+    parser.add_argument("--io-threads", type=int, default=4,
+                        help="pipeline: threads used for file reads and writes (default: 4)")
+    parser.add_argument("--profile", nargs="?", const="profile.pstats", default=None,
+                        metavar="PATH",
+                        help="profile the build, including worker processes, and "
+                             "write the merged stats to PATH (default: "
+                             "profile.pstats) with a text summary beside it")
+    parser.add_argument("--trace", default=None, metavar="PATH",
+                        help="write a timeline of the build's stages, pages and "
+                             "workers to PATH as Chrome trace events (load it in "
+                             "chrome://tracing or ui.perfetto.dev)")
+    args = parser.parse_args(argv)
+    if args.pipeline and args.reader != "read":
+        # Pipeline stages hand whole documents from one to the next
+        parser.error("--reader cannot be combined with --pipeline")
+    return args
+
+
+def parse_cache_args(argv):
+    """Parse arguments for the `cache` subcommand."""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="main.py cache",
+                                     description="Manage the build cache.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    gc = commands.add_parser("gc", help="evict least recently used parsed "
+                                        "pages until the cache fits its cap")
+    gc.add_argument("--max-mb", type=int, default=DEFAULT_MAX_BYTES // 2**20,
+                    help="size cap in MiB (default: %(default)s); 0 empties the cache")
+    return parser.parse_args(argv)
+
+
+def cache_main(argv):
+    """Run the `cache` subcommand, e.g. `main.py cache gc --max-mb 16`."""
+    args = parse_cache_args(argv)
+    if args.command == "gc":
+        removed, kept, kept_bytes = ASTCache(AST_CACHE_DIR).gc(args.max_mb * 2**20)
+        print(f"AST cache: {removed} evicted, {kept} kept ({kept_bytes} bytes)")
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "cache":
+        return cache_main(argv[1:])
+    args = parse_args(argv)
+    TRACER.configure(args.trace is not None)
+    profiler = None
+    if args.profile is not None:
+        profiler = BuildProfiler()
+        profiler.enable()
+    try:
+        with TRACER.span("build"):
+            build(args, profiler)
+    finally:
+        # The memo's shared, frozen nodes are only for this build
+        INLINE_CACHE.configure(0)
+        if profiler is not None:
+            profiler.disable()
+            report_path = profiler.save(args.profile)
+            print(f"Profile: {args.profile} (summary in {report_path})")
+        if args.trace is not None:
+            TRACER.save(args.trace)
+            print(f"Trace: {args.trace}")
+
+
+def build(args, profiler=None):
+    """Build the site as configured by `parse_args`.
+
+    Enables the inline parsing memo (`INLINE_CACHE`) when --inline-cache is
+    given; `main` disables it again afterwards.
+
+    With a `profiling.BuildProfiler`, pages generated in worker processes
+    are profiled there and merged into it.
+    """
     # Set the root of the site
-    base_path = sys.argv[1] if len(sys.argv) > 1 else "/"
-
-    # Clear and copy static files, then generate the index page
-    copy_source_to_destination("static", "docs")
-    # Generate `public/index.html` from `content/index.md` using `template.html`
-    generate_pages_recursive("content", "template.html", "docs", base_path)
-
-def copy_source_to_destination(source_directory, destination_directory):
-    """Recursively Copy all files from source_directory to destination_directory.
-    Delete everything from destination_directory before copying.
+    base_path = args.base_path
+    jobs = args.jobs if args.jobs is not None else (os.cpu_count() or 1)
+
+    with TRACER.span("load caches"):
+        manifest = BuildManifest.load(MANIFEST_PATH)
+        ast_cache = None
+        if args.ast_cache:
+            ast_cache = ASTCache(AST_CACHE_DIR, max_bytes=args.ast_cache_mb * 2**20)
+        block_cache = None
+        if args.block_cache == "disk":
+            block_cache = BlockCache.load(BLOCK_CACHE_PATH, args.block_cache_mb * 2**20)
+        elif args.block_cache == "memory":
+            block_cache = BlockCache(args.block_cache_mb * 2**20)
+    INLINE_CACHE.configure(INLINE_CACHE_SIZE if args.inline_cache else 0)
+    pipeline = None
+    if args.pipeline:
+        pipeline = Pipeline(read_queue_size=args.read_queue,
+                            write_queue_size=args.write_queue,
+                            io_workers=args.io_threads)
+
+    # Sync static files into the output, copying only what changed
+    with TRACER.span("static copy", strategy=args.copy_strategy):
+        stats = copy_source_to_destination("static", "docs", manifest=manifest,
+                                           use_hash=args.hash_static,
+                                           strategy=args.copy_strategy)
+    print(f"Static: {stats.copied} copied ({stats.bytes_copied} bytes), "
+          f"{stats.skipped} unchanged ({stats.bytes_skipped} bytes), "
+          f"{stats.deleted} deleted")
+    # Generate `public/index.html` from `content/index.md` using `template.html`,
+    # skipping pages whose inputs are unchanged since the last build
+    try:
+        with TRACER.span("generate pages", jobs=jobs, pipeline=args.pipeline,
+                         reader=args.reader):
+            built, skipped = generate_pages_recursive(
+                "content", "template.html", "docs", base_path,
+                manifest=manifest, jobs=jobs, pipeline=pipeline, reader=args.reader,
+                ast_cache=ast_cache, block_cache=block_cache, profiler=profiler)
+    except PageGenerationError as e:
+        sys.exit(f"error: {e}")
+    finally:
+        # Keep pages generated before a failure from being rebuilt next time
+        with TRACER.span("save caches"):
+            manifest.save()
+            if ast_cache is not None:
+                ast_cache.gc()
+            if args.block_cache == "disk":
+                block_cache.save(BLOCK_CACHE_PATH)
+    print(f"Pages: {len(built)} generated, {len(skipped)} up to date")
+    if block_cache is not None and built:
+        print(block_cache.stats())
+    if INLINE_CACHE.enabled and built:
+        print(INLINE_CACHE.stats())
+    if pipeline is not None:
+        print(pipeline.report())
+
+def copy_source_to_destination(source_directory, destination_directory,
+                               manifest=None, use_hash=False, strategy="auto"):
+    """Sync all files from source_directory into destination_directory.
+
+    New or changed files are copied and unchanged ones are skipped; files that
+    are not part of the source (such as generated pages) are left alone. With
+    a manifest, previously synced files whose source was deleted are removed.
+    See `staticsync.sync_directory`.
 
     Args:
         source_directory: Path to the source directory.
         destination_directory: Path to the destination directory.
+        manifest: Optional BuildManifest recording the synced files.
+        use_hash: Compare file contents when size matches but mtime differs.
+        strategy: Copy strategy ("auto", "hardlink", "reflink", "kernel" or
+            "copy"); unsupported strategies fall back to the next one.
+
+    Returns:
+        A SyncStats describing the files copied, skipped and deleted.
     """
-    import os
-    import shutil
-
-    # Remove the destination directory entirely if it exists to ensure a clean copy
-    if os.path.exists(destination_directory):
-        # Remove everything under the destination directory
-        shutil.rmtree(destination_directory)
-
-    # Recreate the destination directory
-    os.makedirs(destination_directory, exist_ok=True)
-
-    # Copy files and directories from source to destination
-    for item in os.listdir(source_directory):
-        s = os.path.join(source_directory, item)
-        d = os.path.join(destination_directory, item)
-        if os.path.isdir(s):
-            shutil.copytree(s, d, dirs_exist_ok=True)
-        else:
-            shutil.copy2(s, d)
-
-def generate_page(from_path, template_path, dest_path, base_path):
+    return sync_directory(source_directory, destination_directory,
+                          manifest=manifest, use_hash=use_hash,
+                          strategy=strategy)
+
+def generate_page(from_path, template_path, dest_path, base_path, template=None,
+                  reader="read", ast_cache=None, block_cache=None):
     """Generate an HTML page from a markdown source and an HTML template.
 
-    Reads the markdown file at `from_path`, converts it to HTML using the
-    markdown pipeline, extracts the document title (first H1), inserts the
-    generated HTML and title into the template, and writes the result to
-    `dest_path`. Creates destination directories as needed.
+    Reads the markdown file at `from_path`, parses it once into a Document
+    (node tree plus title, the first H1), inserts the generated HTML and
+    title into the template, and writes the result to `dest_path`. Creates
+    destination directories as needed.
+
+    Pass an already compiled `Template` as `template` to avoid reading and
+    parsing `template_path` again for every page.
+
+    The page is streamed to disk: the template prefix, the content HTML and
+    the template suffix are written chunk by chunk as the node tree renders,
+    without building the full page string in memory.
+
+    With `reader="stream"` the markdown is not loaded either: the title comes
+    from a pre-scan that stops at the first H1, then the file is read again
+    and each block is parsed, rendered and written as soon as it is complete
+    (see `DocumentStream`), so memory stays bounded by the largest block.
+    `reader="mmap"` renders the same way from a memory-mapped file, finding
+    block boundaries in the raw bytes and decoding only the block being
+    rendered.
+
+    With an `astcache.ASTCache`, the whole-file reader loads the parsed page
+    from the cache when this exact source was parsed before, and caches it
+    otherwise; the streaming readers never build a whole tree to cache.
+    With a `blockcache.BlockCache`, blocks already rendered for another page
+    (or earlier in this one) are spliced in from the cache.
     """
-    import os
+    # Read and compile the template unless the caller already did
+    if template is None:
+        template = Template.from_file(template_path)
+
+    # Root-relative URLs are resolved against the base path as nodes render
+    resolver = URLResolver(base_path)
+    with TRACER.span("resolve template", "page"):
+        template = template.resolve_urls(resolver)
+
+    # Content renders as the page is written, so with TRACER the two share a
+    # "render and write" span (render_page times them separately)
+    if reader == "mmap":
+        with open(from_path, "rb") as f:
+            source = _map_file(f)
+            try:
+                # Universal newlines are only applied when reading text, so
+                # pages with "\r" line endings are streamed instead
+                if source.find(b"\r") == -1:
+                    with TRACER.span("title", "page"):
+                        title = extract_title(source)
+                    with TRACER.span("render and write", "page", reader="mmap"):
+                        chunks = template.iter_render(title, DocumentStream(source), resolver)
+                        write_page(dest_path, chunks)
+                    return
+            finally:
+                if isinstance(source, mmap.mmap):
+                    source.close()
+        reader = "stream"
+
+    if reader == "stream":
+        with open(from_path, "r", encoding="utf-8") as f:
+            # Title (may raise if no H1 present) before creating the output
+            with TRACER.span("title", "page"):
+                title = extract_title(f)
+            f.seek(0)
+            with TRACER.span("render and write", "page", reader="stream"):
+                chunks = template.iter_render(title, DocumentStream(f), resolver)
+                write_page(dest_path, chunks)
+        return
+    if reader != "read":
+        raise ValueError(f"Unknown reader: {reader!r}")
 
     # Read source markdown
-    with open(from_path, "r", encoding="utf-8") as f:
-        markdown = f.read()
-
-    # Read template
-    with open(template_path, "r", encoding="utf-8") as f:
-        template = f.read()
-
-    # Convert markdown to HTML string
-    html_node = markdown_to_html_node(markdown)
-    content_html = html_node.to_html()
-
-    # Extract title (may raise if no H1 present)
-    title = extract_title(markdown)
-
-    # Replace placeholders in template
-    output = template.replace("{{ Title }}", title)
-    output = output.replace("{{ Content }}", content_html)
-
-    # Normalize base_path to ensure it ends with a single slash (but keep "/" as-is)
-    if not base_path:
-        normalized_base = "/"
+    with TRACER.span("read", "page"):
+        with open(from_path, "r", encoding="utf-8") as f:
+            markdown = f.read()
+    with TRACER.span("parse", "page"):
+        document = _parse(markdown, resolver, ast_cache, block_cache)
+
+    # Title (may raise if no H1 present) is checked before creating the output
+    with TRACER.span("title", "page"):
+        title = document.require_title()
+
+    with TRACER.span("render and write", "page", reader="read"):
+        chunks = template.iter_render(title, document.root, resolver)
+        write_page(dest_path, chunks)
+
+def _map_file(f):
+    """Map the open binary file `f` read-only (empty files cannot be mapped)."""
+    if os.fstat(f.fileno()).st_size == 0:
+        return b""
+    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def _parse(markdown, resolver, ast_cache=None, block_cache=None):
+    """Parse `markdown` into a Document, through whichever caches are given."""
+    if block_cache is None:
+        parse = parse_document
+        variant = ""
     else:
-        normalized_base = base_path if base_path.endswith("/") else base_path + "/"
+        def parse(markdown):
+            return parse_document(markdown, block_cache, resolver)
+        # Cached blocks are rendered for one base path, and so is the tree
+        variant = resolver.base
+    if ast_cache is None:
+        return parse(markdown)
+    return ast_cache.get_or_parse(markdown, parse, variant)
 
-    # Replace absolute-rooted href/src paths in the generated output so that
-    # links and images reference the configured base path. Handle both
-    # double-quoted and single-quoted attributes.
-    output = output.replace('href="/', f'href="{normalized_base}')
-    output = output.replace("href='/", f"href='{normalized_base}")
-    output = output.replace('src="/', f'src="{normalized_base}')
-    output = output.replace("src='/", f"src='{normalized_base}")
+def render_page(markdown, template, base_path, ast_cache=None, block_cache=None):
+    """Render a markdown document into the template and return the page HTML.
 
+    Args:
+        markdown: The markdown source of the page.
+        template: A compiled Template (or template text) with {{ Title }}
+            and {{ Content }} placeholders.
+        base_path: Site root prefixed to absolute href/src paths.
+        ast_cache: Optional ASTCache of parsed pages.
+        block_cache: Optional BlockCache of rendered blocks.
+    """
+    # Root-relative URLs are resolved against the base path as nodes render
+    resolver = URLResolver(base_path)
+
+    # Convert markdown to HTML string
+    with TRACER.span("parse", "page"):
+        document = _parse(markdown, resolver, ast_cache, block_cache)
+    with TRACER.span("render content", "page"):
+        content_html = document.root.to_html(resolver)
+
+    # Title (may raise if no H1 present)
+    with TRACER.span("title", "page"):
+        title = document.require_title()
+
+    # Fill the template placeholders in a single pass
+    if isinstance(template, str):
+        template = Template(template)
+    with TRACER.span("fill template", "page"):
+        return template.resolve_urls(resolver).render(title, content_html)
+
+def write_page(dest_path, output):
+    """Write rendered page HTML to `dest_path`, creating directories as needed.
+
+    `output` is either the page as a string or an iterable of string chunks,
+    which are written through a buffered file as they are produced. The page
+    is written to a temporary file and renamed into place, so a render error
+    part-way through never leaves a truncated page behind.
+    """
     # Ensure destination directory exists
     dest_dir = os.path.dirname(dest_path)
     if dest_dir:
         os.makedirs(dest_dir, exist_ok=True)
 
     # Write output
-    with open(dest_path, "w", encoding="utf-8") as f:
-        f.write(output)
+    tmp_path = dest_path + ".tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as f:
+            if isinstance(output, str):
+                f.write(output)
+            else:
+                f.writelines(output)
+        os.replace(tmp_path, dest_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+class PageGenerationError(Exception):
+    """Raised when a page fails to generate; carries the source path.
+
+    Attributes:
+        path: the markdown source that failed.
+        message: description of the underlying error.
+    """
+    def __init__(self, path, message):
+        super().__init__(path, message)
+        self.path = path
+        self.message = message
+
+    def __str__(self):
+        return f"{self.path}: {self.message}"
+
+
+# Compiled template and caches shared by every page a worker process
+# generates; set once per worker by `_init_page_worker`.
+_worker_template = None
+_worker_ast_cache = None
+_worker_block_cache = None
+_worker_profiling = False
+
+
+def _init_page_worker(template, ast_cache=None, block_cache=None,
+                      inline_cache_size=INLINE_CACHE_SIZE, profiling=False,
+                      tracing=False):
+    global _worker_template, _worker_ast_cache, _worker_block_cache, _worker_profiling
+    _worker_template = template
+    _worker_ast_cache = ast_cache
+    _worker_block_cache = block_cache
+    if block_cache is not None:
+        block_cache.track_updates()
+    INLINE_CACHE.configure(inline_cache_size)
+    # Each page is profiled on its own, not by the build's forked profiler
+    disable_inherited()
+    _worker_profiling = profiling
+    TRACER.configure(tracing, "page worker")
+
+
+def _generate_page_job(job, template=None, ast_cache=None, block_cache=None):
+    """Generate one page from a (from_path, template_path, dest_path, base_path,
+    reader) tuple, reporting failures as PageGenerationError.
+
+    Uses `template` and the caches if a template is given, else those the
+    worker was initialised with. Runs in worker processes for parallel
+    builds, so the error is flattened to a picklable message naming the
+    source path.
+    """
+    from_path, template_path, dest_path, base_path, reader = job
+    if template is None:
+        template = _worker_template
+        ast_cache = _worker_ast_cache
+        block_cache = _worker_block_cache
+    try:
+        with TRACER.span("page", "page", source=from_path):
+            generate_page(from_path, template_path, dest_path, base_path,
+                          template=template, reader=reader, ast_cache=ast_cache,
+                          block_cache=block_cache)
+    except Exception as e:
+        raise PageGenerationError(from_path, f"{type(e).__name__}: {e}") from e
+    return dest_path
+
+
+def _generate_page_or_error(job):
+    """`_generate_page_job`, returning its PageGenerationError instead of
+    raising it."""
+    try:
+        return _generate_page_job(job)
+    except PageGenerationError as e:
+        return e
+
+
+def _generate_page_in_worker(job):
+    """Worker-side `_generate_page_job`, returning (outcome, updates,
+    inline_stats, profile, events).
+
+    `outcome` is the page's dest_path, or its PageGenerationError if it
+    failed: pages are handed out in chunks, and a raised error would discard
+    the results of the pages before it in the same chunk. `updates` carries
+    the blocks this worker's cache rendered for the page (see
+    `BlockCache.take_updates`), or None without a block cache;
+    `inline_stats` are the page's inline memo counts (see
+    `InlineCache.take_stats`). When profiling, `profile` is the page's
+    (source, seconds, stats) for `BuildProfiler.merge`, else None; when
+    tracing, `events` are the page's trace events for `Tracer.merge`, else
+    None.
+    """
+    profile = None
+    if _worker_profiling:
+        outcome, seconds, stats = profile_call(_generate_page_or_error, job)
+        profile = (job[0], seconds, stats)
+    else:
+        outcome = _generate_page_or_error(job)
+    updates = None
+    if _worker_block_cache is not None:
+        updates = _worker_block_cache.take_updates()
+    events = TRACER.take_events() if TRACER.enabled else None
+    return outcome, updates, INLINE_CACHE.take_stats(), profile, events
 
-def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, base_path):
-    """Generate HTML pages for all markdown files in a directory recursively.
 
-    Args:
-        dir_path_content: Path to the content directory containing markdown files.
-        template_path: Path to the HTML template file.
-        dest_dir_path: Path to the destination directory for generated HTML files.
+def collect_pages(dir_path_content, dest_dir_path):
+    """List (markdown path, output path) pairs for every page, sorted by source.
+
+    Sorting makes the build order (and therefore which failure is reported
+    first) independent of directory listing order.
     """
     import os
 
+    pages = []
     for root, dirs, files in os.walk(dir_path_content):
         for file in files:
             if file.endswith(".md"):
@@ -146,10 +547,194 @@ def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, bas
                 # Determine relative path to maintain directory structure
                 rel_path = os.path.relpath(md_path, dir_path_content)
                 html_file_name = os.path.splitext(rel_path)[0] + ".html"
-                dest_path = os.path.join(dest_dir_path, html_file_name)
+                pages.append((md_path, os.path.join(dest_dir_path, html_file_name)))
+    pages.sort()
+    return pages
+
+
+def _run_page_jobs(jobs_to_run, jobs, template, ast_cache=None, block_cache=None,
+                   profiler=None):
+    """Run page jobs serially or on a process pool, yielding each output path.
+
+    The compiled `template` and the caches are handed to each worker process
+    once, when the worker starts; blocks the workers render are merged back
+    into `block_cache`, and their inline memo counts into `INLINE_CACHE`, as
+    their pages complete. With a `BuildProfiler`, every page is timed, and
+    pages generated in workers are profiled there and merged into it; so are
+    the workers' trace events into `TRACER`.
+    Results are yielded in job order. The first failing job (in that order)
+    raises its PageGenerationError, so parallel builds report the same error
+    as serial ones; every page before it is yielded first, including those
+    a worker generated in the same chunk.
+    """
+    if jobs <= 1 or len(jobs_to_run) <= 1:
+        for job in jobs_to_run:
+            if profiler is None:
+                yield _generate_page_job(job, template, ast_cache, block_cache)
+                continue
+            with profiler.page(job[0]):
+                dest_path = _generate_page_job(job, template, ast_cache, block_cache)
+            yield dest_path
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = min(jobs, len(jobs_to_run))
+    # Hand out pages in chunks so per-task IPC does not dominate small pages
+    chunksize = max(1, len(jobs_to_run) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_page_worker,
+                             initargs=(template, ast_cache, block_cache,
+                                       INLINE_CACHE.maxsize, profiler is not None,
+                                       TRACER.enabled)) as executor:
+        with TRACER.span("submit pages", "pool", pages=len(jobs_to_run), workers=workers,
+                         chunksize=chunksize):
+            results = executor.map(_generate_page_in_worker, jobs_to_run,
+                                   chunksize=chunksize)
+        waiting = len(jobs_to_run)
+        try:
+            for outcome, updates, inline_stats, profile, events in results:
+                if updates is not None:
+                    block_cache.merge(updates)
+                INLINE_CACHE.merge_stats(inline_stats)
+                if profile is not None:
+                    profiler.merge(*profile)
+                if events is not None:
+                    TRACER.merge(events)
+                    waiting -= 1
+                    TRACER.counter("page queue", "pool", waiting=waiting)
+                if isinstance(outcome, PageGenerationError):
+                    raise outcome
+                yield outcome
+        except BaseException:
+            executor.shutdown(wait=True, cancel_futures=True)
+            raise
+
+
+def _run_page_pipeline(jobs_to_run, pipeline, on_done, template, ast_cache=None,
+                       block_cache=None, profiler=None):
+    """Run page jobs through an asyncio `Pipeline`, calling on_done(dest_path)
+    in job order.
+
+    Every stage reports failures as a PageGenerationError naming the page's
+    source. With a `BuildProfiler`, each page's render stage is timed.
+    """
+
+    def stage(fn):
+        def run(job, *args):
+            try:
+                return fn(job, *args)
+            except Exception as e:
+                raise PageGenerationError(job[0], f"{type(e).__name__}: {e}") from e
+        return run
+
+    def read(job):
+        with open(job[0], "r", encoding="utf-8") as f:
+            return f.read()
+
+    def render(job, markdown):
+        if profiler is None:
+            return render_page(markdown, template, job[3], ast_cache, block_cache)
+        with profiler.page(job[0]):
+            return render_page(markdown, template, job[3], ast_cache, block_cache)
+
+    def write(job, output):
+        write_page(job[2], output)
+        return job[2]
+
+    pipeline.run(jobs_to_run, stage(read), stage(render), stage(write),
+                 on_done=lambda job, dest_path: on_done(dest_path))
+
+
+def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, base_path,
+                             manifest=None, jobs=1, pipeline=None, reader="read",
+                             ast_cache=None, block_cache=None, profiler=None):
+    """Generate HTML pages for all markdown files in a directory recursively.
+
+    When a `BuildManifest` is given, pages whose source, template, base path
+    and generator version are unchanged since they were recorded are skipped,
+    and outputs recorded for sources that no longer exist are deleted, along
+    with the directories that leaves empty. The manifest is updated in place;
+    saving it is left to the caller.
+
+    With `jobs` > 1 the pages are generated on a pool of worker processes. The
+    output is identical to a serial build and, on failure, the reported page is
+    the first failing one in source order.
+
+    With a `pipeline.Pipeline`, pages are instead read, rendered and written by
+    its asyncio stages in this process (`jobs` is ignored); its per-stage
+    statistics are available on the pipeline afterwards.
+
+    `reader` selects how each page's markdown is read (see `generate_page`);
+    the pipeline always reads whole files. With an `astcache.ASTCache`,
+    pages that are regenerated from a source parsed before (for example after
+    a template or base path change) load their parsed tree from it. With a
+    `blockcache.BlockCache`, blocks repeated across pages are rendered once.
+    With a `profiling.BuildProfiler`, the time of every generated page is
+    recorded and pages generated in worker processes are profiled.
+
+    Args:
+        dir_path_content: Path to the content directory containing markdown files.
+        template_path: Path to the HTML template file.
+        dest_dir_path: Path to the destination directory for generated HTML files.
+        base_path: Site root prefixed to absolute href/src paths.
+        manifest: Optional BuildManifest enabling incremental builds.
+        jobs: Number of worker processes (1 builds in this process).
+        pipeline: Optional Pipeline for overlapping file I/O with rendering.
+        reader: "read", "stream" or "mmap" (one of READERS).
+        ast_cache: Optional ASTCache of parsed pages.
+        block_cache: Optional BlockCache of rendered blocks.
+        profiler: Optional BuildProfiler of the build.
+
+    Returns:
+        A tuple (built, skipped) of lists of destination paths.
+
+    Raises:
+        PageGenerationError: naming the source of the first page that failed.
+    """
+    template_hash = hash_file(template_path) if manifest is not None else None
+    # Parse the template once for the whole build
+    template = Template.from_file(template_path)
+    built = []
+    skipped = []
+    pending = []
+    source_hashes = {}
+
+    with TRACER.span("walk content", source=dir_path_content):
+        pages = collect_pages(dir_path_content, dest_dir_path)
+    with TRACER.span("check manifest", pages=len(pages)):
+        for md_path, dest_path in pages:
+            if manifest is not None:
+                # Skip the page when nothing it depends on has changed
+                source_hash = hash_file(md_path)
+                if manifest.is_up_to_date(dest_path, md_path, source_hash,
+                                          template_hash, base_path):
+                    skipped.append(dest_path)
+                    continue
+                source_hashes[dest_path] = (md_path, source_hash)
+            pending.append((md_path, template_path, dest_path, base_path, reader))
+
+    def page_done(dest_path):
+        if manifest is not None:
+            md_path, source_hash = source_hashes[dest_path]
+            manifest.record(dest_path, md_path, source_hash,
+                            template_hash, base_path)
+        built.append(dest_path)
+
+    if pipeline is not None:
+        _run_page_pipeline(pending, pipeline, page_done, template, ast_cache,
+                           block_cache, profiler)
+    else:
+        for dest_path in _run_page_jobs(pending, jobs, template, ast_cache,
+                                        block_cache, profiler):
+            page_done(dest_path)
+
+    # Remove pages whose markdown source has been deleted, and the
+    # directories they leave empty
+    if manifest is not None:
+        for removed in manifest.remove_stale(built + skipped):
+            prune_empty_dirs(os.path.dirname(removed), dest_dir_path)
 
-                # Generate the page
-                generate_page(md_path, template_path, dest_path, base_path)
+    return built, skipped
 
 
 if __name__ == "__main__":
@@ -0,0 +1,166 @@
+import hashlib
+import json
+import os
+
+# Bump whenever a change to the generator can alter the rendered output, so
+# that pages recorded by an older generator are rebuilt instead of skipped.
+GENERATOR_VERSION = "9"
+
+# Version of the manifest file format itself.
+MANIFEST_FORMAT = 1
+
+
+def hash_bytes(data):
+    """Return the hex SHA-256 digest of `data` (bytes)."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path):
+    """Return the hex SHA-256 digest of the file at `path`.
+
+    The file is read in chunks so large sources do not need to be held in
+    memory just to be hashed.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BuildManifest:
+    """Persisted record of what every generated page was built from.
+
+    For each output page the manifest stores the source path, the hash of the
+    source markdown, the hash of the template, the base path and the generator
+    version. A page whose recorded inputs all match the current ones (and
+    whose output still exists) does not need to be generated again.
+
+    The manifest also lists the static assets synced into the output
+    directory, so an asset removed from the source tree can be deleted without
+    touching generated pages that live alongside it.
+
+    Attributes:
+        path: Optional[str] - where the manifest is loaded from / saved to.
+        pages: dict - maps output path -> dict of recorded inputs.
+        assets: dict - maps synced asset output path -> source path.
+    """
+    def __init__(self, path=None):
+        self.path = path
+        self.pages = {}
+        self.assets = {}
+
+    @classmethod
+    def load(cls, path):
+        """Load a manifest from `path`.
+
+        A missing, unreadable or incompatible manifest yields an empty one, so
+        the next build simply regenerates everything.
+        """
+        manifest = cls(path)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return manifest
+
+        if not isinstance(data, dict) or data.get("format") != MANIFEST_FORMAT:
+            return manifest
+        pages = data.get("pages")
+        if isinstance(pages, dict):
+            manifest.pages = pages
+        assets = data.get("assets")
+        if isinstance(assets, dict):
+            manifest.assets = assets
+        return manifest
+
+    def save(self, path=None):
+        """Write the manifest to `path` (defaults to the path it was loaded from).
+
+        The file is written to a temporary name and then moved into place so an
+        interrupted build never leaves a truncated manifest behind.
+        """
+        path = path or self.path
+        if path is None:
+            raise ValueError("BuildManifest.save requires a path.")
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"format": MANIFEST_FORMAT, "pages": self.pages,
+                       "assets": self.assets}, f,
+                      indent=1, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _key(dest_path):
+        return os.path.normpath(dest_path)
+
+    @staticmethod
+    def _inputs(source_path, source_hash, template_hash, base_path):
+        return {
+            "source": os.path.normpath(source_path),
+            "source_hash": source_hash,
+            "template_hash": template_hash,
+            "base_path": base_path,
+            "generator": GENERATOR_VERSION,
+        }
+
+    def is_up_to_date(self, dest_path, source_path, source_hash,
+                      template_hash, base_path):
+        """Return True when `dest_path` was built from exactly these inputs.
+
+        The output file must also still exist; a page deleted from the output
+        directory is always regenerated.
+        """
+        recorded = self.pages.get(self._key(dest_path))
+        if recorded != self._inputs(source_path, source_hash,
+                                    template_hash, base_path):
+            return False
+        return os.path.exists(dest_path)
+
+    def record(self, dest_path, source_path, source_hash, template_hash,
+               base_path):
+        """Record that `dest_path` was generated from the given inputs."""
+        self.pages[self._key(dest_path)] = self._inputs(
+            source_path, source_hash, template_hash, base_path)
+
+    def remove_stale(self, live_dest_paths):
+        """Delete outputs whose source no longer exists.
+
+        Every recorded output that is not in `live_dest_paths` is removed from
+        disk (if present) and forgotten. Returns the list of removed paths.
+        """
+        live = {self._key(p) for p in live_dest_paths}
+        removed = []
+        for dest_path in sorted(self.pages):
+            if dest_path in live:
+                continue
+            if os.path.exists(dest_path):
+                os.remove(dest_path)
+            del self.pages[dest_path]
+            removed.append(dest_path)
+        return removed
+
+    def record_asset(self, dest_path, source_path):
+        """Record that `dest_path` is a copy of the static file `source_path`."""
+        self.assets[self._key(dest_path)] = os.path.normpath(source_path)
+
+    def remove_stale_assets(self, live_dest_paths):
+        """Delete synced assets whose source file no longer exists.
+
+        Works like `remove_stale` but over the recorded static assets.
+        Returns the list of removed paths.
+        """
+        live = {self._key(p) for p in live_dest_paths}
+        removed = []
+        for dest_path in sorted(self.assets):
+            if dest_path in live:
+                continue
+            if os.path.isfile(dest_path):
+                os.remove(dest_path)
+            del self.assets[dest_path]
+            removed.append(dest_path)
+        return removed
@@ -1,6 +1,9 @@
-from utilityfunctions import markdown_to_blocks, text_to_textnode, text_node_to_html_node
+from utilityfunctions import text_to_textnode, text_node_to_html_node
+from blockscanner import scan_blocks
 from blocktype import block_to_block_type, BlockType
+from inlinecache import INLINE_CACHE
 from htmlnode import HTMLNode
+from leafnode import LeafNode
 from parentnode import ParentNode
 from textnode import TextNode, TextType
 
@@ -11,12 +14,19 @@ def text_to_children(text):
     (bold, italic, code, links, images) and converts it to a list of
     HTMLNode objects representing those elements.
 
+    When `inlinecache.INLINE_CACHE` is enabled (as it is for site builds
+    with --inline-cache), short strings are memoized: their children are
+    shared, immutable FrozenLeafNodes, returned in a new list.
+
     Args:
         text: A string potentially containing inline markdown.
 
     Returns:
         A list of HTMLNode objects (LeafNodes) representing the parsed inline markdown.
     """
+    cached = INLINE_CACHE.lookup(text)
+    if cached is not None:
+        return list(cached)
     text_nodes = text_to_textnode(text)
     children = []
     for text_node in text_nodes:
@@ -25,7 +35,7 @@ def text_to_children(text):
     return children
 
 
-def block_to_html_node(block):
+def block_to_html_node(block, block_type=None, lines=None):
     """Convert a single markdown block into an HTMLNode.
 
     Determines the block type and creates the appropriate HTMLNode structure
@@ -33,30 +43,43 @@ def block_to_html_node(block):
 
     Args:
         block: A markdown block string.
+        block_type: The block's BlockType, when already known.
+        lines: The block's lines, when already known (block.split("\n")).
 
     Returns:
-        An HTMLNode representing the block.
+        An HTMLNode representing the block. A block whose inline markup
+        (or one of whose list items) renders to nothing, such as "# ``",
+        becomes a paragraph of its raw text, since an element without
+        children cannot be rendered.
 
     Raises:
         ValueError: If the block type is unsupported.
     """
-    block_type = block_to_block_type(block)
+    if block_type is None:
+        block_type = block_to_block_type(block)
     
     match block_type:
         case BlockType.HEADING:
-            return block_to_heading(block)
+            node = block_to_heading(block)
         case BlockType.CODE:
-            return block_to_code(block)
+            node = block_to_code(block)
         case BlockType.QUOTE:
-            return block_to_quote(block)
+            node = block_to_quote(block, lines)
         case BlockType.UNORDERED_LIST:
-            return block_to_unordered_list(block)
+            node = block_to_unordered_list(block, lines)
         case BlockType.ORDERED_LIST:
-            return block_to_ordered_list(block)
+            node = block_to_ordered_list(block, lines)
         case BlockType.PARAGRAPH:
-            return block_to_paragraph(block)
+            node = block_to_paragraph(block, lines)
         case _:
             raise ValueError(f"Unsupported block type: {block_type}")
+    if not node.children or (
+            block_type in (BlockType.UNORDERED_LIST, BlockType.ORDERED_LIST)
+            and not all(item.children for item in node.children)):
+        if lines is None:
+            lines = block.split("\n")
+        return ParentNode("p", [LeafNode(None, " ".join(lines))])
+    return node
 
 
 def block_to_heading(block):
@@ -108,19 +131,21 @@ def block_to_code(block):
     return ParentNode("pre", [code_html_node])
 
 
-def block_to_quote(block):
+def block_to_quote(block, lines=None):
     """Convert a quote block to an HTMLNode.
 
     Each line in the quote block starts with >. Lines are joined with <br> tags.
 
     Args:
         block: A markdown quote block string.
+        lines: The block's lines, if already split.
 
     Returns:
         A ParentNode with <blockquote> tag.
     """
     # Split into lines and remove the > prefix from each
-    lines = block.split("\n")
+    if lines is None:
+        lines = block.split("\n")
     quote_lines = []
     for line in lines:
         line = line.strip()
@@ -136,19 +161,21 @@ def block_to_quote(block):
     return ParentNode("blockquote", children)
 
 
-def block_to_unordered_list(block):
+def block_to_unordered_list(block, lines=None):
     """Convert an unordered list block to an HTMLNode.
 
     Each list item (line starting with - or *) becomes an <li> element.
 
     Args:
         block: A markdown unordered list block string.
+        lines: The block's lines, if already split.
 
     Returns:
         A ParentNode with <ul> tag containing <li> children.
     """
     # Split into list items
-    lines = block.split("\n")
+    if lines is None:
+        lines = block.split("\n")
     list_items = []
     
     for line in lines:
@@ -169,19 +196,21 @@ def block_to_unordered_list(block):
     return ParentNode("ul", list_items)
 
 
-def block_to_ordered_list(block):
+def block_to_ordered_list(block, lines=None):
     """Convert an ordered list block to an HTMLNode.
 
     Each list item (line starting with N.) becomes an <li> element.
 
     Args:
         block: A markdown ordered list block string.
+        lines: The block's lines, if already split.
 
     Returns:
         A ParentNode with <ol> tag containing <li> children.
     """
     # Split into list items
-    lines = block.split("\n")
+    if lines is None:
+        lines = block.split("\n")
     list_items = []
     
     for line in lines:
@@ -197,19 +226,22 @@ def block_to_ordered_list(block):
     return ParentNode("ol", list_items)
 
 
-def block_to_paragraph(block):
+def block_to_paragraph(block, lines=None):
     """Convert a paragraph block to an HTMLNode.
 
     Paragraphs are wrapped in <p> tags and support inline markdown.
 
     Args:
         block: A markdown paragraph block string.
+        lines: The block's lines, if already split.
 
     Returns:
         A ParentNode with <p> tag.
     """
     # Clean up the block - replace newlines with spaces
-    text = " ".join(block.split("\n"))
+    if lines is None:
+        lines = block.split("\n")
+    text = " ".join(lines)
     children = text_to_children(text)
     
     return ParentNode("p", children)
@@ -218,9 +250,9 @@ def block_to_paragraph(block):
 def markdown_to_html_node(markdown):
     """Convert a markdown document (string) to an HTMLNode tree.
 
-    Splits the markdown into blocks, determines each block's type, converts
-    each block to an appropriate HTMLNode, and returns a single parent div
-    containing all block nodes as children.
+    Splits the markdown into typed blocks in one pass (see `scan_blocks`),
+    converts each block to an appropriate HTMLNode, and returns a single
+    parent div containing all block nodes as children.
 
     Args:
         markdown: A markdown-formatted string representing a full document.
@@ -233,11 +265,9 @@ def markdown_to_html_node(markdown):
         html_node = markdown_to_html_node(markdown)
         # Returns a div containing h1, p, and ul nodes
     """
-    blocks = markdown_to_blocks(markdown)
-    
     children = []
-    for block in blocks:
-        html_node = block_to_html_node(block)
+    for block in scan_blocks(markdown):
+        html_node = block_to_html_node(block.text, block.type, block.lines)
         children.append(html_node)
     
     # Return a single parent div containing all block nodes
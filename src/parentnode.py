@@ -6,35 +6,94 @@ class ParentNode(HTMLNode):
 
     ParentNode instances must have a `tag` and a non-empty `children` list.
     Children are expected to implement `to_html()`.
+
+    The node is validated once, when it is built; an invalid node can still
+    be constructed, but rendering it raises ValueError. The children list is
+    therefore not expected to change after construction.
     """
+    __slots__ = ("_error",)
+
     # Initialize ParentNode with tag, children and optional props
     # It cannot take a value
     def __init__(self, tag, children, props=None):
         super().__init__(tag=tag, children=children, props=props)
+        # Reason this node cannot be rendered, or None when it is valid
+        self._error = self._validate()
 
-    def to_html(self):
-        """Render the parent node and its children to an HTML string.
-
-        Validates that `tag` and `children` are present, converts each child
-        by calling its `to_html()` method, concatenates the results, and
-        returns the wrapped HTML string.
-        """
+    def _validate(self):
         # ParentNode must have a tag
         if self.tag is None:
-            raise ValueError("ParentNode must have a tag to convert to HTML.")
+            return "ParentNode must have a tag to convert to HTML."
         # ParentNode must have children
         if self.children is None or len(self.children) == 0:
-            raise ValueError("ParentNode must have children to convert to HTML.")
-        
-        tag_lower = self.tag.lower()
-        props_html = self.props_to_html()
-
-        parts = []
+            return "ParentNode must have children to convert to HTML."
         for child in self.children:
             # Child must implement to_html (strict behavior)
             if not (hasattr(child, 'to_html') and callable(child.to_html)):
-                raise ValueError(f"Child of ParentNode must implement to_html: {child!r}")
-            parts.append(child.to_html())
+                return f"Child of ParentNode must implement to_html: {child!r}"
+        return None
+
+    def to_html(self, resolver=None):
+        """Render the parent node and its children to an HTML string.
 
-        inner = "".join(parts)
-        return f"<{tag_lower}{props_html}>{inner}</{tag_lower}>"
+        Validates that `tag` and `children` are present, converts each child
+        to HTML, concatenates the results, and returns the wrapped HTML
+        string. An optional `URLResolver` is passed down to every node so URL
+        attributes get the site base path.
+
+        The whole subtree is joined once at the top (see `iter_html`), so
+        nested content is not copied again at every level.
+        """
+        return "".join(self.iter_html(resolver))
+
+    def iter_html(self, resolver=None):
+        """Yield the HTML of this node and its subtree as string chunks.
+
+        The tree is walked with an explicit stack rather than recursion, so
+        arbitrarily deep nesting never reaches Python's recursion limit.
+
+        Raises ValueError when this node (or a descendant) is missing its tag
+        or children, or when a child does not implement `to_html()`.
+        """
+        if self._error is not None:
+            raise ValueError(self._error)
+
+        # Each stack frame is (iterator over a parent's children, closing tag).
+        # Leaf children are rendered in place; a ParentNode child is opened
+        # and gets its own frame, and the parent's frame resumes once the
+        # child's children are exhausted.
+        tag_lower = self.tag.lower()
+        yield f"<{tag_lower}{self.props_to_html(resolver)}>"
+        stack = [(iter(self.children), f"</{tag_lower}>")]
+        while stack:
+            children, closing = stack[-1]
+            for child in children:
+                if isinstance(child, ParentNode):
+                    if child._error is not None:
+                        raise ValueError(child._error)
+                    tag_lower = child.tag.lower()
+                    yield f"<{tag_lower}{child.props_to_html(resolver)}>"
+                    stack.append((iter(child.children), f"</{tag_lower}>"))
+                    break
+                yield child.to_html(resolver)
+            else:
+                stack.pop()
+                yield closing
+
+    def iter_html_recursive(self, resolver=None):
+        """Recursive equivalent of `iter_html`.
+
+        Kept as the reference implementation the iterative renderer is
+        tested and benchmarked against.
+        """
+        if self._error is not None:
+            raise ValueError(self._error)
+
+        tag_lower = self.tag.lower()
+        yield f"<{tag_lower}{self.props_to_html(resolver)}>"
+        for child in self.children:
+            if isinstance(child, ParentNode):
+                yield from child.iter_html_recursive(resolver)
+            else:
+                yield child.to_html(resolver)
+        yield f"</{tag_lower}>"
@@ -0,0 +1,182 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from tracing import TRACER
+
+
+class StageStats:
+    """Timing counters for one stage of a `Pipeline`.
+
+    Attributes:
+        name: stage name ('read', 'render' or 'write').
+        items: number of items the stage processed.
+        busy: seconds spent doing the stage's work (summed over I/O threads).
+        stalled: seconds the stage spent waiting on a neighbouring stage -
+            for 'read' that is backpressure from a full queue, for 'render'
+            and 'write' it is waiting for input.
+    """
+    def __init__(self, name):
+        self.name = name
+        self.items = 0
+        self.busy = 0.0
+        self.stalled = 0.0
+
+    def utilization(self, wall):
+        """Return busy time as a fraction of `wall` seconds.
+
+        I/O stages run on several threads, so their utilization can exceed 1.
+        """
+        return self.busy / wall if wall > 0 else 0.0
+
+    def __repr__(self):
+        return (f"StageStats(name={self.name}, items={self.items}, "
+                f"busy={self.busy:.6f}, stalled={self.stalled:.6f})")
+
+
+class Pipeline:
+    """Read -> render -> write pipeline driven by asyncio.
+
+    Reads and writes run on a thread pool while rendering runs on the event
+    loop thread, so reading the next items and writing the previous ones
+    overlaps with rendering the current one. Bounded queues between the stages
+    limit how many items are read ahead of the renderer and how many rendered
+    outputs wait to be written. Stages and queue lengths are recorded as
+    trace events when `tracing.TRACER` is enabled.
+
+    Attributes:
+        read_queue_size: max items read ahead of the render stage.
+        write_queue_size: max rendered items waiting to be written.
+        io_workers: number of threads used for reads and writes.
+        stages: dict of StageStats from the last run, keyed by stage name.
+        wall: wall-clock seconds of the last run.
+    """
+    STAGES = ("read", "render", "write")
+
+    def __init__(self, read_queue_size=8, write_queue_size=8, io_workers=4):
+        if read_queue_size < 1 or write_queue_size < 1 or io_workers < 1:
+            raise ValueError("Pipeline queue sizes and io_workers must be at least 1.")
+        self.read_queue_size = read_queue_size
+        self.write_queue_size = write_queue_size
+        self.io_workers = io_workers
+        self.stages = {name: StageStats(name) for name in self.STAGES}
+        self.wall = 0.0
+        self._lock = threading.Lock()
+
+    def run(self, items, read, render, write, on_done=None):
+        """Push every item through read(item) -> render(item, data) -> write(item, output).
+
+        `on_done(item, result)` is called with the return value of `write`
+        for each item, in input order. If any stage raises, the exception of
+        the first failing item (in input order) is re-raised after the items
+        before it have completed.
+        """
+        self.stages = {name: StageStats(name) for name in self.STAGES}
+        start = time.perf_counter()
+        try:
+            asyncio.run(self._run(list(items), read, render, write, on_done))
+        finally:
+            self.wall = time.perf_counter() - start
+
+    def report(self):
+        """Return a human-readable per-stage utilization summary."""
+        lines = [f"Pipeline: {self.wall:.3f}s wall, "
+                 f"queues read={self.read_queue_size} write={self.write_queue_size}, "
+                 f"{self.io_workers} I/O threads"]
+        for stage in self.stages.values():
+            lines.append(f"  {stage.name:<6} {stage.items:>6} items  "
+                         f"busy {stage.busy:8.3f}s  "
+                         f"stalled {stage.stalled:8.3f}s  "
+                         f"utilization {stage.utilization(self.wall):6.1%}")
+        return "\n".join(lines)
+
+    def _timed(self, name, fn, *args):
+        start = time.perf_counter()
+        try:
+            with TRACER.span(name, "pipeline"):
+                return fn(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                stage = self.stages[name]
+                stage.busy += elapsed
+                stage.items += 1
+
+    async def _run(self, items, read, render, write, on_done):
+        loop = asyncio.get_running_loop()
+        # Queues carry (item, future) pairs in input order; the futures are
+        # already running on the thread pool while they wait in the queue.
+        read_queue = asyncio.Queue(self.read_queue_size)
+        write_queue = asyncio.Queue(self.write_queue_size)
+        stages = self.stages
+
+        def queued():
+            TRACER.counter("pipeline queues", "pipeline", read=read_queue.qsize(),
+                           write=write_queue.qsize())
+
+        def failed(error):
+            future = loop.create_future()
+            future.set_exception(error)
+            return future
+
+        async def reader():
+            for item in items:
+                future = loop.run_in_executor(pool, self._timed, "read", read, item)
+                start = time.perf_counter()
+                await read_queue.put((item, future))
+                stages["read"].stalled += time.perf_counter() - start
+                queued()
+            await read_queue.put(None)
+
+        async def renderer():
+            while True:
+                start = time.perf_counter()
+                entry = await read_queue.get()
+                queued()
+                if entry is None:
+                    break
+                item, future = entry
+                try:
+                    data = await future
+                    stages["render"].stalled += time.perf_counter() - start
+                    output = self._timed("render", render, item, data)
+                except Exception as e:
+                    # Hand the error to the writer so it surfaces in order
+                    await write_queue.put((item, failed(e)))
+                    break
+                written = loop.run_in_executor(pool, self._timed, "write",
+                                               write, item, output)
+                await write_queue.put((item, written))
+                queued()
+                # Let the reader top up the read queue between renders
+                await asyncio.sleep(0)
+            await write_queue.put(None)
+
+        async def writer():
+            while True:
+                start = time.perf_counter()
+                entry = await write_queue.get()
+                queued()
+                if entry is None:
+                    break
+                stages["write"].stalled += time.perf_counter() - start
+                item, future = entry
+                result = await future
+                if on_done is not None:
+                    on_done(item, result)
+
+        with ThreadPoolExecutor(max_workers=self.io_workers) as pool:
+            tasks = [asyncio.create_task(reader()), asyncio.create_task(renderer())]
+            try:
+                await writer()
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                # Drop queued work left behind by a failure
+                for queue in (read_queue, write_queue):
+                    while not queue.empty():
+                        entry = queue.get_nowait()
+                        if entry is not None:
+                            entry[1].cancel()
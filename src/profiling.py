@@ -0,0 +1,183 @@
+import cProfile
+import io
+import os
+import pstats
+import time
+from contextlib import contextmanager
+
+# Directory of the site generator's own modules; functions defined anywhere
+# else are grouped together in the report.
+SOURCE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Profiler enabled in this process, if any. Worker processes forked while it
+# runs inherit it and switch it off before profiling their own pages.
+_active = None
+
+
+class _RawStats:
+    """Profile data in the form `pstats.Stats` loads from a profiler."""
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+def profile_call(function, *args):
+    """Call `function(*args)` under its own profiler.
+
+    Returns (result, seconds, stats), where `stats` is the picklable raw
+    profile data that `BuildProfiler.merge` accepts from worker processes.
+    """
+    profile = cProfile.Profile()
+    start = time.perf_counter()
+    profile.enable()
+    try:
+        result = function(*args)
+    finally:
+        profile.disable()
+    seconds = time.perf_counter() - start
+    profile.create_stats()
+    return result, seconds, profile.stats
+
+
+def disable_inherited():
+    """Stop a profiler inherited from the parent process by fork."""
+    global _active
+    if _active is not None:
+        _active.disable()
+        _active = None
+
+
+def module_name(filename):
+    """Return the module a profiled function belongs to, for grouping.
+
+    Modules of the site generator are named as imported ("markdowntohtml",
+    "bench.stages"); built-in functions and everything outside the source
+    directory are grouped as "(built-in)" and "(other)".
+    """
+    if filename == "~" or filename.startswith("<"):
+        return "(built-in)"
+    path = os.path.abspath(filename)
+    if os.path.commonpath([path, SOURCE_DIR]) != SOURCE_DIR:
+        return "(other)"
+    module = os.path.splitext(os.path.relpath(path, SOURCE_DIR))[0]
+    return module.replace(os.sep, ".")
+
+
+class BuildProfiler:
+    """cProfile of a whole build, merged across page worker processes.
+
+    The build process is profiled between `enable` and `disable`; pages
+    generated in worker processes are profiled there (see `profile_call`)
+    and their data merged with `merge`. The time each page took is kept to
+    report the slowest ones.
+
+    Attributes:
+        page_seconds: dict of seconds spent generating each page, keyed by
+            its markdown source.
+        wall: wall-clock seconds between `enable` and `disable`.
+    """
+    def __init__(self):
+        self.page_seconds = {}
+        self.wall = 0.0
+        self._profile = cProfile.Profile()
+        self._worker_stats = []
+        self._start = None
+
+    def enable(self):
+        global _active
+        _active = self
+        self._start = time.perf_counter()
+        self._profile.enable()
+
+    def disable(self):
+        global _active
+        self._profile.disable()
+        if self._start is not None:
+            self.wall += time.perf_counter() - self._start
+            self._start = None
+        if _active is self:
+            _active = None
+
+    @contextmanager
+    def page(self, source):
+        """Time a page generated in this process."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.page_seconds[source] = time.perf_counter() - start
+
+    def merge(self, source, seconds, stats):
+        """Add a page profiled in a worker process by `profile_call`."""
+        self.page_seconds[source] = seconds
+        self._worker_stats.append(stats)
+
+    def stats(self, stream=None):
+        """Return a `pstats.Stats` of this process and every merged page."""
+        self._profile.create_stats()
+        stats = pstats.Stats(self._profile, stream=stream)
+        for worker_stats in self._worker_stats:
+            stats.add(_RawStats(worker_stats))
+        return stats
+
+    def save(self, path, top=25, slowest=10):
+        """Write the merged profile to `path` and a text report beside it.
+
+        The report goes to `path` with its extension replaced by ".txt".
+        Returns the report's path.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.stats().dump_stats(path)
+        report_path = os.path.splitext(path)[0] + ".txt"
+        with open(report_path, "w", encoding="utf-8") as f:
+            f.write(self.report(top, slowest))
+        return report_path
+
+    def report(self, top=25, slowest=10):
+        """Return the text summary of the profile.
+
+        It lists the slowest pages, the self time of each module, and the
+        `top` functions by cumulative and by self time. Times of pages built
+        in worker processes add up across workers, so totals can exceed the
+        wall-clock time of a parallel build.
+        """
+        stream = io.StringIO()
+        stats = self.stats(stream)
+        total = sum(entry[2] for entry in stats.stats.values())
+        lines = [f"Build profile: {self.wall:.3f}s wall, {total:.3f}s profiled, "
+                 f"{len(self.page_seconds)} pages", ""]
+
+        lines.append(f"Slowest pages (of {len(self.page_seconds)}):")
+        pages = sorted(self.page_seconds.items(), key=lambda item: item[1], reverse=True)
+        for source, seconds in pages[:slowest]:
+            lines.append(f"  {seconds * 1000:10.2f} ms  {source}")
+        lines.append("")
+
+        modules = {}
+        for (filename, _, _), (_, calls, tottime, _, _) in stats.stats.items():
+            entry = modules.setdefault(module_name(filename), [0.0, 0])
+            entry[0] += tottime
+            entry[1] += calls
+        lines.append("Self time by module:")
+        lines.append(f"  {'module':<24} {'seconds':>10} {'share':>7} {'calls':>12}")
+        for module, (tottime, calls) in sorted(modules.items(), key=lambda item: item[1][0],
+                                               reverse=True):
+            share = tottime / total if total else 0.0
+            lines.append(f"  {module:<24} {tottime:10.3f} {share:7.1%} {calls:>12}")
+        lines.append("")
+
+        stats.strip_dirs()
+        for sort, title in (("cumulative", "cumulative"), ("tottime", "self")):
+            lines.append(f"Top {top} functions by {title} time:")
+            stream.seek(0)
+            stream.truncate()
+            stats.sort_stats(sort).print_stats(top)
+            # Drop the header print_stats repeats before every table
+            table = stream.getvalue()
+            lines.append(table[table.find("   ncalls"):].rstrip())
+            lines.append("")
+        return "\n".join(lines)
@@ -0,0 +1,29 @@
+from htmlnode import HTMLNode
+
+class RawHTMLNode(HTMLNode):
+    """Represents an already rendered HTML fragment, emitted verbatim.
+
+    Used to splice cached block HTML into a page without rebuilding its node
+    tree. URLs in the fragment were resolved when it was rendered, so the
+    node records that base path and refuses to render under another one.
+
+    Attributes:
+        value: the HTML fragment.
+        base: base path of the URLResolver the fragment was rendered with.
+    """
+    __slots__ = ("base",)
+
+    def __init__(self, html, base="/"):
+        super().__init__(tag=None, value=html)
+        self.base = base
+
+    def to_html(self, resolver=None):
+        """Return the fragment; `resolver` must use the recorded base path."""
+        base = "/" if resolver is None else resolver.base
+        if base != self.base:
+            raise ValueError(f"RawHTMLNode rendered for base path {self.base!r} "
+                             f"cannot be rendered for {base!r}.")
+        return self.value
+
+    def __repr__(self):
+        return f"RawHTMLNode({self.value!r}, base={self.base!r})"
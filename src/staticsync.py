@@ -0,0 +1,248 @@
+import errno
+import os
+import shutil
+
+from manifest import hash_file
+
+# Copy strategies in order of preference. Each one falls back to the next when
+# the platform or filesystem does not support it; "copy" always works.
+#   hardlink: link the destination to the source inode (no data written)
+#   reflink:  copy-on-write clone of the source extents (Linux FICLONE)
+#   kernel:   in-kernel copy via os.copy_file_range / os.sendfile
+#   copy:     shutil.copy2 through userspace
+COPY_STRATEGIES = ("hardlink", "reflink", "kernel", "copy")
+
+# "auto" does not try hardlinks: a linked output shares its inode with the
+# source, so only pick it explicitly when nothing edits the output in place.
+AUTO_STRATEGIES = ("reflink", "kernel", "copy")
+
+# ioctl request number for FICLONE on Linux
+_FICLONE = 0x40049409
+
+# errno values meaning "this strategy is not available here", as opposed to a
+# real I/O failure that should be reported.
+_UNSUPPORTED_ERRNOS = {
+    errno.EXDEV, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EINVAL, errno.ENOSYS,
+    errno.ENOTTY, errno.EPERM, errno.EBADF, errno.EMLINK,
+}
+
+
+class SyncStats:
+    """Counters describing what a static sync did.
+
+    Attributes:
+        copied: number of files copied because they were new or changed.
+        skipped: number of files left alone because they were unchanged.
+        deleted: number of files removed because their source is gone.
+        bytes_copied: total size of the copied files.
+        bytes_skipped: total size of the skipped files.
+        strategies: dict - maps copy strategy name -> number of files it copied.
+    """
+    def __init__(self):
+        self.copied = 0
+        self.skipped = 0
+        self.deleted = 0
+        self.bytes_copied = 0
+        self.bytes_skipped = 0
+        self.strategies = {}
+
+    def __repr__(self):
+        return (f"SyncStats(copied={self.copied}, skipped={self.skipped}, "
+                f"deleted={self.deleted}, bytes_copied={self.bytes_copied}, "
+                f"bytes_skipped={self.bytes_skipped}, "
+                f"strategies={self.strategies})")
+
+
+def _copy_hardlink(source_path, tmp_path):
+    os.link(source_path, tmp_path)
+
+
+def _copy_reflink(source_path, tmp_path):
+    import fcntl
+
+    with open(source_path, "rb") as src, open(tmp_path, "wb") as dst:
+        fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+    shutil.copystat(source_path, tmp_path)
+
+
+def _copy_kernel(source_path, tmp_path):
+    copy_range = getattr(os, "copy_file_range", None)
+    with open(source_path, "rb") as src, open(tmp_path, "wb") as dst:
+        remaining = os.fstat(src.fileno()).st_size
+        offset = 0
+        while remaining > 0:
+            if copy_range is not None:
+                sent = copy_range(src.fileno(), dst.fileno(), remaining)
+            else:
+                sent = os.sendfile(dst.fileno(), src.fileno(), offset, remaining)
+            if sent == 0:
+                break
+            offset += sent
+            remaining -= sent
+    shutil.copystat(source_path, tmp_path)
+
+
+def _copy_userspace(source_path, tmp_path):
+    shutil.copy2(source_path, tmp_path)
+
+
+_COPY_FUNCTIONS = {
+    "hardlink": _copy_hardlink,
+    "reflink": _copy_reflink,
+    "kernel": _copy_kernel,
+    "copy": _copy_userspace,
+}
+
+
+class FileCopier:
+    """Copies files with the cheapest strategy the filesystem supports.
+
+    `strategy` is either "auto" or one of `COPY_STRATEGIES`; the chosen
+    strategy and every cheaper-to-support one after it are tried in order.
+    When a strategy fails because it is unsupported, that result is remembered
+    for the (source device, destination device) pair so later files go
+    straight to a working strategy.
+
+    Every copy is written to a temporary file and renamed over the destination,
+    so an existing destination (which may be a hardlink to the source) is
+    never modified in place.
+    """
+    def __init__(self, strategy="auto"):
+        if strategy == "auto":
+            self.order = AUTO_STRATEGIES
+        elif strategy in COPY_STRATEGIES:
+            self.order = COPY_STRATEGIES[COPY_STRATEGIES.index(strategy):]
+        else:
+            raise ValueError(f"Unknown copy strategy: {strategy}")
+        self.strategy = strategy
+        self._unsupported = set()
+
+    def copy(self, source_path, dest_path):
+        """Copy `source_path` to `dest_path`; return the strategy name used."""
+        dest_dir = os.path.dirname(dest_path) or "."
+        devices = (os.stat(source_path).st_dev, os.stat(dest_dir).st_dev)
+        tmp_path = dest_path + ".sync-tmp"
+
+        for name in self.order:
+            if (name, devices) in self._unsupported:
+                continue
+            _remove_path(tmp_path)
+            try:
+                _COPY_FUNCTIONS[name](source_path, tmp_path)
+            except (OSError, AttributeError) as e:
+                _remove_path(tmp_path)
+                if name == "copy":
+                    raise
+                if isinstance(e, OSError) and e.errno not in _UNSUPPORTED_ERRNOS:
+                    raise
+                self._unsupported.add((name, devices))
+                continue
+            os.replace(tmp_path, dest_path)
+            return name
+
+        raise OSError(f"No copy strategy succeeded for {source_path}")
+
+
+def file_unchanged(source_path, dest_path, use_hash=False):
+    """Return True when `dest_path` already holds the content of `source_path`.
+
+    Files are compared by size and modification time. Copies made by the sync
+    keep the source mtime, so an unchanged source matches its copy. When
+    `use_hash` is set, files of equal size whose mtimes differ are also
+    compared by content hash before being treated as changed.
+    """
+    try:
+        dest_stat = os.stat(dest_path)
+    except FileNotFoundError:
+        return False
+    source_stat = os.stat(source_path)
+
+    if source_stat.st_size != dest_stat.st_size:
+        return False
+    if source_stat.st_mtime_ns == dest_stat.st_mtime_ns:
+        return True
+    if use_hash and hash_file(source_path) == hash_file(dest_path):
+        # Align the mtime so the next sync does not need to hash again
+        os.utime(dest_path, ns=(dest_stat.st_atime_ns, source_stat.st_mtime_ns))
+        return True
+    return False
+
+
+def _remove_path(path):
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path)
+    elif os.path.lexists(path):
+        os.remove(path)
+
+
+def prune_empty_dirs(path, stop):
+    """Remove empty directories from `path` upwards, stopping at `stop`."""
+    stop = os.path.normpath(stop)
+    path = os.path.normpath(path)
+    while path != stop and path.startswith(stop + os.sep):
+        try:
+            os.rmdir(path)
+        except OSError:
+            return
+        path = os.path.dirname(path)
+
+
+def sync_directory(source_directory, destination_directory, manifest=None,
+                   use_hash=False, strategy="auto"):
+    """Make `destination_directory` mirror the files of `source_directory`.
+
+    Only files that are new or changed (see `file_unchanged`) are copied;
+    everything else already in the destination is left in place, including
+    generated pages. When a `BuildManifest` is given, the synced files are
+    recorded in it and files synced by an earlier run whose source no longer
+    exists are deleted. Without a manifest nothing is deleted.
+
+    Args:
+        source_directory: Path to the static source tree.
+        destination_directory: Path to the output tree.
+        manifest: Optional BuildManifest tracking previously synced assets.
+        use_hash: Compare content hashes when size matches but mtime differs.
+        strategy: "auto" or one of COPY_STRATEGIES (see `FileCopier`).
+
+    Returns:
+        A SyncStats instance.
+    """
+    stats = SyncStats()
+    copier = FileCopier(strategy)
+    os.makedirs(destination_directory, exist_ok=True)
+    live = []
+
+    for root, dirs, files in os.walk(source_directory):
+        dirs.sort()
+        rel_root = os.path.relpath(root, source_directory)
+        dest_root = os.path.normpath(os.path.join(destination_directory, rel_root))
+        if os.path.lexists(dest_root) and not os.path.isdir(dest_root):
+            _remove_path(dest_root)
+        os.makedirs(dest_root, exist_ok=True)
+
+        for name in sorted(files):
+            s = os.path.join(root, name)
+            d = os.path.join(dest_root, name)
+            live.append(d)
+            if manifest is not None:
+                manifest.record_asset(d, s)
+
+            size = os.path.getsize(s)
+            if os.path.isdir(d) and not os.path.islink(d):
+                _remove_path(d)
+            elif file_unchanged(s, d, use_hash):
+                stats.skipped += 1
+                stats.bytes_skipped += size
+                continue
+
+            used = copier.copy(s, d)
+            stats.strategies[used] = stats.strategies.get(used, 0) + 1
+            stats.copied += 1
+            stats.bytes_copied += size
+
+    if manifest is not None:
+        for removed in manifest.remove_stale_assets(live):
+            stats.deleted += 1
+            prune_empty_dirs(os.path.dirname(removed), destination_directory)
+
+    return stats
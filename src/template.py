@@ -0,0 +1,86 @@
+import re
+
+# Placeholders recognised in page templates.
+TITLE = "Title"
+CONTENT = "Content"
+
+_PLACEHOLDER_PATTERN = re.compile(r"\{\{ (Title|Content) \}\}")
+
+
+class Template:
+    """An HTML page template compiled into literal and placeholder segments.
+
+    The template text is split once into alternating literal strings and
+    placeholder names (`{{ Title }}` and `{{ Content }}`). Rendering fills the
+    placeholders and joins the segments in a single pass, so text substituted
+    into the page (such as markdown containing a literal `{{ Title }}`) is
+    never scanned for placeholders again.
+
+    Template instances are immutable after construction and can be shared
+    between pages and pickled to worker processes.
+
+    Attributes:
+        text: the original template text.
+        segments: tuple of strings; even indices are literal text, odd
+                  indices are placeholder names.
+    """
+    def __init__(self, text):
+        self.text = text
+        self.segments = tuple(_PLACEHOLDER_PATTERN.split(text))
+        # Base path -> copy of this template with its URLs resolved
+        self._resolved = {}
+
+    @classmethod
+    def from_file(cls, path):
+        """Read and compile the template at `path`."""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(f.read())
+
+    def resolve_urls(self, resolver):
+        """Return a Template whose own href/src attributes use the base path.
+
+        Only the template's literal markup is rewritten (placeholders are left
+        in place), and the result is cached per base path, so this costs one
+        pass over the template per build rather than per page.
+        """
+        if resolver.base == "/":
+            return self
+        resolved = self._resolved.get(resolver.base)
+        if resolved is None:
+            resolved = Template(self.text)
+            resolved.segments = tuple(
+                resolver.resolve_html(part) if i % 2 == 0 else part
+                for i, part in enumerate(self.segments))
+            self._resolved[resolver.base] = resolved
+        return resolved
+
+    def render(self, title, content):
+        """Return the template with its placeholders filled in.
+
+        Args:
+            title: text substituted for {{ Title }}.
+            content: HTML substituted for {{ Content }}.
+        """
+        values = {TITLE: title, CONTENT: content}
+        parts = list(self.segments)
+        for i in range(1, len(parts), 2):
+            parts[i] = values[parts[i]]
+        return "".join(parts)
+
+    def iter_render(self, title, content_node, resolver=None):
+        """Yield the filled template as string chunks, streaming the content.
+
+        Like `render`, but {{ Content }} is produced by streaming
+        `content_node.iter_html(resolver)` rather than from a prebuilt string.
+        """
+        for i, part in enumerate(self.segments):
+            if i % 2 == 0:
+                if part:
+                    yield part
+            elif part == TITLE:
+                yield title
+            else:
+                yield from content_node.iter_html(resolver)
+
+    def __repr__(self):
+        return f"Template(segments={len(self.segments)})"
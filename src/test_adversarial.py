@@ -0,0 +1,162 @@
+import os
+import unittest
+from unittest import mock
+
+import blockscanner
+from bench.adversarial import ENTRY_POINTS, INPUTS, applicable, growth
+from markdowntohtml import markdown_to_html_node
+from textnode import TextNode, TextType
+from utilityfunctions import (extract_markdown_images, extract_markdown_links,
+                              split_nodes_image, split_nodes_link, text_to_textnode)
+
+# Size of the inputs whose scanning work is counted.
+SIZE = 20_000
+
+# Most characters the link and inline scanners may search through per input
+# character. Linear scanners stay below 3; one that searches from every
+# unmatched "[" again scans on the order of SIZE characters per character.
+MAX_SCANNED_PER_CHAR = 4
+
+# Most characters the block scanner may split into lines per input
+# character. Each chunk is split at most three times (when a fence spans
+# chunks and is then left unclosed); splitting the rest of a chunk again
+# after every code block splits on the order of SIZE characters per
+# character.
+MAX_SPLIT_PER_CHAR = 4
+
+# Timing test: size of the smaller input, how much larger the second one
+# is, and the largest accepted growth of the time per character between
+# them. Linear code stays near 1; quadratic code approaches FACTOR.
+SMALL = 2000
+FACTOR = 16
+MAX_GROWTH = 5.0
+
+
+class CountingStr(str):
+    """A str counting the characters its `find` searches through."""
+    scanned = 0
+
+    def find(self, sub, start=0, end=None):
+        end = len(self) if end is None else end
+        found = str.find(self, sub, start, end)
+        CountingStr.scanned += (end if found == -1 else found + len(sub)) - start
+        return found
+
+
+def _plain(function):
+    return lambda text: function([TextNode(text, TextType.PLAIN)])
+
+
+# Entry points whose scans go through str.find on the text they are given.
+SCANNERS = {
+    "text_to_textnode": text_to_textnode,
+    "extract_markdown_links": extract_markdown_links,
+    "extract_markdown_images": extract_markdown_images,
+    "split_nodes_link": _plain(split_nodes_link),
+    "split_nodes_image": _plain(split_nodes_image),
+}
+
+
+class TestLinearScanning(unittest.TestCase):
+    """The link and inline scanners search each character a bounded number
+    of times on every input of `bench.adversarial.INPUTS`.
+
+    Counting the characters searched, rather than timing, makes this check
+    deterministic; the regex link extraction it guards against searched from
+    every unmatched "[" to the end of the text.
+    """
+
+    def test_scanned_characters_per_input_character(self):
+        for input_name, make_input in INPUTS.items():
+            text = CountingStr(make_input(SIZE))
+            for name, function in SCANNERS.items():
+                with self.subTest(input=input_name, entry_point=name):
+                    CountingStr.scanned = 0
+                    function(text)
+                    self.assertLessEqual(CountingStr.scanned, MAX_SCANNED_PER_CHAR * len(text))
+
+
+# Entry points that split markdown into blocks with `blockscanner.scan_blocks`.
+BLOCK_SCANNERS = {
+    "markdown_to_typed_blocks": blockscanner.markdown_to_typed_blocks,
+    "markdown_to_html_node": markdown_to_html_node,
+}
+
+
+class TestLinearBlockScanning(unittest.TestCase):
+    """The block scanner splits each character into lines a bounded number
+    of times on every input of `bench.adversarial.INPUTS`.
+
+    Like `TestLinearScanning`, this counts work instead of timing it: every
+    line the scanner reads is split by `blockscanner._chunk_lines`, whose
+    input is tallied here.
+    """
+
+    def test_split_characters_per_input_character(self):
+        split = 0
+
+        def chunk_lines(text):
+            nonlocal split
+            split += len(text)
+            return text.split("\n")
+
+        with mock.patch("blockscanner._chunk_lines", chunk_lines):
+            for input_name, make_input in INPUTS.items():
+                text = make_input(SIZE)
+                for name, function in BLOCK_SCANNERS.items():
+                    if not applicable(name, text):
+                        continue
+                    with self.subTest(input=input_name, entry_point=name):
+                        split = 0
+                        function(text)
+                        self.assertLessEqual(split, MAX_SPLIT_PER_CHAR * len(text))
+
+
+@unittest.skipUnless(os.environ.get("SSG_TIMING_TESTS"),
+                     "wall-clock test; set SSG_TIMING_TESTS=1 to run it")
+class TestLinearTime(unittest.TestCase):
+    """Every parser entry point must scale linearly on pathological input.
+
+    User-submitted markdown must not be able to stall a build, so each entry
+    point is timed on every input of `bench.adversarial.INPUTS` at two sizes
+    and fails when its time per character grows superlinearly. Timing is
+    sensitive to machine load, so this only runs when asked for.
+    """
+
+    def assert_linear(self, entry_point):
+        function = ENTRY_POINTS[entry_point]
+        for name, make_input in INPUTS.items():
+            if not applicable(entry_point, make_input(SMALL)):
+                continue
+            with self.subTest(input=name):
+                small, large, ratio = growth(function, make_input, SMALL, FACTOR)
+                self.assertLessEqual(
+                    ratio, MAX_GROWTH,
+                    f"{entry_point} is superlinear on {name!r}: time per character "
+                    f"grew {ratio:.1f}x from {SMALL} to {SMALL * FACTOR} characters "
+                    f"({small * 1000:.2f} ms -> {large * 1000:.2f} ms)")
+
+    def test_markdown_to_blocks(self):
+        self.assert_linear("markdown_to_blocks")
+
+    def test_markdown_to_typed_blocks(self):
+        self.assert_linear("markdown_to_typed_blocks")
+
+    def test_text_to_textnode(self):
+        self.assert_linear("text_to_textnode")
+
+    def test_markdown_to_html_node(self):
+        self.assert_linear("markdown_to_html_node")
+
+    def test_split_nodes_link(self):
+        self.assert_linear("split_nodes_link")
+
+    def test_split_nodes_image(self):
+        self.assert_linear("split_nodes_image")
+
+    def test_extract_markdown_links(self):
+        self.assert_linear("extract_markdown_links")
+
+
+if __name__ == "__main__":
+    unittest.main()
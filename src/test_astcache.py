@@ -0,0 +1,105 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+import astcache
+from astcache import ASTCache, document_key
+from document import parse_document
+from main import generate_page, main, parse_args
+from template import Template
+
+
+class TestASTCache(unittest.TestCase):
+    MARKDOWN = "# Title\n\nSome **text** with a [link](/a).\n\n- one\n- two"
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.directory = os.path.join(self.tmp.name, "ast")
+
+    def test_round_trip(self):
+        cache = ASTCache(self.directory)
+        key = document_key(self.MARKDOWN)
+        self.assertIsNone(cache.get(key))
+        document = parse_document(self.MARKDOWN)
+        cache.put(key, document)
+        loaded = cache.get(key)
+        self.assertEqual(loaded.root.to_html(), document.root.to_html())
+        self.assertEqual(loaded.title, "Title")
+        self.assertEqual(loaded.links, [("link", "/a")])
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_get_or_parse_parses_once(self):
+        cache = ASTCache(self.directory)
+        parse = mock.Mock(side_effect=parse_document)
+        first = cache.get_or_parse(self.MARKDOWN, parse)
+        second = cache.get_or_parse(self.MARKDOWN, parse)
+        self.assertEqual(parse.call_count, 1)
+        self.assertEqual(first.root.to_html(), second.root.to_html())
+
+    def test_key_depends_on_source_and_parser_version(self):
+        key = document_key(self.MARKDOWN)
+        self.assertNotEqual(key, document_key(self.MARKDOWN + " "))
+        with mock.patch.object(astcache, "PARSER_VERSION", "test"):
+            self.assertNotEqual(key, document_key(self.MARKDOWN))
+
+    def test_corrupt_entry_is_a_miss_and_removed(self):
+        cache = ASTCache(self.directory)
+        os.makedirs(self.directory)
+        path = os.path.join(self.directory, "bad.pickle")
+        with open(path, "wb") as f:
+            f.write(b"not a pickle")
+        self.assertIsNone(cache.get("bad"))
+        self.assertFalse(os.path.exists(path))
+
+    def test_gc_evicts_least_recently_used(self):
+        cache = ASTCache(self.directory)
+        document = parse_document(self.MARKDOWN)
+        for i, key in enumerate(("a", "b", "c")):
+            cache.put(key, document)
+            os.utime(os.path.join(self.directory, key + ".pickle"), ns=(i, i))
+        # A hit makes "a" the most recently used entry
+        cache.get("a")
+        size = os.path.getsize(os.path.join(self.directory, "a.pickle"))
+        removed, kept, kept_bytes = cache.gc(max_bytes=2 * size)
+        self.assertEqual((removed, kept, kept_bytes), (1, 2, 2 * size))
+        self.assertEqual(sorted(os.listdir(self.directory)), ["a.pickle", "c.pickle"])
+
+    def test_gc_missing_directory(self):
+        self.assertEqual(ASTCache(self.directory).gc(), (0, 0, 0))
+
+    def test_generate_page_uses_cache(self):
+        md_path = os.path.join(self.tmp.name, "page.md")
+        with open(md_path, "w", encoding="utf-8") as f:
+            f.write(self.MARKDOWN)
+        template = Template("<title>{{ Title }}</title>{{ Content }}")
+        cache = ASTCache(self.directory)
+        outputs = []
+        for base in ("/", "/site/"):
+            out_path = os.path.join(self.tmp.name, "page.html")
+            generate_page(md_path, None, out_path, base, template=template, ast_cache=cache)
+            with open(out_path, encoding="utf-8") as f:
+                outputs.append(f.read())
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertIn('href="/a"', outputs[0])
+        self.assertIn('href="/site/a"', outputs[1])
+
+    def test_cache_gc_command(self):
+        cache = ASTCache(self.directory)
+        cache.put("a", parse_document(self.MARKDOWN))
+        out = io.StringIO()
+        with mock.patch("main.AST_CACHE_DIR", self.directory), redirect_stdout(out):
+            main(["cache", "gc", "--max-mb", "0"])
+        self.assertIn("1 evicted", out.getvalue())
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_builds_use_it_only_when_asked(self):
+        self.assertFalse(parse_args([]).ast_cache)
+        self.assertTrue(parse_args(["--ast-cache"]).ast_cache)
+
+
+if __name__ == "__main__":
+    unittest.main()
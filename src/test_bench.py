@@ -0,0 +1,235 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from bench.__main__ import main as bench_main
+from bench.compare import collect, compare_results, save_result
+from bench.corpus import CorpusSpec, generate_corpus, write_corpus
+from bench.scale import run_scale
+from bench.site import SiteSpec, page_paths, write_site
+from bench.stages import run_stages
+from bench.stats import median_iqr, percentile, summarize_latencies
+from document import parse_document
+from inlinecache import INLINE_CACHE
+
+
+class TestCorpus(unittest.TestCase):
+    def test_deterministic_per_seed(self):
+        spec = CorpusSpec(pages=3, sections=2)
+        self.assertEqual(generate_corpus(spec), generate_corpus(spec))
+        other = CorpusSpec(pages=3, sections=2, seed=1)
+        self.assertNotEqual(generate_corpus(spec), generate_corpus(other))
+
+    def test_pages_parse_with_every_block_type(self):
+        spec = CorpusSpec(pages=2, sections=3, link_density=0.2)
+        for markdown in generate_corpus(spec):
+            document = parse_document(markdown)
+            self.assertTrue(document.title.startswith("Page "))
+            self.assertTrue(document.links)
+        blocks = {child.tag for child in parse_document(markdown).root.children}
+        self.assertEqual(blocks, {"h1", "h2", "p", "ul", "ol", "blockquote", "pre"})
+
+    def test_parameters(self):
+        markdown = generate_corpus(CorpusSpec(pages=1, sections=1, list_depth=3,
+                                              list_items=2, code_lines=0))[0]
+        self.assertIn("\n    - ", markdown)
+        self.assertNotIn("```", markdown)
+
+    def test_write_corpus(self):
+        with tempfile.TemporaryDirectory() as td:
+            paths = write_corpus(CorpusSpec(pages=2, sections=1), td)
+            self.assertEqual([os.path.relpath(p, td) for p in paths],
+                             [os.path.join("page-0", "index.md"),
+                              os.path.join("page-1", "index.md")])
+
+
+class TestSite(unittest.TestCase):
+    def test_page_paths(self):
+        paths = page_paths(100, posts_per_year=10)
+        self.assertEqual(len(set(paths)), 100)
+        self.assertEqual(paths[0], "index.md")
+        self.assertEqual(sum(p.startswith("blog/") for p in paths), 79)
+        self.assertIn("blog/2001/post-10/index.md", paths)
+
+    def test_write_site(self):
+        with tempfile.TemporaryDirectory() as td:
+            markdown_bytes = write_site(SiteSpec(pages=20, images=3), td)
+            self.assertGreater(markdown_bytes, 0)
+            self.assertTrue(os.path.isfile(os.path.join(td, "template.html")))
+            self.assertEqual(sorted(os.listdir(os.path.join(td, "static", "images"))),
+                             ["image-0.png", "image-1.png", "image-2.png"])
+            pages = [name for _, _, names in os.walk(os.path.join(td, "content"))
+                     for name in names]
+            self.assertEqual(len(pages), 20)
+
+
+class TestStats(unittest.TestCase):
+    def test_percentile_interpolates(self):
+        values = [1, 2, 3, 4]
+        self.assertEqual(percentile(values, 0), 1)
+        self.assertEqual(percentile(values, 50), 2.5)
+        self.assertEqual(percentile(values, 100), 4)
+        self.assertEqual(percentile([7], 99), 7)
+        with self.assertRaises(ValueError):
+            percentile([], 50)
+
+    def test_summarize_latencies(self):
+        summary = summarize_latencies([2000, 1000, 3000])
+        self.assertEqual(summary["calls"], 3)
+        self.assertEqual(summary["p50_us"], 2.0)
+        self.assertEqual((summary["min_us"], summary["max_us"]), (1.0, 3.0))
+        self.assertAlmostEqual(summary["ops_per_sec"], 500000.0)
+
+    def test_median_iqr(self):
+        self.assertEqual(median_iqr([5, 1, 3, 2, 4]), (3, 2))
+        self.assertEqual(median_iqr([7]), (7, 0))
+
+
+class TestStages(unittest.TestCase):
+    SPEC = CorpusSpec(pages=2, sections=2)
+
+    def test_every_stage_is_reported(self):
+        result = run_stages(self.SPEC, min_time=0)
+        self.assertEqual(list(result["stages"]), [
+            "markdown_to_blocks", "block_to_block_type", "text_to_textnode",
+            "split_nodes_image", "split_nodes_link", "markdown_to_html_node",
+            "to_html", "generate_page"])
+        for summary in result["stages"].values():
+            self.assertGreater(summary["calls"], 0)
+            self.assertLessEqual(summary["p50_us"], summary["p99_us"])
+        self.assertEqual(result["corpus"]["pages"], 2)
+        json.dumps(result)
+
+    def test_inline_cache_setting_is_restored(self):
+        maxsize = INLINE_CACHE.maxsize
+        run_stages(self.SPEC, min_time=0, names=["text_to_textnode"])
+        self.assertEqual(INLINE_CACHE.maxsize, maxsize)
+
+    def test_entry_point_json(self):
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "result.json")
+            out = io.StringIO()
+            with redirect_stdout(out):
+                code = bench_main(["--pages", "1", "--sections", "1", "--min-time", "0",
+                                   "--stage", "to_html", "--json", "-o", path])
+            self.assertEqual(code, 0)
+            printed = json.loads(out.getvalue())
+            with open(path, encoding="utf-8") as f:
+                self.assertEqual(json.load(f)["stages"].keys(), printed["stages"].keys())
+            self.assertEqual(list(printed["stages"]), ["to_html"])
+
+
+class TestScale(unittest.TestCase):
+    def test_cold_and_warm_runs(self):
+        with tempfile.TemporaryDirectory() as td:
+            result = run_scale([3], td, SiteSpec(images=1), warm_runs=1,
+                               build_args=["--jobs", "1"])
+        cold, warm = result["runs"]
+        self.assertEqual((cold["run"], cold["generated"], cold["up_to_date"]), ("cold", 3, 0))
+        self.assertEqual((warm["run"], warm["generated"], warm["up_to_date"]), ("warm", 0, 3))
+        self.assertGreater(cold["bytes_written"], 0)
+        self.assertEqual(warm["bytes_written"], 0)
+        self.assertGreater(cold["peak_rss_bytes"], 0)
+        self.assertEqual(result["site"]["pages"], [3])
+        json.dumps(result)
+
+
+def _result(metrics):
+    """Return a compare result holding `metrics`: name -> (samples, higher_is_better)."""
+    return {"format": 1, "runs": 3, "environment": {}, "metrics": {
+        name: {"unit": "us", "higher_is_better": higher, "samples": samples}
+        for name, (samples, higher) in metrics.items()}}
+
+
+class TestCompare(unittest.TestCase):
+    def test_statuses(self):
+        baseline = _result({
+            "slower": ([100, 101, 102], False),
+            "faster": ([100, 101, 102], False),
+            "throughput_down": ([100, 101, 102], True),
+            "small_change": ([100, 101, 102], False),
+            "noisy": ([50, 100, 150], False),
+            "dropped": ([1, 1, 1], False),
+        })
+        new = _result({
+            "slower": ([130, 131, 132], False),
+            "faster": ([70, 71, 72], False),
+            "throughput_down": ([70, 71, 72], True),
+            "small_change": ([105, 106, 107], False),
+            "noisy": ([70, 120, 170], False),
+            "added": ([1, 1, 1], False),
+        })
+        statuses = {c.name: c.status for c in compare_results(baseline, new, threshold=10)}
+        self.assertEqual(statuses, {
+            "slower": "regression",
+            "faster": "improvement",
+            "throughput_down": "regression",
+            "small_change": "unchanged",
+            "noisy": "noise",
+            "dropped": "missing",
+            "added": "new",
+        })
+
+    def test_threshold(self):
+        baseline = _result({"m": ([100, 100, 100], False)})
+        new = _result({"m": ([115, 115, 115], False)})
+        self.assertEqual(compare_results(baseline, new, 10)[0].status, "regression")
+        self.assertEqual(compare_results(baseline, new, 20)[0].status, "unchanged")
+
+    def test_exit_status(self):
+        with tempfile.TemporaryDirectory() as td:
+            paths = {}
+            for name, samples in (("base", [100] * 3), ("same", [101] * 3), ("slow", [150] * 3)):
+                paths[name] = os.path.join(td, f"{name}.json")
+                save_result(_result({"m": (samples, False)}), paths[name])
+            codes = {}
+            for name in ("same", "slow"):
+                with redirect_stdout(io.StringIO()) as out:
+                    codes[name] = bench_main(["compare", "--baseline", paths["base"],
+                                              "--result", paths[name]])
+            self.assertEqual(codes, {"same": 0, "slow": 1})
+            self.assertIn("regression", out.getvalue())
+
+    def test_collect_and_save(self):
+        result = collect(2, suites=("memory",), memory_count=1000)
+        self.assertEqual(result["runs"], 2)
+        self.assertIn("memory.FrozenLeafNode.bytes", result["metrics"])
+        for metric in result["metrics"].values():
+            self.assertEqual(len(metric["samples"]), 2)
+            self.assertGreater(metric["median"], 0)
+        statuses = {c.status for c in compare_results(result, result)}
+        self.assertEqual(statuses, {"unchanged"})
+
+
+class TestBeforeAfterCommands(unittest.TestCase):
+    """The benchmarks comparing an optimization with the code it replaced."""
+
+    def run_command(self, *argv):
+        with redirect_stdout(io.StringIO()) as out:
+            self.assertEqual(bench_main(list(argv)), 0)
+        return out.getvalue()
+
+    def test_render(self):
+        self.assertIn("iterative", self.run_command("render", "--repeat", "1"))
+
+    def test_memory(self):
+        self.assertIn("ParentNode", self.run_command("memory", "--count", "1000"))
+
+    def test_links(self):
+        self.assertIn("spans", self.run_command("links", "--repeat", "1"))
+
+    def test_blocks(self):
+        self.assertIn("fused", self.run_command("blocks", "--repeat", "1"))
+
+    def test_reader(self):
+        self.assertIn("mmap", self.run_command("reader", "--mb", "1", "--repeat", "1"))
+
+    def test_inline(self):
+        self.assertIn("hit rate", self.run_command("inline", "--pages", "2", "--repeat", "1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+import os
+import pickle
+import tempfile
+import unittest
+
+from blockcache import BlockCache
+from blockscanner import scan_blocks
+from document import parse_document
+from main import generate_pages_recursive
+from rawhtmlnode import RawHTMLNode
+from urlresolver import URLResolver
+
+
+FOOTER = "Written by **me**, see [about](/about) and ![logo](/logo.png)."
+
+
+class TestBlockCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _page(self, i):
+        return f"# Page {i}\n\nBody of page _{i}_.\n\n{FOOTER}"
+
+    def test_repeated_blocks_hit(self):
+        cache = BlockCache()
+        for i in range(3):
+            parse_document(self._page(i), cache, URLResolver("/"))
+        # The footer is rendered once and reused twice
+        self.assertEqual((cache.hits, cache.misses), (2, 7))
+        self.assertEqual(len(cache), 7)
+
+    def test_output_and_refs_match_uncached_parse(self):
+        cache = BlockCache()
+        resolver = URLResolver("/site/")
+        for i in range(2):
+            markdown = self._page(i)
+            cached = parse_document(markdown, cache, resolver)
+            plain = parse_document(markdown)
+            self.assertEqual(cached.root.to_html(resolver), plain.root.to_html(resolver))
+            self.assertEqual(cached.title, plain.title)
+            self.assertEqual(cached.headings, plain.headings)
+            self.assertEqual(cached.links, plain.links)
+            self.assertEqual(cached.images, plain.images)
+
+    def test_key_includes_base_path(self):
+        cache = BlockCache()
+        block = next(scan_blocks(FOOTER))
+        node, _, _ = cache.render(block, URLResolver("/"))
+        other, _, _ = cache.render(block, URLResolver("/site/"))
+        self.assertIn('href="/about"', node.to_html())
+        self.assertIn('href="/site/about"', other.to_html(URLResolver("/site/")))
+        self.assertEqual(cache.misses, 2)
+
+    def test_evicts_least_recently_used(self):
+        blocks = [next(scan_blocks(f"Paragraph {i} " + "x" * 1000)) for i in range(3)]
+        probe = BlockCache()
+        probe.render(blocks[0])
+        cache = BlockCache(max_bytes=2 * probe.size + 10)
+        cache.render(blocks[0])
+        cache.render(blocks[1])
+        cache.render(blocks[0])
+        cache.render(blocks[2])
+        self.assertEqual(len(cache), 2)
+        self.assertLessEqual(cache.size, cache.max_bytes)
+        cache.render(blocks[0])
+        self.assertEqual(cache.hits, 2)
+        cache.render(blocks[1])
+        self.assertEqual(cache.misses, 4)
+
+    def test_save_and_load(self):
+        path = os.path.join(self.tmp.name, "cache", "blocks.pickle")
+        cache = BlockCache()
+        parse_document(self._page(0), cache)
+        cache.save(path)
+        loaded = BlockCache.load(path)
+        self.assertEqual(len(loaded), len(cache))
+        self.assertEqual(loaded.size, cache.size)
+        parse_document(self._page(1), loaded)
+        self.assertEqual(loaded.hits, 1)
+
+    def test_load_missing_or_outdated(self):
+        path = os.path.join(self.tmp.name, "blocks.pickle")
+        self.assertEqual(len(BlockCache.load(path)), 0)
+        with open(path, "wb") as f:
+            pickle.dump({"version": "old", "entries": []}, f)
+        self.assertEqual(len(BlockCache.load(path)), 0)
+        with open(path, "wb") as f:
+            f.write(b"not a pickle")
+        self.assertEqual(len(BlockCache.load(path)), 0)
+
+    def test_copy_updates_merge_into_parent(self):
+        parent = BlockCache()
+        parse_document(self._page(0), parent)
+        worker = pickle.loads(pickle.dumps(parent))
+        self.assertEqual((worker.hits, worker.misses), (0, 0))
+        worker.track_updates()
+        parse_document(self._page(1), worker)
+        parent.merge(worker.take_updates())
+        self.assertEqual((parent.hits, parent.misses), (1, 5))
+        self.assertEqual(len(parent), 5)
+        self.assertEqual(worker.take_updates(), ([], 0, 0))
+
+    def test_parallel_build_matches_serial(self):
+        content = os.path.join(self.tmp.name, "content")
+        template = os.path.join(self.tmp.name, "template.html")
+        with open(template, "w", encoding="utf-8") as f:
+            f.write("<title>{{ Title }}</title>{{ Content }}")
+        for i in range(6):
+            os.makedirs(os.path.join(content, f"p{i}"))
+            with open(os.path.join(content, f"p{i}", "index.md"), "w",
+                      encoding="utf-8") as f:
+                f.write(self._page(i))
+        outputs = {}
+        for jobs in (1, 3):
+            cache = BlockCache()
+            dest = os.path.join(self.tmp.name, f"out{jobs}")
+            built, _ = generate_pages_recursive(content, template, dest, "/site/",
+                                                jobs=jobs, block_cache=cache)
+            self.assertEqual((cache.hits + cache.misses), 18)
+            self.assertGreaterEqual(cache.hits, 5 - jobs)
+            self.assertEqual(len(cache), 13)
+            outputs[jobs] = []
+            for path in built:
+                with open(path, encoding="utf-8") as f:
+                    outputs[jobs].append(f.read())
+        self.assertEqual(outputs[1], outputs[3])
+        self.assertIn('href="/site/about"', outputs[1][0])
+
+
+class TestRawHTMLNode(unittest.TestCase):
+    def test_renders_verbatim(self):
+        node = RawHTMLNode('<p><a href="/site/a">a</a></p>', "/site/")
+        self.assertEqual(node.to_html(URLResolver("/site/")), node.value)
+        self.assertEqual("".join(node.iter_html(URLResolver("/site/"))), node.value)
+
+    def test_other_base_path_raises(self):
+        node = RawHTMLNode("<p>a</p>", "/site/")
+        with self.assertRaises(ValueError):
+            node.to_html(URLResolver("/"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+import io
+import unittest
+from unittest import mock
+
+from blockscanner import Block, scan_blocks, markdown_to_typed_blocks
+from blocktype import BlockType, block_to_block_type
+from markdowntohtml import markdown_to_html_node
+from utilityfunctions import markdown_to_blocks
+
+
+class TestScanBlocks(unittest.TestCase):
+    def test_matches_split_and_classify(self):
+        markdown = (
+            "# Title\n\n"
+            "A paragraph\nover two lines\n\n\n\n"
+            "  > quote\n> more  \n\n"
+            "- a\n- b\n\n"
+            "* c\n\n"
+            "1. one\n2. two\n\n"
+            "```\ncode here\n```\n"
+        )
+        blocks = markdown_to_typed_blocks(markdown)
+        self.assertEqual([b.text for b in blocks], markdown_to_blocks(markdown))
+        self.assertEqual([b.type for b in blocks],
+                         [block_to_block_type(t) for t in markdown_to_blocks(markdown)])
+
+    def test_lines_match_text(self):
+        for block in markdown_to_typed_blocks("  a\n b \nc  \n\n- x\n- y"):
+            self.assertEqual(block.lines, block.text.split("\n"))
+
+    def test_empty_document(self):
+        self.assertEqual(markdown_to_typed_blocks(""), [])
+        self.assertEqual(markdown_to_typed_blocks("\n\n  \n"), [])
+
+    def test_whitespace_only_line_separates_blocks(self):
+        self.assertEqual([b.text for b in markdown_to_typed_blocks("a\n   \nb")], ["a", "b"])
+
+    def test_fenced_code_keeps_blank_lines(self):
+        blocks = markdown_to_typed_blocks("```\ndef f():\n\n    return 1\n```\n\nafter")
+        self.assertEqual(blocks, [
+            Block(BlockType.CODE, ["```", "def f():", "", "    return 1", "```"]),
+            Block(BlockType.PARAGRAPH, ["after"]),
+        ])
+
+    def test_single_line_fence(self):
+        self.assertEqual(markdown_to_typed_blocks("```x = 1```"),
+                         [Block(BlockType.CODE, ["```x = 1```"])])
+
+    def test_unclosed_fence_is_text(self):
+        blocks = markdown_to_typed_blocks("```\nnot code\n\n# Heading\n\n```more")
+        self.assertEqual([b.type for b in blocks],
+                         [BlockType.PARAGRAPH, BlockType.HEADING, BlockType.PARAGRAPH])
+
+    def test_ordered_list_numbered_ten_and_above(self):
+        blocks = markdown_to_typed_blocks("10. ten\n11. eleven")
+        self.assertEqual(blocks[0].type, BlockType.ORDERED_LIST)
+
+    def test_text_after_closing_fence_starts_new_block(self):
+        blocks = markdown_to_typed_blocks("```\na\n\nb\n```\n- item")
+        self.assertEqual(blocks, [
+            Block(BlockType.CODE, ["```", "a", "", "b", "```"]),
+            Block(BlockType.UNORDERED_LIST, ["- item"]),
+        ])
+
+    def test_consecutive_fences_without_blank_lines(self):
+        markdown = "```\na\n```\n" * 3 + "  ```\nb\n```  \ntext"
+        expected = [Block(BlockType.CODE, ["```", "a", "```"])] * 3 + [
+            Block(BlockType.CODE, ["```", "b", "```"]),
+            Block(BlockType.PARAGRAPH, ["text"]),
+        ]
+        self.assertEqual(markdown_to_typed_blocks(markdown), expected)
+        self.assertEqual(list(scan_blocks(io.StringIO(markdown))), expected)
+        self.assertEqual(list(scan_blocks(markdown.encode("utf-8"))), expected)
+
+    def test_string_and_lines_agree(self):
+        markdown = "# T\n  \n```\na\n \n\nb\n```\n\n\npara\n```\nx"
+        self.assertEqual(markdown_to_typed_blocks(markdown),
+                         list(scan_blocks(io.StringIO(markdown))))
+
+    def test_reads_file_lines(self):
+        f = io.StringIO("# T\n\n```\na\n\nb\n```\n")
+        self.assertEqual([b.type for b in scan_blocks(f)],
+                         [BlockType.HEADING, BlockType.CODE])
+
+    def test_buffer_matches_string(self):
+        markdown = ("# T\n\n\nü and 日本\n  \nnext\n\n"
+                    "```\na\n\n \nb\n```\n\n10. x\n\n```\nopen")
+        for buffer in (markdown.encode("utf-8"), bytearray(markdown.encode("utf-8"))):
+            with self.subTest(type=type(buffer).__name__):
+                self.assertEqual(list(scan_blocks(buffer)),
+                                 markdown_to_typed_blocks(markdown))
+
+    def test_buffer_windows_end_at_block_boundaries(self):
+        markdown = ("# T\n\n\n\npara one\nline\n\n  \n"
+                    "```\ncode\n\n\nmore\n```\n\n- a\n- b\n\nlast")
+        expected = markdown_to_typed_blocks(markdown)
+        for window in range(1, len(markdown) + 1):
+            with self.subTest(window=window), \
+                    mock.patch("blockscanner.BUFFER_WINDOW", window):
+                self.assertEqual(list(scan_blocks(markdown.encode("utf-8"))), expected)
+
+    def test_empty_buffer(self):
+        self.assertEqual(list(scan_blocks(b"")), [])
+
+    def test_blocks_without_content_are_paragraphs(self):
+        for markdown in ("10. \n1. ", "#", "# ", "##", ">", "> ", "- \n- ", "* "):
+            with self.subTest(markdown=markdown):
+                self.assertEqual([b.type for b in scan_blocks(markdown)],
+                                 [BlockType.PARAGRAPH])
+        for markdown in ("#\n#", ">\n>", "1. a\n2. ", "- \n- a"):
+            with self.subTest(markdown=markdown):
+                self.assertNotEqual(next(scan_blocks(markdown)).type, BlockType.PARAGRAPH)
+
+
+class TestMarkdownToHtmlWithScanner(unittest.TestCase):
+    def test_code_block_with_blank_line(self):
+        html = markdown_to_html_node("```\na\n\nb\n```").to_html()
+        self.assertEqual(html, "<div><pre><code>a\n\nb</code></pre></div>")
+
+    def test_empty_blocks_render_as_text(self):
+        cases = {
+            "10. \n1. ": "<div><p>10.  1.</p></div>",
+            "a\n \n#": "<div><p>a</p><p>#</p></div>",
+            "a\n \n>": "<div><p>a</p><p>></p></div>",
+            "- \n- ": "<div><p>-  -</p></div>",
+            # Inline markup that renders to nothing keeps its raw text
+            "a\n \n#```": "<div><p>a</p><p>#```</p></div>",
+            "10. ``": "<div><p>10. ``</p></div>",
+            "``": "<div><p>``</p></div>",
+        }
+        for markdown, expected in cases.items():
+            with self.subTest(markdown=markdown):
+                self.assertEqual(markdown_to_html_node(markdown).to_html(), expected)
+
+    def test_ordered_list_from_ten(self):
+        html = markdown_to_html_node("10. ten\n11. eleven").to_html()
+        self.assertEqual(html, "<div><ol><li>ten</li><li>eleven</li></ol></div>")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import io
+import unittest
+
+from document import Document, DocumentStream, parse_document
+from main import extract_title
+from markdowntohtml import markdown_to_html_node
+from parentnode import ParentNode
+
+
+class TestParseDocument(unittest.TestCase):
+    MARKDOWN = (
+        "## Intro\n\n"
+        "# Page Title\n\n"
+        "See [home](/) and ![logo](/images/logo.png).\n\n"
+        "- a [list link](https://example.com)\n\n"
+        "```\n[not a link](/code)\n```\n\n"
+        "### Details"
+    )
+
+    def test_root_matches_markdown_to_html_node(self):
+        document = parse_document(self.MARKDOWN)
+        self.assertEqual(document.root.to_html(),
+                         markdown_to_html_node(self.MARKDOWN).to_html())
+
+    def test_title_matches_extract_title(self):
+        document = parse_document(self.MARKDOWN)
+        self.assertEqual(document.title, extract_title(self.MARKDOWN))
+        self.assertEqual(document.require_title(), "Page Title")
+
+    def test_headings_outline(self):
+        self.assertEqual(parse_document(self.MARKDOWN).headings,
+                         [(2, "Intro"), (1, "Page Title"), (3, "Details")])
+
+    def test_links_and_images(self):
+        document = parse_document(self.MARKDOWN)
+        self.assertEqual(document.links,
+                         [("home", "/"), ("list link", "https://example.com")])
+        self.assertEqual(document.images, [("logo", "/images/logo.png")])
+
+    def test_no_title(self):
+        document = parse_document("Just text")
+        self.assertIsNone(document.title)
+        with self.assertRaises(Exception) as context:
+            document.require_title()
+        self.assertIn("No H1 header", str(context.exception))
+
+    def test_empty_document(self):
+        document = parse_document("")
+        self.assertIsInstance(document, Document)
+        self.assertIsInstance(document.root, ParentNode)
+        self.assertEqual(document.root.children, [])
+
+
+class TestDocumentStream(unittest.TestCase):
+    def test_html_matches_parse_document(self):
+        markdown = TestParseDocument.MARKDOWN
+        streamed = "".join(DocumentStream(io.StringIO(markdown)).iter_html())
+        self.assertEqual(streamed, parse_document(markdown).root.to_html())
+
+    def test_records_metadata_when_asked(self):
+        markdown = TestParseDocument.MARKDOWN
+        stream = DocumentStream(io.StringIO(markdown), record=True)
+        "".join(stream.iter_html())
+        document = parse_document(markdown)
+        self.assertEqual(stream.title, document.title)
+        self.assertEqual(stream.headings, document.headings)
+        self.assertEqual(stream.links, document.links)
+        self.assertEqual(stream.images, document.images)
+
+    def test_blocks_render_before_input_is_exhausted(self):
+        def lines():
+            yield "# Title\n"
+            yield "\n"
+            yield "Next block\n"
+            raise RuntimeError("read past the first block")
+
+        chunks = DocumentStream(lines()).iter_html()
+        self.assertEqual(next(chunks), "<div>")
+        self.assertEqual(next(chunks), "<h1>")
+
+    def test_empty_stream_raises(self):
+        with self.assertRaises(ValueError):
+            "".join(DocumentStream(io.StringIO("")).iter_html())
+
+
+if __name__ == "__main__":
+    unittest.main()
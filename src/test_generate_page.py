@@ -1,8 +1,14 @@
 import unittest
 import os
 import tempfile
+import tracemalloc
+from unittest import mock
 
+from document import Document
+from inlinecache import INLINE_CACHE
 from main import generate_page
+from parentnode import ParentNode
+from template import Template
 
 
 class TestGeneratePage(unittest.TestCase):
@@ -42,6 +48,103 @@ class TestGeneratePage(unittest.TestCase):
             self.assertIn("<div", content)
             self.assertIn("This is a paragraph.", content)
 
+    def test_failed_page_leaves_no_output(self):
+        with tempfile.TemporaryDirectory() as td:
+            md_path = os.path.join(td, "index.md")
+            tpl_path = os.path.join(td, "template.html")
+            out_path = os.path.join(td, "out", "index.html")
+            with open(md_path, "w", encoding="utf-8") as f:
+                f.write("# Title\n\nbroken")
+            with open(tpl_path, "w", encoding="utf-8") as f:
+                f.write("<body>{{ Content }}</body>")
+
+            # Make rendering fail part-way through the streamed content
+            broken = Document(ParentNode("div", [ParentNode("p", [])]), title="Title")
+            with mock.patch("main.parse_document", return_value=broken):
+                with self.assertRaises(ValueError):
+                    generate_page(md_path, tpl_path, out_path, '/')
+            self.assertEqual(os.listdir(os.path.dirname(out_path)), [])
+
+
+class TestStreamReader(unittest.TestCase):
+    TEMPLATE = "<title>{{ Title }}</title><body>{{ Content }}</body>"
+
+    def generate(self, td, markdown, reader):
+        md_path = os.path.join(td, "page.md")
+        tpl_path = os.path.join(td, "template.html")
+        out_path = os.path.join(td, reader, "page.html")
+        with open(md_path, "w", encoding="utf-8") as f:
+            f.write(markdown)
+        with open(tpl_path, "w", encoding="utf-8") as f:
+            f.write(self.TEMPLATE)
+        generate_page(md_path, tpl_path, out_path, "/site/", reader=reader)
+        with open(out_path, encoding="utf-8") as f:
+            return f.read()
+
+    def test_stream_matches_read(self):
+        markdown = ("Intro [home](/)\n\n# The Title\n\n"
+                    "```\ncode\n\nmore\n```\n\n- ![i](/i.png)\n- b")
+        with tempfile.TemporaryDirectory() as td:
+            self.assertEqual(self.generate(td, markdown, "stream"),
+                             self.generate(td, markdown, "read"))
+
+    def test_mmap_matches_read(self):
+        markdown = ("Intro [home](/)\n\n# Tïtle\n\n"
+                    "```\ncode\n\nmore\n```\n\n- ![i](/i.png)\n- b\n")
+        with tempfile.TemporaryDirectory() as td:
+            self.assertEqual(self.generate(td, markdown, "mmap"),
+                             self.generate(td, markdown, "read"))
+
+    def test_mmap_with_crlf_line_endings(self):
+        markdown = "# Title\r\n\r\nline one\r\nline two\r\n"
+        with tempfile.TemporaryDirectory() as td:
+            md_path = os.path.join(td, "page.md")
+            with open(md_path, "w", encoding="utf-8", newline="") as f:
+                f.write(markdown)
+            outputs = {}
+            for reader in ("read", "mmap"):
+                out_path = os.path.join(td, reader + ".html")
+                generate_page(md_path, None, out_path, "/",
+                              template=Template(self.TEMPLATE), reader=reader)
+                with open(out_path, encoding="utf-8") as f:
+                    outputs[reader] = f.read()
+            self.assertEqual(outputs["mmap"], outputs["read"])
+
+    def test_mmap_empty_file_raises(self):
+        with tempfile.TemporaryDirectory() as td:
+            with self.assertRaises(Exception):
+                self.generate(td, "", "mmap")
+
+    def test_stream_without_title_raises(self):
+        with tempfile.TemporaryDirectory() as td:
+            with self.assertRaises(Exception):
+                self.generate(td, "no title here", "stream")
+            self.assertFalse(os.path.exists(os.path.join(td, "stream", "page.html")))
+
+    def test_stream_memory_does_not_grow_with_file(self):
+        def peak(paragraphs):
+            markdown = "# Big\n\n" + "".join(
+                f"Paragraph {i} with **bold** and a [link](/p/{i}).\n\n"
+                for i in range(paragraphs))
+            with tempfile.TemporaryDirectory() as td:
+                md_path = os.path.join(td, "page.md")
+                with open(md_path, "w", encoding="utf-8") as f:
+                    f.write(markdown)
+                tracemalloc.start()
+                try:
+                    generate_page(md_path, None, os.path.join(td, "page.html"), "/",
+                                  template=Template(self.TEMPLATE), reader="stream")
+                    return tracemalloc.get_traced_memory()[1]
+                finally:
+                    tracemalloc.stop()
+
+        # The inline memo is bounded by entries rather than by the file, so
+        # use one small enough to fill up in both runs
+        self.addCleanup(INLINE_CACHE.configure, INLINE_CACHE.maxsize)
+        INLINE_CACHE.configure(64)
+        small, large = peak(500), peak(4000)
+        self.assertLess(large, small * 2)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -112,3 +112,9 @@ class TestHtmlNode(unittest.TestCase):
         self.assertIn('text with', result)
 
 
+
+    def test_uses_slots(self):
+        node = HTMLNode("p", "x")
+        self.assertFalse(hasattr(node, "__dict__"))
+        with self.assertRaises(AttributeError):
+            node.unknown_attribute = 1
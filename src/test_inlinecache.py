@@ -0,0 +1,123 @@
+import pickle
+import unittest
+
+from frozenleafnode import FrozenLeafNode
+from inlinecache import InlineCache, MAX_TEXT_LENGTH, INLINE_CACHE
+from leafnode import LeafNode
+from main import parse_args
+from markdowntohtml import markdown_to_html_node, text_to_children
+from urlresolver import URLResolver
+
+
+class TestFrozenLeafNode(unittest.TestCase):
+    def test_renders_like_leaf_node(self):
+        props = {"href": "/about"}
+        frozen = FrozenLeafNode("a", "About", props)
+        leaf = LeafNode("a", "About", props)
+        resolver = URLResolver("/site/")
+        self.assertEqual(frozen.to_html(resolver), leaf.to_html(resolver))
+        self.assertEqual(frozen, leaf)
+
+    def test_is_immutable(self):
+        props = {"href": "/about"}
+        node = FrozenLeafNode("a", "About", props)
+        with self.assertRaises(AttributeError):
+            node.value = "changed"
+        with self.assertRaises(AttributeError):
+            del node.tag
+        with self.assertRaises(TypeError):
+            node.props["href"] = "/elsewhere"
+        # The node keeps its own copy of the props it was built with
+        props["href"] = "/elsewhere"
+        self.assertEqual(node.props["href"], "/about")
+
+    def test_pickle_round_trip(self):
+        node = FrozenLeafNode("img", "", {"src": "/a.png", "alt": "a"})
+        loaded = pickle.loads(pickle.dumps(node))
+        self.assertIsInstance(loaded, FrozenLeafNode)
+        self.assertEqual(loaded, node)
+        self.assertEqual(pickle.loads(pickle.dumps(FrozenLeafNode(None, "x"))).value, "x")
+
+
+class TestInlineCache(unittest.TestCase):
+    def test_repeated_text_hits(self):
+        cache = InlineCache()
+        first = cache.lookup("Read [more](/post)")
+        second = cache.lookup("Read [more](/post)")
+        self.assertIs(first, second)
+        self.assertIsInstance(first, tuple)
+        self.assertTrue(all(isinstance(node, FrozenLeafNode) for node in first))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertIn("50.0% hit rate", cache.stats())
+
+    def test_disabled_and_long_text_bypass(self):
+        cache = InlineCache(0)
+        self.assertFalse(cache.enabled)
+        self.assertIsNone(cache.lookup("text"))
+        self.assertEqual((cache.hits, cache.misses), (0, 0))
+        self.assertIsNone(InlineCache().lookup("x" * (MAX_TEXT_LENGTH + 1)))
+
+    def test_bounded(self):
+        cache = InlineCache(2)
+        for text in ("a", "b", "c", "a"):
+            cache.lookup(text)
+        self.assertEqual((cache.hits, cache.misses), (0, 4))
+
+    def test_take_and_merge_stats(self):
+        worker = InlineCache()
+        worker.lookup("x")
+        worker.lookup("x")
+        self.assertEqual(worker.take_stats(), (1, 1))
+        self.assertEqual(worker.take_stats(), (0, 0))
+        parent = InlineCache()
+        parent.lookup("y")
+        parent.merge_stats((1, 1))
+        self.assertEqual((parent.hits, parent.misses), (1, 2))
+
+    def test_configure_resets(self):
+        cache = InlineCache()
+        cache.lookup("x")
+        cache.configure(16)
+        self.assertEqual((cache.maxsize, cache.hits, cache.misses), (16, 0, 0))
+
+
+class TestTextToChildrenMemo(unittest.TestCase):
+    def setUp(self):
+        self.addCleanup(INLINE_CACHE.configure, INLINE_CACHE.maxsize)
+        INLINE_CACHE.configure(16)
+
+    def test_children_list_is_not_shared(self):
+        first = text_to_children("**Home** and [blog](/blog)")
+        first.append(LeafNode(None, "extra"))
+        second = text_to_children("**Home** and [blog](/blog)")
+        self.assertEqual(len(second), 3)
+        self.assertIs(first[0], second[0])
+        self.assertEqual(INLINE_CACHE.hits, 1)
+
+    def test_output_matches_uncached(self):
+        markdown = ("# Nav\n\n- [Home](/)\n- [Blog](/blog)\n\n"
+                    "## Nav\n\n- [Home](/)\n- [Blog](/blog)\n\n"
+                    "> Read [more](/more)\n\n1. _one_\n2. `two`")
+        resolver = URLResolver("/site/")
+        cached = markdown_to_html_node(markdown).to_html(resolver)
+        self.assertGreater(INLINE_CACHE.hits, 0)
+        INLINE_CACHE.configure(0)
+        self.assertEqual(markdown_to_html_node(markdown).to_html(resolver), cached)
+
+
+class TestDefaultDisabled(unittest.TestCase):
+    def test_nodes_are_mutable_outside_builds(self):
+        self.assertFalse(INLINE_CACHE.enabled)
+        node = markdown_to_html_node("**Home** and [blog](/blog)")
+        leaf = node.children[0].children[0]
+        self.assertNotIsInstance(leaf, FrozenLeafNode)
+        leaf.value = "Start"
+        self.assertEqual(node.to_html(), '<div><p><b>Start</b> and <a href="/blog">blog</a></p></div>')
+
+    def test_builds_enable_it_only_when_asked(self):
+        self.assertFalse(parse_args([]).inline_cache)
+        self.assertTrue(parse_args(["--inline-cache"]).inline_cache)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+import os
+
+from main import generate_pages_recursive
+from manifest import BuildManifest
+from testsupport import TempDirTestCase
+
+
+class TestIncrementalBuild(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.content = os.path.join(self.td, "content")
+        self.dest = os.path.join(self.td, "docs")
+        self.template = os.path.join(self.td, "template.html")
+        self.manifest_path = os.path.join(self.td, "cache", "manifest.json")
+        self.write(self.template, "<title>{{ Title }}</title>{{ Content }}")
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nWelcome")
+        self.write(os.path.join(self.content, "blog", "post.md"), "# Post\n\nBody")
+
+    def _build(self, base_path="/"):
+        manifest = BuildManifest.load(self.manifest_path)
+        result = generate_pages_recursive(
+            self.content, self.template, self.dest, base_path, manifest=manifest)
+        manifest.save()
+        return [sorted(os.path.relpath(p, self.dest) for p in paths)
+                for paths in result]
+
+    def test_first_build_generates_everything(self):
+        built, skipped = self._build()
+        self.assertEqual(built, ["blog/post.html", "index.html"])
+        self.assertEqual(skipped, [])
+
+    def test_unchanged_build_skips_everything(self):
+        self._build()
+        built, skipped = self._build()
+        self.assertEqual(built, [])
+        self.assertEqual(skipped, ["blog/post.html", "index.html"])
+
+    def test_changed_source_rebuilds_only_that_page(self):
+        self._build()
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nFixed typo")
+        built, skipped = self._build()
+        self.assertEqual(built, ["index.html"])
+        self.assertEqual(skipped, ["blog/post.html"])
+        with open(os.path.join(self.dest, "index.html"), encoding="utf-8") as f:
+            self.assertIn("Fixed typo", f.read())
+
+    def test_template_or_base_path_change_rebuilds_everything(self):
+        self._build()
+        self.write(self.template, "<h1>{{ Title }}</h1>{{ Content }}")
+        built, _ = self._build()
+        self.assertEqual(len(built), 2)
+        built, _ = self._build(base_path="/site/")
+        self.assertEqual(len(built), 2)
+
+    def test_missing_output_is_regenerated(self):
+        self._build()
+        os.remove(os.path.join(self.dest, "index.html"))
+        built, _ = self._build()
+        self.assertEqual(built, ["index.html"])
+
+    def test_deleted_source_removes_output(self):
+        self._build()
+        os.remove(os.path.join(self.content, "blog", "post.md"))
+        built, skipped = self._build()
+        self.assertEqual(skipped, ["index.html"])
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "blog")))
+        manifest = BuildManifest.load(self.manifest_path)
+        self.assertEqual(len(manifest.pages), 1)
+
+    def test_deleted_source_keeps_directories_in_use(self):
+        self.write(os.path.join(self.content, "blog", "other.md"), "# Other\n\nBody")
+        self._build()
+        os.remove(os.path.join(self.content, "blog", "post.md"))
+        self._build()
+        self.assertEqual(os.listdir(os.path.join(self.dest, "blog")), ["other.html"])
+        os.remove(os.path.join(self.content, "blog", "other.md"))
+        os.remove(os.path.join(self.content, "index.md"))
+        self._build()
+        self.assertEqual(os.listdir(self.dest), [])
+
+    def test_corrupt_manifest_loads_empty(self):
+        self.write(self.manifest_path, "{not json")
+        self.assertEqual(BuildManifest.load(self.manifest_path).pages, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
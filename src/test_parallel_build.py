@@ -0,0 +1,122 @@
+import unittest
+import os
+
+from main import generate_pages_recursive, PageGenerationError
+from manifest import BuildManifest
+from pipeline import Pipeline
+from profiling import BuildProfiler
+from testsupport import TempDirTestCase
+from tracing import TRACER
+
+
+class TestParallelBuild(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.content = os.path.join(self.td, "content")
+        self.template = os.path.join(self.td, "template.html")
+        self.write(self.template,
+                    '<title>{{ Title }}</title><link href="/index.css">{{ Content }}')
+        for i in range(12):
+            self.write(os.path.join(self.content, "blog", f"post{i:02}", "index.md"),
+                        f"# Post {i}\n\nSome **bold** text and a [link](/blog/post{i:02}).\n\n"
+                        f"- item _{i}_\n- `code`")
+
+    def _read_tree(self, root):
+        files = {}
+        for dirpath, _, names in os.walk(root):
+            for name in names:
+                path = os.path.join(dirpath, name)
+                with open(path, "rb") as f:
+                    files[os.path.relpath(path, root)] = f.read()
+        return files
+
+    def test_parallel_output_matches_serial(self):
+        serial = os.path.join(self.td, "serial")
+        parallel = os.path.join(self.td, "parallel")
+        built_serial, _ = generate_pages_recursive(
+            self.content, self.template, serial, "/site/", jobs=1)
+        built_parallel, _ = generate_pages_recursive(
+            self.content, self.template, parallel, "/site/", jobs=4)
+        self.assertEqual(len(built_parallel), 12)
+        self.assertEqual([os.path.relpath(p, serial) for p in built_serial],
+                         [os.path.relpath(p, parallel) for p in built_parallel])
+        self.assertEqual(self._read_tree(serial), self._read_tree(parallel))
+
+    def test_profiler_covers_worker_pages(self):
+        for jobs in (1, 4):
+            with self.subTest(jobs=jobs):
+                profiler = BuildProfiler()
+                profiler.enable()
+                generate_pages_recursive(self.content, self.template,
+                                         os.path.join(self.td, f"out{jobs}"), "/",
+                                         jobs=jobs, profiler=profiler)
+                profiler.disable()
+                self.assertEqual(len(profiler.page_seconds), 12)
+                calls = {}
+                for (filename, _, name), entry in profiler.stats().stats.items():
+                    calls[name] = calls.get(name, 0) + entry[1]
+                self.assertEqual(calls["generate_page"], 12)
+
+    def test_trace_covers_worker_pages(self):
+        self.addCleanup(TRACER.configure, False)
+        for jobs in (1, 4):
+            with self.subTest(jobs=jobs):
+                TRACER.configure(True)
+                generate_pages_recursive(self.content, self.template,
+                                         os.path.join(self.td, f"out{jobs}"), "/",
+                                         jobs=jobs)
+                pages = [e for e in TRACER.events if e["name"] == "page"]
+                self.assertEqual(len(pages), 12)
+                worker_pids = {e["pid"] for e in pages} - {os.getpid()}
+                if jobs == 1:
+                    self.assertEqual(worker_pids, set())
+                else:
+                    self.assertTrue(worker_pids)
+                names = {e["name"] for e in TRACER.events}
+                self.assertLessEqual({"walk content", "read", "parse", "title",
+                                      "render and write"}, names)
+
+    def test_trace_of_pipeline(self):
+        self.addCleanup(TRACER.configure, False)
+        TRACER.configure(True)
+        generate_pages_recursive(self.content, self.template,
+                                 os.path.join(self.td, "out"), "/", pipeline=Pipeline())
+        counts = {}
+        for event in TRACER.events:
+            counts[event["name"]] = counts.get(event["name"], 0) + 1
+        for name in ("read", "render", "write", "parse", "render content",
+                     "fill template"):
+            self.assertEqual(counts[name], 12, name)
+        self.assertIn("pipeline queues", counts)
+
+    def test_first_failing_page_is_reported(self):
+        # Pages without an H1 fail; the first one in source order is reported
+        self.write(os.path.join(self.content, "blog", "post09", "index.md"), "no title")
+        self.write(os.path.join(self.content, "blog", "post03", "index.md"), "no title")
+        for jobs in (1, 4):
+            with self.subTest(jobs=jobs):
+                with self.assertRaises(PageGenerationError) as ctx:
+                    generate_pages_recursive(self.content, self.template,
+                                             os.path.join(self.td, f"out{jobs}"),
+                                             "/", jobs=jobs)
+                self.assertEqual(ctx.exception.path,
+                                 os.path.join(self.content, "blog", "post03", "index.md"))
+                self.assertIn("No H1 header", str(ctx.exception))
+
+    def test_pages_before_failure_are_recorded(self):
+        # 48 pages on 2 workers are handed out in chunks of 3; post10 fails
+        # in the chunk post09-post11
+        for i in range(12, 48):
+            self.write(os.path.join(self.content, "blog", f"post{i:02}", "index.md"),
+                        f"# Post {i}")
+        self.write(os.path.join(self.content, "blog", "post10", "index.md"), "no title")
+        dest = os.path.join(self.td, "out")
+        manifest = BuildManifest()
+        with self.assertRaises(PageGenerationError):
+            generate_pages_recursive(self.content, self.template, dest, "/",
+                                     manifest=manifest, jobs=2)
+        self.assertEqual(sorted(manifest.pages), [
+            os.path.join(dest, "blog", f"post{i:02}", "index.html") for i in range(10)])
+
+if __name__ == "__main__":
+    unittest.main()
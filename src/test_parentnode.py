@@ -96,6 +96,51 @@ class TestParentNode(unittest.TestCase):
         self.assertIn('id="main"', result)
         self.assertIn("<div", result)
 
+    def test_iter_html_chunks_join_to_to_html(self):
+        inner = ParentNode("li", [LeafNode("b", "bold"), LeafNode(None, " text")])
+        node = ParentNode("ul", [inner, ParentNode("li", [LeafNode("i", "x")])],
+                          props={"class": "list"})
+        chunks = list(node.iter_html())
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual("".join(chunks), node.to_html())
+
+    def test_write_html_streams_to_file(self):
+        import io
+
+        node = ParentNode("div", [ParentNode("p", [LeafNode("a", "x", props={"href": "/"})])])
+        buf = io.StringIO()
+        node.write_html(buf)
+        self.assertEqual(buf.getvalue(), '<div><p><a href="/">x</a></p></div>')
+
+    def test_iter_html_raises_for_invalid_descendant(self):
+        node = ParentNode("div", [ParentNode("p", [])])
+        with self.assertRaises(ValueError):
+            list(node.iter_html())
+
+    def test_deep_nesting_beyond_recursion_limit(self):
+        import sys
+
+        depth = sys.getrecursionlimit() * 2
+        node = LeafNode("b", "x")
+        for _ in range(depth):
+            node = ParentNode("div", [node])
+        html = node.to_html()
+        self.assertTrue(html.startswith("<div>" * depth + "<b>x</b>"))
+        self.assertTrue(html.endswith("</div>" * depth))
+
+    def test_iterative_matches_recursive(self):
+        from markdowntohtml import markdown_to_html_node
+
+        node = markdown_to_html_node(
+            "# Title\n\nText with **bold** and a [link](/x)\n\n- a\n- _b_\n\n"
+            "1. one\n2. two\n\n> quote\n\n```\ncode\n```")
+        self.assertEqual(list(node.iter_html()), list(node.iter_html_recursive()))
+
+    def test_validation_happens_at_construction(self):
+        node = ParentNode("div", ["not a node"])
+        self.assertIsNotNone(node._error)
+        self.assertIsNone(ParentNode("div", [LeafNode("p", "x")])._error)
+
 
 if __name__ == "__main__":
     unittest.main()
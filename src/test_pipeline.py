@@ -0,0 +1,80 @@
+import unittest
+import os
+import time
+
+from main import generate_pages_recursive, PageGenerationError
+from pipeline import Pipeline
+from testsupport import TempDirTestCase
+
+
+class TestPipeline(unittest.TestCase):
+    def test_items_complete_in_order(self):
+        done = []
+        pipeline = Pipeline(read_queue_size=2, write_queue_size=2, io_workers=3)
+
+        def read(item):
+            # Later items finish reading first; order must still be kept
+            time.sleep(0.001 * (10 - item))
+            return item * 2
+
+        pipeline.run(range(10), read, lambda item, data: data + 1,
+                     lambda item, output: output, on_done=lambda item, result: done.append((item, result)))
+        self.assertEqual(done, [(i, i * 2 + 1) for i in range(10)])
+        for name in Pipeline.STAGES:
+            self.assertEqual(pipeline.stages[name].items, 10)
+        self.assertGreater(pipeline.wall, 0)
+        self.assertIn("render", pipeline.report())
+
+    def test_first_failure_in_order_is_raised(self):
+        done = []
+
+        def read(item):
+            if item in (3, 7):
+                raise ValueError(f"bad {item}")
+            return item
+
+        with self.assertRaises(ValueError) as ctx:
+            Pipeline(io_workers=4).run(range(10), read, lambda item, data: data,
+                                       lambda item, output: output,
+                                       on_done=lambda item, result: done.append(item))
+        self.assertEqual(str(ctx.exception), "bad 3")
+        self.assertEqual(done, [0, 1, 2])
+
+    def test_invalid_settings_raise(self):
+        with self.assertRaises(ValueError):
+            Pipeline(read_queue_size=0)
+
+
+class TestPipelineBuild(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.content = os.path.join(self.td, "content")
+        self.template = os.path.join(self.td, "template.html")
+        self.write(self.template, '<title>{{ Title }}</title>{{ Content }}')
+        for i in range(6):
+            self.write(os.path.join(self.content, f"page{i}.md"),
+                        f"# Page {i}\n\n![img](/images/{i}.png) and [home](/)")
+
+    def test_pipeline_build_matches_serial(self):
+        serial = os.path.join(self.td, "serial")
+        piped = os.path.join(self.td, "piped")
+        generate_pages_recursive(self.content, self.template, serial, "/site/")
+        built, _ = generate_pages_recursive(self.content, self.template, piped, "/site/",
+                                            pipeline=Pipeline(read_queue_size=2))
+        self.assertEqual(len(built), 6)
+        for i in range(6):
+            with open(os.path.join(serial, f"page{i}.html"), "rb") as a, \
+                    open(os.path.join(piped, f"page{i}.html"), "rb") as b:
+                self.assertEqual(a.read(), b.read())
+
+    def test_pipeline_build_reports_failing_page(self):
+        self.write(os.path.join(self.content, "page2.md"), "no title")
+        with self.assertRaises(PageGenerationError) as ctx:
+            generate_pages_recursive(self.content, self.template,
+                                     os.path.join(self.td, "out"), "/",
+                                     pipeline=Pipeline())
+        self.assertEqual(ctx.exception.path, os.path.join(self.content, "page2.md"))
+
+
+if __name__ == "__main__":
+    unittest.main()
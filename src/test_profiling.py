@@ -0,0 +1,64 @@
+import os
+import pstats
+import tempfile
+import unittest
+
+from profiling import BuildProfiler, module_name, profile_call, SOURCE_DIR
+
+
+def _work(n):
+    return sum(i * i for i in range(n))
+
+
+class TestModuleName(unittest.TestCase):
+    def test_own_modules(self):
+        self.assertEqual(module_name(os.path.join(SOURCE_DIR, "parentnode.py")), "parentnode")
+        self.assertEqual(module_name(os.path.join(SOURCE_DIR, "bench", "stages.py")),
+                         "bench.stages")
+
+    def test_other_modules(self):
+        self.assertEqual(module_name("~"), "(built-in)")
+        self.assertEqual(module_name("<string>"), "(built-in)")
+        self.assertEqual(module_name(os.__file__), "(other)")
+
+
+class TestBuildProfiler(unittest.TestCase):
+    def test_merges_worker_pages(self):
+        profiler = BuildProfiler()
+        profiler.enable()
+        with profiler.page("content/local.md"):
+            _work(1000)
+        profiler.disable()
+        result, seconds, stats = profile_call(_work, 100_000)
+        self.assertEqual(result, _work(100_000))
+        profiler.merge("content/worker.md", seconds, stats)
+
+        self.assertEqual(set(profiler.page_seconds), {"content/local.md", "content/worker.md"})
+        calls = {func[2]: entry[1] for func, entry in profiler.stats().stats.items()}
+        # One call profiled in this process, one in the "worker"
+        self.assertEqual(calls["_work"], 2)
+
+    def test_save_writes_stats_and_report(self):
+        profiler = BuildProfiler()
+        profiler.enable()
+        with profiler.page("content/slow.md"):
+            _work(50_000)
+        with profiler.page("content/fast.md"):
+            pass
+        profiler.disable()
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "out", "build.pstats")
+            report_path = profiler.save(path, top=5)
+            self.assertEqual(report_path, os.path.join(td, "out", "build.txt"))
+            self.assertIn("_work", {func[2] for func in pstats.Stats(path).stats})
+            with open(report_path, encoding="utf-8") as f:
+                report = f.read()
+        self.assertLess(report.index("content/slow.md"), report.index("content/fast.md"))
+        self.assertIn("Self time by module:", report)
+        self.assertIn("test_profiling", report)
+        self.assertIn("Top 5 functions by cumulative time:", report)
+        self.assertIn("Top 5 functions by self time:", report)
+
+
+if __name__ == "__main__":
+    unittest.main()
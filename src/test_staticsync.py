@@ -0,0 +1,122 @@
+import unittest
+import errno
+import os
+from unittest import mock
+
+import staticsync
+from manifest import BuildManifest
+from staticsync import sync_directory, FileCopier, COPY_STRATEGIES
+from testsupport import TempDirTestCase
+
+
+class TestStaticSync(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.src = os.path.join(self.td, "static")
+        self.dest = os.path.join(self.td, "docs")
+        self.write(os.path.join(self.src, "index.css"), "body {}")
+        self.write(os.path.join(self.src, "images", "a.png"), "PNGDATA")
+
+    def _read(self, path):
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+
+    def test_first_sync_copies_everything(self):
+        stats = sync_directory(self.src, self.dest)
+        self.assertEqual(stats.copied, 2)
+        self.assertEqual(stats.skipped, 0)
+        self.assertEqual(stats.bytes_copied, len("body {}") + len("PNGDATA"))
+        self.assertEqual(self._read(os.path.join(self.dest, "images", "a.png")), "PNGDATA")
+
+    def test_second_sync_skips_unchanged(self):
+        sync_directory(self.src, self.dest)
+        stats = sync_directory(self.src, self.dest)
+        self.assertEqual(stats.copied, 0)
+        self.assertEqual(stats.skipped, 2)
+        self.assertEqual(stats.bytes_skipped, len("body {}") + len("PNGDATA"))
+
+    def test_changed_file_is_copied(self):
+        sync_directory(self.src, self.dest)
+        path = os.path.join(self.src, "index.css")
+        self.write(path, "body { color: red; }")
+        stats = sync_directory(self.src, self.dest)
+        self.assertEqual(stats.copied, 1)
+        self.assertEqual(self._read(os.path.join(self.dest, "index.css")),
+                         "body { color: red; }")
+
+    def test_hash_mode_skips_touched_but_identical_file(self):
+        sync_directory(self.src, self.dest)
+        path = os.path.join(self.src, "index.css")
+        os.utime(path, ns=(0, 10**9))
+        self.assertEqual(sync_directory(self.src, self.dest, use_hash=True).copied, 0)
+        # Without hashing, an mtime change alone is treated as a change
+        os.utime(path, ns=(0, 2 * 10**9))
+        self.assertEqual(sync_directory(self.src, self.dest).copied, 1)
+
+    def test_generated_files_are_preserved(self):
+        page = os.path.join(self.dest, "index.html")
+        sync_directory(self.src, self.dest)
+        self.write(page, "<html></html>")
+        sync_directory(self.src, self.dest, manifest=BuildManifest())
+        self.assertTrue(os.path.exists(page))
+
+    def test_deleted_source_is_removed_with_manifest(self):
+        manifest = BuildManifest()
+        sync_directory(self.src, self.dest, manifest=manifest)
+        os.remove(os.path.join(self.src, "images", "a.png"))
+        stats = sync_directory(self.src, self.dest, manifest=manifest)
+        self.assertEqual(stats.deleted, 1)
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "images")))
+        self.assertTrue(os.path.exists(os.path.join(self.dest, "index.css")))
+
+
+class TestFileCopier(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.src = os.path.join(self.td, "a.png")
+        with open(self.src, "wb") as f:
+            f.write(b"\x89PNG" + bytes(range(256)) * 64)
+
+    def test_every_strategy_produces_identical_copy(self):
+        for strategy in ("auto",) + COPY_STRATEGIES:
+            with self.subTest(strategy=strategy):
+                dest = os.path.join(self.td, f"{strategy}.png")
+                used = FileCopier(strategy).copy(self.src, dest)
+                self.assertIn(used, COPY_STRATEGIES)
+                with open(self.src, "rb") as a, open(dest, "rb") as b:
+                    self.assertEqual(a.read(), b.read())
+                self.assertEqual(os.stat(self.src).st_mtime_ns,
+                                 os.stat(dest).st_mtime_ns)
+
+    def test_hardlink_shares_inode(self):
+        dest = os.path.join(self.td, "linked.png")
+        self.assertEqual(FileCopier("hardlink").copy(self.src, dest), "hardlink")
+        self.assertTrue(os.path.samefile(self.src, dest))
+
+    def test_recopy_replaces_hardlink_without_touching_source(self):
+        dest = os.path.join(self.td, "linked.png")
+        FileCopier("hardlink").copy(self.src, dest)
+        FileCopier("copy").copy(self.src, dest)
+        self.assertFalse(os.path.samefile(self.src, dest))
+
+    def test_unsupported_strategy_falls_back_and_is_remembered(self):
+        calls = []
+
+        def unsupported(source_path, tmp_path):
+            calls.append(source_path)
+            raise OSError(errno.EOPNOTSUPP, "not supported")
+
+        copier = FileCopier("reflink")
+        with mock.patch.dict(staticsync._COPY_FUNCTIONS, {"reflink": unsupported}):
+            for name in ("one.png", "two.png"):
+                used = copier.copy(self.src, os.path.join(self.td, name))
+                self.assertEqual(used, "kernel")
+        self.assertEqual(len(calls), 1)
+
+    def test_unknown_strategy_raises(self):
+        with self.assertRaises(ValueError):
+            FileCopier("teleport")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+import os
+import pickle
+import tempfile
+
+from leafnode import LeafNode
+from main import generate_page
+from parentnode import ParentNode
+from template import Template
+
+
+class TestTemplate(unittest.TestCase):
+    def test_segments(self):
+        template = Template("<title>{{ Title }}</title><body>{{ Content }}</body>")
+        self.assertEqual(template.segments,
+                         ("<title>", "Title", "</title><body>", "Content", "</body>"))
+
+    def test_render_fills_placeholders(self):
+        template = Template("<title>{{ Title }}</title><body>{{ Content }}</body>")
+        self.assertEqual(template.render("Hi", "<p>x</p>"),
+                         "<title>Hi</title><body><p>x</p></body>")
+
+    def test_repeated_placeholders(self):
+        template = Template("{{ Title }}|{{ Title }}|{{ Content }}")
+        self.assertEqual(template.render("T", "C"), "T|T|C")
+
+    def test_no_placeholders(self):
+        self.assertEqual(Template("<html></html>").render("T", "C"), "<html></html>")
+
+    def test_substituted_text_is_not_rescanned(self):
+        template = Template("<title>{{ Title }}</title>{{ Content }}")
+        out = template.render("A {{ Content }} title", "<p>{{ Title }}</p>")
+        self.assertEqual(out, "<title>A {{ Content }} title</title><p>{{ Title }}</p>")
+
+    def test_unknown_placeholder_is_literal(self):
+        template = Template("{{ Author }} {{ Title }}")
+        self.assertEqual(template.render("T", "C"), "{{ Author }} T")
+
+    def test_iter_render_streams_content(self):
+        template = Template("<title>{{ Title }}</title><body>{{ Content }}</body>")
+        node = ParentNode("div", [LeafNode("p", "x")])
+        chunks = list(template.iter_render("T", node))
+        self.assertEqual("".join(chunks), template.render("T", node.to_html()))
+
+    def test_pickle_round_trip(self):
+        template = Template("<title>{{ Title }}</title>{{ Content }}")
+        copy = pickle.loads(pickle.dumps(template))
+        self.assertEqual(copy.segments, template.segments)
+
+    def test_generate_page_keeps_literal_placeholder_in_markdown(self):
+        with tempfile.TemporaryDirectory() as td:
+            md_path = os.path.join(td, "index.md")
+            out_path = os.path.join(td, "index.html")
+            with open(md_path, "w", encoding="utf-8") as f:
+                f.write("# Docs\n\nWrite `{{ Title }}` in the template.")
+            template = Template("<title>{{ Title }}</title>{{ Content }}")
+            generate_page(md_path, None, out_path, "/", template=template)
+            with open(out_path, encoding="utf-8") as f:
+                content = f.read()
+            self.assertIn("<code>{{ Title }}</code>", content)
+            self.assertTrue(content.startswith("<title>Docs</title>"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -140,6 +140,12 @@ class TestTextNode(unittest.TestCase):
         # The function should include the href as None or handle gracefully
         self.assertIn("href", got.props)
 
+    def test_uses_slots(self):
+        node = TextNode("x", TextType.PLAIN)
+        self.assertFalse(hasattr(node, "__dict__"))
+        with self.assertRaises(AttributeError):
+            node.unknown_attribute = 1
+
 
 if __name__ == "__main__":
     unittest.main()
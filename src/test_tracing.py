@@ -0,0 +1,63 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+from tracing import Tracer
+
+
+class TestTracer(unittest.TestCase):
+    def test_disabled_records_nothing(self):
+        tracer = Tracer()
+        with tracer.span("build"):
+            tracer.counter("queue", waiting=1)
+        self.assertEqual(tracer.events, [])
+
+    def test_spans_and_counters(self):
+        tracer = Tracer()
+        tracer.configure(True, "test build")
+        with tracer.span("build"):
+            with tracer.span("page", "page", source="index.md"):
+                pass
+            tracer.counter("queue", waiting=3)
+        events = tracer.events
+        metadata = [e for e in events if e["ph"] == "M"]
+        self.assertEqual([(e["name"], e["args"]["name"]) for e in metadata],
+                         [("process_name", "test build"),
+                          ("thread_name", threading.current_thread().name)])
+        timed = {e["name"]: e for e in events if e["ph"] != "M"}
+        self.assertEqual(timed["page"]["args"], {"source": "index.md"})
+        self.assertEqual(timed["queue"]["args"], {"waiting": 3})
+        build, page = timed["build"], timed["page"]
+        self.assertLessEqual(build["ts"], page["ts"])
+        self.assertLessEqual(page["ts"] + page["dur"], build["ts"] + build["dur"])
+        for event in events:
+            self.assertEqual((event["pid"], event["tid"]),
+                             (os.getpid(), threading.get_native_id()))
+
+    def test_merge_and_save(self):
+        worker = Tracer()
+        worker.configure(True, "page worker")
+        with worker.span("page"):
+            pass
+        tracer = Tracer()
+        tracer.configure(True)
+        with tracer.span("build"):
+            tracer.merge(worker.take_events())
+        self.assertEqual(worker.events, [])
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "trace", "build.json")
+            tracer.save(path)
+            with open(path, encoding="utf-8") as f:
+                trace = json.load(f)
+        events = trace["traceEvents"]
+        self.assertEqual(sorted(e["args"]["name"] for e in events
+                                if e["name"] == "process_name"), ["build", "page worker"])
+        timed = [e for e in events if e["ph"] == "X"]
+        self.assertEqual(sorted(e["name"] for e in timed), ["build", "page"])
+        self.assertEqual(min(e["ts"] for e in timed), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+
+from leafnode import LeafNode
+from main import render_page
+from parentnode import ParentNode
+from template import Template
+from urlresolver import URLResolver, normalize_base_path
+
+
+class TestURLResolver(unittest.TestCase):
+    def test_normalize_base_path(self):
+        self.assertEqual(normalize_base_path(""), "/")
+        self.assertEqual(normalize_base_path("/site"), "/site/")
+        self.assertEqual(normalize_base_path("/site/"), "/site/")
+
+    def test_resolve_root_relative(self):
+        resolver = URLResolver("/site")
+        self.assertEqual(resolver.resolve("/"), "/site/")
+        self.assertEqual(resolver.resolve("/images/a.png"), "/site/images/a.png")
+
+    def test_resolve_leaves_other_urls(self):
+        resolver = URLResolver("/site/")
+        for url in ("https://example.com/", "//cdn.example.com/x.js", "page.html", "#top", ""):
+            self.assertEqual(resolver.resolve(url), url)
+
+    def test_resolve_props_does_not_mutate(self):
+        props = {"href": "/about", "class": "nav"}
+        resolved = URLResolver("/site/").resolve_props(props)
+        self.assertEqual(resolved, {"href": "/site/about", "class": "nav"})
+        self.assertEqual(props["href"], "/about")
+
+    def test_nodes_resolve_during_render(self):
+        node = ParentNode("p", [
+            LeafNode("a", "home", props={"href": "/"}),
+            LeafNode("img", "", props={"src": "/images/a.png", "alt": "a"}),
+        ])
+        self.assertEqual(
+            node.to_html(URLResolver("/site/")),
+            '<p><a href="/site/">home</a><img src="/site/images/a.png" alt="a" /></p>')
+        # Without a resolver nothing changes
+        self.assertIn('href="/"', node.to_html())
+
+    def test_template_urls_resolved_once_per_base(self):
+        template = Template('<link href="/index.css" /><script src=\'/a.js\'></script>{{ Content }}')
+        resolver = URLResolver("/site/")
+        resolved = template.resolve_urls(resolver)
+        self.assertIs(resolved, template.resolve_urls(URLResolver("/site")))
+        self.assertEqual(resolved.render("T", "<p>x</p>"),
+                         '<link href="/site/index.css" /><script src=\'/site/a.js\'></script><p>x</p>')
+
+    def test_code_text_that_looks_like_attribute_is_untouched(self):
+        markdown = '# Title\n\nUse `href="/docs"` and a [link](/docs)'
+        output = render_page(markdown, Template("{{ Content }}"), "/site/")
+        self.assertIn('<code>href="/docs"</code>', output)
+        self.assertIn('<a href="/site/docs">link</a>', output)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -500,3 +500,140 @@ class TestUtilityFunctions(unittest.TestCase):
 
 if __name__ == "__main__":
     unittest.main()
+
+
+class TestSinglePassInlineScanner(unittest.TestCase):
+    """text_to_textnode scans once; check it against the old five-pass split."""
+
+    @staticmethod
+    def five_pass(text):
+        nodes = [TextNode(text, TextType.PLAIN)]
+        nodes = split_nodes_delimiter_from_plain(nodes, "**", TextType.BOLD)
+        nodes = split_nodes_delimiter_from_plain(nodes, "_", TextType.ITALIC)
+        nodes = split_nodes_delimiter_from_plain(nodes, "`", TextType.CODE)
+        nodes = split_nodes_image(nodes)
+        return split_nodes_link(nodes)
+
+    def test_matches_five_pass_on_well_formed_text(self):
+        samples = [
+            "plain",
+            "**b** _i_ `c` ![a](u) [l](v)",
+            "x **bold words** y _it_ z `co de` w",
+            "[Back Home](/) and ![img](/images/x.png) done",
+            "**b**_i_`c`",
+            "![](empty-alt.png) text",
+            "[a](u1)[b](u2)![c](u3)",
+        ]
+        for text in samples:
+            with self.subTest(text=text):
+                self.assertEqual(text_to_textnode(text), self.five_pass(text))
+
+    def test_image_inside_link_text_matches_first(self):
+        samples = {
+            "[![build](/badge.png)](/ci)": [
+                TextNode("[", TextType.PLAIN),
+                TextNode("build", TextType.IMAGE, "/badge.png"),
+                TextNode("](/ci)", TextType.PLAIN),
+            ],
+            "See [the chart ![icon](/i.png)](/chart)": [
+                TextNode("See [the chart ", TextType.PLAIN),
+                TextNode("icon", TextType.IMAGE, "/i.png"),
+                TextNode("](/chart)", TextType.PLAIN),
+            ],
+        }
+        for text, expected in samples.items():
+            with self.subTest(text=text):
+                self.assertEqual(self.five_pass(text), expected)
+                self.assertEqual(text_to_textnode(text), expected)
+
+    def test_underscore_in_link_url_is_not_italic(self):
+        self.assertEqual(text_to_textnode("see [docs](https://x.com/a_b_c) now"), [
+            TextNode("see ", TextType.PLAIN),
+            TextNode("docs", TextType.LINK, "https://x.com/a_b_c"),
+            TextNode(" now", TextType.PLAIN),
+        ])
+
+    def test_delimiters_inside_code_are_literal(self):
+        self.assertEqual(text_to_textnode("run `a_b **c**` ok"), [
+            TextNode("run ", TextType.PLAIN),
+            TextNode("a_b **c**", TextType.CODE),
+            TextNode(" ok", TextType.PLAIN),
+        ])
+
+    def test_delimiters_inside_later_spans_do_not_close_emphasis(self):
+        samples = {
+            "_a [b](http://x_y) c_": [
+                TextNode("a [b](http://x_y) c", TextType.ITALIC),
+            ],
+            "_a [b](http://x_y) c": [
+                TextNode("_a ", TextType.PLAIN),
+                TextNode("b", TextType.LINK, "http://x_y"),
+                TextNode(" c", TextType.PLAIN),
+            ],
+            "**a ![i](/x**y.png) b**": [
+                TextNode("a ![i](/x**y.png) b", TextType.BOLD),
+            ],
+            "_a `x_y` b": [
+                TextNode("_a ", TextType.PLAIN),
+                TextNode("x_y", TextType.CODE),
+                TextNode(" b", TextType.PLAIN),
+            ],
+            "[_a](/b) c_": [
+                TextNode("_a", TextType.LINK, "/b"),
+                TextNode(" c_", TextType.PLAIN),
+            ],
+        }
+        for text, expected in samples.items():
+            with self.subTest(text=text):
+                self.assertEqual(text_to_textnode(text), expected)
+
+    def test_unclosed_delimiters_stay_plain(self):
+        for text in ("a ** b", "a _ b", "a ` b", "[text](", "![alt]", "[x] (y)"):
+            with self.subTest(text=text):
+                self.assertEqual(text_to_textnode(text), [TextNode(text, TextType.PLAIN)])
+
+    def test_empty_span_produces_no_node(self):
+        self.assertEqual(text_to_textnode("a****b"), [
+            TextNode("a", TextType.PLAIN),
+            TextNode("b", TextType.PLAIN),
+        ])
+
+
+class TestSplitBySpans(unittest.TestCase):
+    """split_nodes_image/link slice by match spans instead of re-finding text."""
+
+    def test_url_with_surrounding_whitespace(self):
+        node = TextNode("a [x]( /u ) b ![y]( /i.png ) c", TextType.PLAIN)
+        self.assertEqual(split_nodes_image(split_nodes_link([node])), [
+            TextNode("a ", TextType.PLAIN),
+            TextNode("x", TextType.LINK, "/u"),
+            TextNode(" b ", TextType.PLAIN),
+            TextNode("y", TextType.IMAGE, "/i.png"),
+            TextNode(" c", TextType.PLAIN),
+        ])
+
+    def test_repeated_identical_links(self):
+        text = " ".join(["[same](/same)"] * 3)
+        nodes = split_nodes_link([TextNode(text, TextType.PLAIN)])
+        self.assertEqual(nodes, [
+            TextNode("same", TextType.LINK, "/same"),
+            TextNode(" ", TextType.PLAIN),
+            TextNode("same", TextType.LINK, "/same"),
+            TextNode(" ", TextType.PLAIN),
+            TextNode("same", TextType.LINK, "/same"),
+        ])
+
+    def test_link_dense_paragraph(self):
+        text = " | ".join(f"[page {i}](/links/{i})" for i in range(500))
+        nodes = split_nodes_link([TextNode(text, TextType.PLAIN)])
+        links = [n for n in nodes if n.text_type == TextType.LINK]
+        self.assertEqual(len(links), 500)
+        self.assertEqual(links[-1], TextNode("page 499", TextType.LINK, "/links/499"))
+
+    def test_bracket_edge_cases(self):
+        # Same matches as the former regular expressions
+        self.assertEqual(extract_markdown_links("[a[b](x) [](y) [c] (z) ![i](j) [[d](e)"),
+                         [("a[b", "x"), ("[d", "e")])
+        self.assertEqual(extract_markdown_images("![](x) !![a](y) ![b](\nz\n) ![c]()"),
+                         [("", "x"), ("a", "y"), ("b", "z")])
+        self.assertEqual(extract_markdown_links("[" * 1000 + "a](b)"), [("[" * 999 + "a", "b")])
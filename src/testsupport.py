@@ -0,0 +1,21 @@
+import os
+import tempfile
+import unittest
+
+
+class TempDirTestCase(unittest.TestCase):
+    """A TestCase with a temporary directory, removed after each test.
+
+    Attributes:
+        td: path of the test's temporary directory.
+    """
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.td = tmp.name
+
+    def write(self, path, text):
+        """Write `text` to `path`, creating its directory if needed."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
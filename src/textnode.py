@@ -17,7 +17,12 @@ class TextNode:
         text_type: a member of TextType describing how the text should be
                    interpreted (plain, bold, link, etc.)
         url: optional URL used for LINK and IMAGE types
+
+    Uses __slots__: inline parsing creates many short-lived TextNodes, and
+    slotted instances are smaller and faster to allocate.
     """
+    __slots__ = ("text", "text_type", "url")
+
     def __init__(self, text, text_type: TextType, url=None):
         self.text = text
         self.text_type = text_type
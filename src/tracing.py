@@ -0,0 +1,136 @@
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+# Returned by `Tracer.span` while tracing is off, so instrumented code pays
+# for one attribute check and nothing else.
+_NO_SPAN = nullcontext()
+
+
+def _now_us():
+    # perf_counter is a system-wide monotonic clock on the platforms we
+    # build on, so timestamps from worker processes line up with ours
+    return time.perf_counter_ns() / 1000
+
+
+class _Span:
+    def __init__(self, tracer, name, category, args):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start = None
+
+    def __enter__(self):
+        self.start = _now_us()
+        return self
+
+    def __exit__(self, *exc_info):
+        end = _now_us()
+        event = {"name": self.name, "cat": self.category, "ph": "X",
+                 "ts": self.start, "dur": end - self.start}
+        if self.args:
+            event["args"] = self.args
+        self.tracer._record(event)
+        return False
+
+
+class Tracer:
+    """Records spans of a build as Chrome trace events.
+
+    The resulting JSON (see `save`) loads in chrome://tracing, Perfetto and
+    other viewers of the Trace Event Format: every process and thread gets
+    its own track, with nested spans for the work done on it. Worker
+    processes record into their own tracer; their events are handed back
+    with `take_events` and added to the build's with `merge`.
+
+    Attributes:
+        enabled: whether spans are recorded.
+        events: trace events recorded or merged so far.
+    """
+    def __init__(self):
+        self.enabled = False
+        self.events = []
+        self._process_name = None
+        self._named = set()
+
+    def configure(self, enabled, process_name="build"):
+        """Turn tracing on or off and drop recorded events.
+
+        `process_name` labels this process's track in the viewer.
+        """
+        self.enabled = enabled
+        self.events = []
+        self._process_name = process_name
+        self._named = set()
+
+    def span(self, name, category="build", **args):
+        """Return a context manager recording its body as a span.
+
+        Keyword arguments are shown with the span in the viewer.
+        """
+        if not self.enabled:
+            return _NO_SPAN
+        return _Span(self, name, category, args)
+
+    def counter(self, name, category="build", **values):
+        """Record the current value of one or more counters."""
+        if self.enabled:
+            self._record({"name": name, "cat": category, "ph": "C",
+                          "ts": _now_us(), "args": values})
+
+    def _record(self, event):
+        pid = os.getpid()
+        tid = threading.get_native_id()
+        event["pid"] = pid
+        event["tid"] = tid
+        # Name each process and thread the first time it records an event
+        if pid not in self._named:
+            self._named.add(pid)
+            self.events.append({"name": "process_name", "ph": "M", "pid": pid,
+                                "tid": tid, "args": {"name": self._process_name}})
+        if (pid, tid) not in self._named:
+            self._named.add((pid, tid))
+            self.events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                                "args": {"name": threading.current_thread().name}})
+        self.events.append(event)
+
+    def take_events(self):
+        """Return the events recorded since the last call and forget them."""
+        events = self.events
+        self.events = []
+        return events
+
+    def merge(self, events):
+        """Add events recorded by another process's tracer."""
+        self.events.extend(events)
+
+    def trace(self):
+        """Return the recorded events as a Trace Event Format object.
+
+        Timestamps are in microseconds from the earliest event.
+        """
+        timed = [event for event in self.events if event["ph"] != "M"]
+        origin = min((event["ts"] for event in timed), default=0)
+        events = []
+        for event in self.events:
+            if event["ph"] != "M":
+                event = dict(event, ts=round(event["ts"] - origin, 3))
+                if "dur" in event:
+                    event["dur"] = round(event["dur"], 3)
+            events.append(event)
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save(self, path):
+        """Write the trace as JSON to `path`, creating directories as needed."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.trace(), f)
+
+
+# Tracer used by the build; disabled unless `main.py --trace` is given.
+TRACER = Tracer()
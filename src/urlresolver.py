@@ -0,0 +1,67 @@
+import re
+
+# Attributes whose values are URLs that may need the site base path.
+URL_ATTRIBUTES = ("href", "src")
+
+_ATTRIBUTE_PATTERN = re.compile(r"""\b(href|src)=(["'])/(?!/)""")
+
+
+def normalize_base_path(base_path):
+    """Return `base_path` with exactly one trailing slash ("/" when empty)."""
+    if not base_path:
+        return "/"
+    return base_path if base_path.endswith("/") else base_path + "/"
+
+
+class URLResolver:
+    """Rewrites root-relative URLs so they point below the site base path.
+
+    A URL starting with a single "/" (such as "/images/a.png") becomes
+    base + "images/a.png". Other URLs - absolute ("https://..."),
+    protocol-relative ("//cdn...") or relative ("page.html") - are returned
+    unchanged.
+
+    Nodes apply the resolver to their `href`/`src` props while rendering, so
+    every URL is rewritten exactly once and text that only looks like an
+    attribute (for example inside a code block) is left alone.
+
+    Attributes:
+        base: the normalized base path, always ending with "/".
+    """
+    def __init__(self, base_path="/"):
+        self.base = normalize_base_path(base_path)
+
+    def resolve(self, url):
+        """Return `url` with the base path applied if it is root-relative."""
+        if (self.base != "/" and url and url.startswith("/")
+                and not url.startswith("//")):
+            return self.base + url[1:]
+        return url
+
+    def resolve_props(self, props):
+        """Return `props` with its URL attributes resolved.
+
+        The original dict is returned unchanged when nothing needs rewriting.
+        """
+        if self.base == "/" or not props:
+            return props
+        resolved = None
+        for name in URL_ATTRIBUTES:
+            value = props.get(name)
+            if isinstance(value, str):
+                new_value = self.resolve(value)
+                if new_value is not value:
+                    if resolved is None:
+                        resolved = dict(props)
+                    resolved[name] = new_value
+        return props if resolved is None else resolved
+
+    def resolve_html(self, html):
+        """Rewrite root-relative href/src attributes in trusted HTML markup.
+
+        Used for template markup, which is not built from nodes; rendered
+        page content is resolved through `resolve_props` instead.
+        """
+        if self.base == "/":
+            return html
+        return _ATTRIBUTE_PATTERN.sub(lambda m: f"{m.group(1)}={m.group(2)}{self.base}", html)
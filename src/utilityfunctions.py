@@ -1,6 +1,16 @@
+import re
+from bisect import bisect_right
+
 from textnode import TextNode, TextType
 from leafnode import LeafNode
 
+# Inline delimiters and the TextType of the text they enclose.
+_DELIMITER_TYPES = {
+    "**": TextType.BOLD,
+    "_": TextType.ITALIC,
+    "`": TextType.CODE,
+}
+
 def text_node_to_html_node(text_node):
     """Convert a `TextNode` into an appropriate `LeafNode`.
 
@@ -93,23 +103,105 @@ def split_nodes_delimiter_from_plain(old_nodes, delimiter, text_type):
     return new_nodes
 
 
+class _ForwardFinder:
+    """`str.find` for a left-to-right scan, remembering the last answer.
+
+    Scanners only ever look further right, so a search for `sub` starting at
+    or before the previously found occurrence can reuse it, and once `sub` is
+    known to be absent from a position onwards it stays absent. Each
+    substring is therefore scanned over at most once per text, keeping a scan
+    with many unmatched openers linear.
+    """
+    __slots__ = ("text", "_cache")
+
+    def __init__(self, text):
+        self.text = text
+        # sub -> (start of the search, position found or -1)
+        self._cache = {}
+
+    def find(self, sub, start):
+        cached = self._cache.get(sub)
+        if cached is not None:
+            searched_from, found = cached
+            if searched_from <= start and (found == -1 or found >= start):
+                return found
+        found = self.text.find(sub, start)
+        self._cache[sub] = (start, found)
+        return found
+
+
+def _match_link(text, finder, open_bracket, allow_empty_text):
+    """Match "[text](url)" whose "[" is at `open_bracket`.
+
+    Returns (link_text, url, end) or None. The text runs to the first "]",
+    which must be followed directly by "(", and the url runs to the first ")"
+    and must not be empty; the url is returned stripped.
+    """
+    close_bracket = finder.find("]", open_bracket + 1)
+    if close_bracket == -1:
+        return None
+    if close_bracket == open_bracket + 1 and not allow_empty_text:
+        return None
+    if not text.startswith("(", close_bracket + 1):
+        return None
+    close_paren = finder.find(")", close_bracket + 2)
+    if close_paren == -1 or close_paren == close_bracket + 2:
+        return None
+    return (text[open_bracket + 1:close_bracket],
+            text[close_bracket + 2:close_paren].strip(),
+            close_paren + 1)
+
+
+def _match_inline_link(text, finder, start, is_image):
+    """Match the image ("![") or link ("[") starting at `start`.
+
+    Returns (link_text, url, end) or None. An image inside a link's text is
+    matched before the link, as in "[![badge](/badge.png)](/ci)", so such a
+    link is not matched.
+    """
+    link = _match_link(text, finder, start + 1 if is_image else start, is_image)
+    if link is not None and not is_image:
+        image = finder.find("![", start + 1)
+        if image != -1 and image < start + 1 + len(link[0]):
+            return None
+    return link
+
+
+def _iter_links(text, image):
+    """Yield (start, end, text, url) for every inline image or link in `text`.
+
+    Finds, left to right and without overlaps, what the patterns
+    `!\\[([^\\]]*)\\]\\(([^)]+)\\)` (images) and
+    `(?<!!)\\[([^\\]]+)\\]\\(([^)]+)\\)` (links) match, in linear
+    time: a regex retries its scan for "]" and ")" from every "[", which is
+    quadratic on text with many unmatched brackets.
+    """
+    finder = _ForwardFinder(text)
+    opener = "![" if image else "["
+    pos = 0
+    while True:
+        start = text.find(opener, pos)
+        if start == -1:
+            return
+        pos = start + 1
+        if not image and start > 0 and text[start - 1] == "!":
+            # The "[" of an image
+            continue
+        link = _match_link(text, finder, start + len(opener) - 1, image)
+        if link is not None:
+            link_text, url, pos = link
+            yield start, pos, link_text, url
+
+
 def extract_markdown_images(text):
     """Extract inline Markdown images from `text`.
 
     Finds occurrences of the form: ![alt text](url) and returns a list of
-    (alt_text, url) tuples. The function performs a simple regex-based
-    extraction and does not attempt to fully parse all Markdown edge cases
-    (reference-style images, nested parentheses in URLs, etc.).
+    (alt_text, url) tuples. The extraction is a simple linear scan and does
+    not attempt to fully parse all Markdown edge cases (reference-style
+    images, nested parentheses in URLs, etc.).
     """
-    import re
-
-    pattern = re.compile(r"!\[([^\]]*)\]\(([^)]+)\)")
-    results = []
-    for m in pattern.finditer(text or ""):
-        alt = m.group(1)
-        url = m.group(2).strip()
-        results.append((alt, url))
-    return results
+    return [(alt, url) for _, _, alt, url in _iter_links(text or "", image=True)]
 
 
 def extract_markdown_links(text):
@@ -117,20 +209,47 @@ def extract_markdown_links(text):
 
     Finds occurrences of the form: [link text](url) and returns a list of
     (link_text, url) tuples. This function intentionally avoids matching
-    image syntax (i.e. ![alt](url)). The implementation is regex-based and
-    handles common simple cases but does not fully implement Markdown
+    image syntax (i.e. ![alt](url)). The extraction is a simple linear scan
+    and handles common simple cases but does not fully implement Markdown
     reference-style links or complex nested punctuation in URLs.
     """
-    import re
+    return [(link_text, url) for _, _, link_text, url in _iter_links(text or "", image=False)]
+
+
+def _split_nodes_on_links(old_nodes, text_type):
+    """Split PLAIN nodes around every image (or link) they contain.
+
+    Each image or link becomes a TextNode of `text_type` (IMAGE or LINK); the
+    text between them becomes PLAIN nodes. The text is sliced by match spans,
+    so every character is copied once regardless of how many matches a node
+    contains.
+    """
+    image = text_type == TextType.IMAGE
+    new_nodes = []
+    for node in old_nodes:
+        if node.text_type != TextType.PLAIN:
+            # Non-PLAIN nodes are appended unchanged
+            new_nodes.append(node)
+            continue
+
+        text = node.text
+        cursor = 0
+        for start, end, link_text, url in _iter_links(text, image):
+            # Add the text before the match (if any)
+            if start > cursor:
+                new_nodes.append(TextNode(text[cursor:start], TextType.PLAIN))
+            new_nodes.append(TextNode(link_text, text_type, url))
+            cursor = end
+
+        if cursor == 0:
+            # No matches found, append the original node
+            new_nodes.append(node)
+        elif cursor < len(text):
+            # Add any remaining text after the last match
+            new_nodes.append(TextNode(text[cursor:], TextType.PLAIN))
+
+    return new_nodes
 
-    # Negative lookbehind ensures we don't match image syntax (![...](...)).
-    pattern = re.compile(r"(?<!\!)\[([^\]]+)\]\(([^)]+)\)")
-    results = []
-    for m in pattern.finditer(text or ""):
-        text_part = m.group(1)
-        url = m.group(2).strip()
-        results.append((text_part, url))
-    return results
 
 def split_nodes_image(old_nodes):
     """
@@ -140,41 +259,9 @@ def split_nodes_image(old_nodes):
     where each piece of text before and after an image is its own TextNode,
     and each image is its own TextNode of type IMAGE.
     """
-    new_nodes = []
-    for node in old_nodes:
-        if node.text_type == TextType.PLAIN:
-            images = extract_markdown_images(node.text)
-            if not images:
-                # No images found, append the original node
-                new_nodes.append(node)
-            else:
-                # Process the text, splitting on images
-                current_text = node.text
-                for alt, url in images:
-                    # Find the image markdown in the current text
-                    image_md = f"![{alt}]({url})"
-                    parts = current_text.split(image_md, 1)
-                    
-                    # Add the text before the image (if any)
-                    if parts[0]:
-                        new_nodes.append(TextNode(parts[0], TextType.PLAIN))
-                    
-                    # Add the image node
-                    new_nodes.append(TextNode(alt, TextType.IMAGE, url))
-                    
-                    # Update current_text to the remainder
-                    current_text = parts[1] if len(parts) > 1 else ""
-                
-                # Add any remaining text after the last image
-                if current_text:
-                    new_nodes.append(TextNode(current_text, TextType.PLAIN))
-        else:
-            # Non-PLAIN nodes are appended unchanged
-            new_nodes.append(node)
-    
-    return new_nodes
-    
-    
+    return _split_nodes_on_links(old_nodes, TextType.IMAGE)
+
+
 def split_nodes_link(old_nodes):
     """
     Similar to split_nodes_image, this function processes PLAIN text nodes
@@ -182,39 +269,85 @@ def split_nodes_link(old_nodes):
     piece of text before and after a link is its own TextNode, and each link
     is its own TextNode of type LINK.
     """
-    new_nodes = []
-    for node in old_nodes:
-        if node.text_type == TextType.PLAIN:
-            links = extract_markdown_links(node.text)
-            if not links:
-                # No links found, append the original node
-                new_nodes.append(node)
+    return _split_nodes_on_links(old_nodes, TextType.LINK)
+
+
+# Start of any inline construct: bold, italic, code, image or link.
+_INLINE_START_PATTERN = re.compile(r"\*\*|[_`\[]|!\[")
+
+# Start of a construct whose content is literal: code, image or link.
+_LITERAL_SPAN_START_PATTERN = re.compile(r"[`\[]|!\[")
+
+
+class _LiteralSpans:
+    """The code spans, images and links of a text, for closing emphasis.
+
+    A "_" or "**" inside a code span, image or link that starts after the
+    emphasis opener does not close it, as in "_a [b](http://x_y) c_". The
+    spans are found by one scan of the whole text, matching them as
+    `text_to_textnode` does but without emphasis, and the closer found after
+    each span is remembered, so searches from any number of openers stay
+    linear.
+    """
+    __slots__ = ("text", "_starts", "_ends", "_after")
+
+    def __init__(self, text):
+        self.text = text
+        self._starts = []
+        self._ends = []
+        # token -> {span index: first valid closer after that span, or -1}
+        self._after = {}
+        finder = _ForwardFinder(text)
+        search = _LITERAL_SPAN_START_PATTERN.search
+        pos = 0
+        while True:
+            match = search(text, pos)
+            if match is None:
+                break
+            start = match.start()
+            token = match.group()
+            if token == "`":
+                close = finder.find("`", start + 1)
+                end = -1 if close == -1 else close + 1
             else:
-                # Process the text, splitting on links
-                current_text = node.text
-                for link_text, url in links:
-                    # Find the link markdown in the current text
-                    link_md = f"[{link_text}]({url})"
-                    parts = current_text.split(link_md, 1)
-                    
-                    # Add the text before the link (if any)
-                    if parts[0]:
-                        new_nodes.append(TextNode(parts[0], TextType.PLAIN))
-                    
-                    # Add the link node
-                    new_nodes.append(TextNode(link_text, TextType.LINK, url))
-                    
-                    # Update current_text to the remainder
-                    current_text = parts[1] if len(parts) > 1 else ""
-                
-                # Add any remaining text after the last link
-                if current_text:
-                    new_nodes.append(TextNode(current_text, TextType.PLAIN))
-        else:
-            # Non-PLAIN nodes are appended unchanged
-            new_nodes.append(node)
-    
-    return new_nodes
+                link = _match_inline_link(text, finder, start, token == "![")
+                end = -1 if link is None else link[2]
+            if end == -1:
+                pos = start + len(token)
+                continue
+            self._starts.append(start)
+            self._ends.append(end)
+            pos = end
+
+    def _span_at(self, position):
+        """Index of the span containing `position`, or -1."""
+        i = bisect_right(self._starts, position) - 1
+        if i >= 0 and position < self._ends[i]:
+            return i
+        return -1
+
+    def closer(self, token, opener, close):
+        """Return the first `token` at or after `close` that closes the
+        emphasis opened at `opener`, or -1."""
+        i = self._span_at(close)
+        if i == -1 or self._starts[i] <= opener:
+            return close
+        after = self._after.setdefault(token, {})
+        visited = []
+        while True:
+            found = after.get(i)
+            if found is not None:
+                break
+            visited.append(i)
+            found = self.text.find(token, self._ends[i])
+            if found == -1:
+                break
+            i = self._span_at(found)
+            if i == -1:
+                break
+        for i in visited:
+            after[i] = found
+        return found
 
 
 def text_to_textnode(text):
@@ -223,12 +356,20 @@ def text_to_textnode(text):
     This function parses inline Markdown syntax and returns a list of TextNode
     objects with the correct types (PLAIN, BOLD, ITALIC, CODE, IMAGE, LINK).
 
-    The parsing is done by sequentially applying split functions in order:
-    1. Split on bold (**text**)
-    2. Split on italic (_text_)
-    3. Split on code (`text`)
-    4. Split on images (![alt](url))
-    5. Split on links ([text](url))
+    The text is scanned once, left to right, in linear time. At each opener
+    the construct that starts first wins and its content is taken literally,
+    so a `_` inside a code span or a link URL does not start italics; only
+    an image inside a link's text is matched before the link. Nor does a
+    `_` or `**` inside a code span, image or link close emphasis opened
+    before it. The recognised constructs are:
+    1. Bold (**text**)
+    2. Italic (_text_)
+    3. Code (`text`)
+    4. Images (![alt](url))
+    5. Links ([text](url))
+
+    An opener without a matching closer is kept as plain text, and empty
+    spans (such as "****") produce no node.
 
     Example:
         text = "This is **bold** and _italic_ with a [link](https://example.com)"
@@ -248,17 +389,62 @@ def text_to_textnode(text):
     Returns:
         A list of TextNode objects representing the parsed markdown.
     """
-    # Start with the input text as a single PLAIN TextNode
-    nodes = [TextNode(text, TextType.PLAIN)]
-    
-    # Apply each split function in order
-    # Use the new split_nodes_delimiter_from_plain for delimiter-based splitting
-    nodes = split_nodes_delimiter_from_plain(nodes, "**", TextType.BOLD)
-    nodes = split_nodes_delimiter_from_plain(nodes, "_", TextType.ITALIC)
-    nodes = split_nodes_delimiter_from_plain(nodes, "`", TextType.CODE)
-    nodes = split_nodes_image(nodes)
-    nodes = split_nodes_link(nodes)
-    
+    nodes = []
+    finder = _ForwardFinder(text)
+    search = _INLINE_START_PATTERN.search
+    # Code spans, images and links, found only when emphasis has one
+    # between its opener and closer
+    spans = None
+    literal_search = _LITERAL_SPAN_START_PATTERN.search
+    # Start of the next of them after the last emphasis opener; -1 if none
+    next_literal = 0
+    plain_start = 0
+    pos = 0
+
+    while True:
+        match = search(text, pos)
+        if match is None:
+            break
+        start = match.start()
+        token = match.group()
+        node = None
+
+        if token == "[" or token == "![":
+            is_image = token == "!["
+            link = _match_inline_link(text, finder, start, is_image)
+            if link is None:
+                pos = start + len(token)
+                continue
+            link_text, url, end = link
+            node = TextNode(link_text, TextType.IMAGE if is_image else TextType.LINK, url)
+        else:
+            # Delimited span: **bold**, _italic_ or `code`
+            close = finder.find(token, start + len(token))
+            if close != -1 and token != "`":
+                if next_literal != -1 and next_literal < start + len(token):
+                    literal = literal_search(text, start + len(token))
+                    next_literal = -1 if literal is None else literal.start()
+                if next_literal != -1 and next_literal < close:
+                    # The closer may lie in a code span, image or link
+                    if spans is None:
+                        spans = _LiteralSpans(text)
+                    close = spans.closer(token, start, close)
+            if close == -1:
+                pos = start + len(token)
+                continue
+            content = text[start + len(token):close]
+            end = close + len(token)
+            if content:
+                node = TextNode(content, _DELIMITER_TYPES[token])
+
+        if start > plain_start:
+            nodes.append(TextNode(text[plain_start:start], TextType.PLAIN))
+        if node is not None:
+            nodes.append(node)
+        plain_start = pos = end
+
+    if plain_start < len(text):
+        nodes.append(TextNode(text[plain_start:], TextType.PLAIN))
     return nodes
 
 def markdown_to_blocks(markdown):